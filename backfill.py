@@ -0,0 +1,207 @@
+"""Заполнение состояния пользователей историей из API без уведомлений.
+
+Запуск: python backfill.py [--since TIMESTAMP] [--concurrency N]
+
+Для каждого пользователя из файла пользователей запрашивается история
+работ начиная с since и сливается с хранилищем состояния: статус работы
+обновляется, только если запись в истории новее сохранённой. После
+этого движок начинает опрос с current_date ответа и не присылает
+старые статусы.
+
+API принимает только нижнюю границу from_date, поэтому делить историю
+одного пользователя на окна бессмысленно: каждое окно заново скачивало
+бы всё, что после него. Параллельность достигается за счёт пользователей:
+их запросы идут одновременно в пределах ограничения, а ответы
+разбираются потоково и сразу сравниваются с сохранённым состоянием,
+так что в памяти остаются только изменившиеся работы. Пользователи
+обрабатываются порциями: сохранённое состояние порции читается одним
+запросом (StateStore.get_many), а после порции записывается на диск.
+"""
+import argparse
+import asyncio
+import logging
+import os
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import event_descriptions as ed  # Импорт описания событий
+import homework as hw
+import http_pool
+from differ import diff_homeworks, status_codes
+from engine import load_tenants
+from state_store import StateStore
+from stream_decode import STREAM_CHUNK_SIZE, HomeworkStream
+
+BACKFILL_CONCURRENCY = int(os.getenv('BACKFILL_CONCURRENCY', 32))
+BACKFILL_CHUNK = int(os.getenv('BACKFILL_CHUNK', 1000))
+
+logger = logging.getLogger(__name__)
+logger.addHandler(logging.StreamHandler(sys.stdout))
+
+
+class BackfillStats:
+    """Счётчики заполнения."""
+
+    def __init__(self):
+        self.tenants = 0
+        self.records = 0
+        self.updated = 0
+        self.errors = 0
+        self.started = time.perf_counter()
+
+    @property
+    def rate(self):
+        """Записей истории в секунду."""
+        elapsed = time.perf_counter() - self.started
+        return self.records / elapsed if elapsed else 0.0
+
+
+def fetch_history(tenant, since, known):
+    """Запрос истории и поиск работ, отличающихся от сохранённых.
+
+    Выполняется в пуле потоков. Возвращает (события, current_date,
+    число записей в истории).
+    """
+    api_response = hw.fetch_api(
+        tenant.headers, {'from_date': since}, stream=True
+    )
+    try:
+        hw.check_status_code(api_response)
+        stream = HomeworkStream(
+            api_response.iter_content(STREAM_CHUNK_SIZE),
+            hw.HOMEWORK_VALIDATOR
+        )
+        records = 0
+
+        def counted():
+            nonlocal records
+            for homework in stream:
+                records += 1
+                yield homework
+
+        events = diff_homeworks(known, counted())
+        return events, stream.fields.get('current_date'), records
+    finally:
+        api_response.close()
+
+
+def is_newer(event):
+    """Новее ли запись из истории сохранённого состояния работы."""
+    if event.old_state is None:
+        return True
+    old_date, new_date = event.old_state[1], event.state[1]
+    return not (old_date and new_date and old_date > new_date)
+
+
+class Backfill:
+    """Параллельное заполнение состояния для списка пользователей."""
+
+    def __init__(self, store, since=0, concurrency=BACKFILL_CONCURRENCY):
+        self.store = store
+        self.since = since
+        self.semaphore = None
+        self.concurrency = concurrency
+        self.executor = ThreadPoolExecutor(
+            max_workers=concurrency, thread_name_prefix='backfill'
+        )
+        self.stats = None
+
+    async def backfill_tenant(self, tenant, from_date, known):
+        """Заполнение состояния одного пользователя."""
+        loop = asyncio.get_running_loop()
+        async with self.semaphore:
+            try:
+                events, current_date, records = await loop.run_in_executor(
+                    self.executor, fetch_history, tenant, self.since, known
+                )
+            except Exception as error:
+                self.stats.errors += 1
+                logger.error(ed.BACKFILL_TENANT_ERROR.format(
+                    tenant.chat_id, error
+                ))
+                return
+        for event in events:
+            if is_newer(event):
+                self.store.set_status(tenant.key, event.key, *event.state)
+                self.stats.updated += 1
+        if current_date is not None:
+            self.store.set_watermark(
+                tenant.key, max(from_date or 0, int(current_date))
+            )
+        self.stats.tenants += 1
+        self.stats.records += records
+
+    async def backfill_chunk(self, chunk):
+        """Заполнение состояния порции пользователей.
+
+        Сохранённое состояние всей порции читается сразу, а не
+        отдельным запросом на каждого пользователя.
+        """
+        watermarks, rows = self.store.get_many(
+            [tenant.key for tenant in chunk]
+        )
+        known = {tenant.key: {} for tenant in chunk}
+        if rows:
+            keys, homeworks, statuses, dates = zip(*rows)
+            for key, homework, status, date_updated in zip(
+                keys, homeworks, status_codes(statuses), dates
+            ):
+                known[key][homework] = (status, date_updated)
+        await asyncio.gather(*(
+            self.backfill_tenant(
+                tenant, watermarks.get(tenant.key), known[tenant.key]
+            )
+            for tenant in chunk
+        ))
+
+    async def run(self, tenants):
+        """Заполнение порциями по BACKFILL_CHUNK пользователей."""
+        loop = asyncio.get_running_loop()
+        self.semaphore = asyncio.Semaphore(self.concurrency)
+        self.stats = BackfillStats()
+        try:
+            for start in range(0, len(tenants), BACKFILL_CHUNK):
+                await self.backfill_chunk(
+                    tenants[start:start + BACKFILL_CHUNK]
+                )
+                await loop.run_in_executor(self.executor, self.store.flush)
+                logger.info(ed.BACKFILL_PROGRESS_LOG.format(
+                    self.stats.tenants, len(tenants), self.stats.records,
+                    self.stats.rate
+                ))
+        finally:
+            self.executor.shutdown(wait=False)
+        return self.stats
+
+
+def main():
+    """Заполнение состояния всех пользователей из файла."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument(
+        '--since', type=int, default=0,
+        help='from_date первого запроса (по умолчанию вся история)'
+    )
+    parser.add_argument(
+        '--concurrency', type=int, default=BACKFILL_CONCURRENCY,
+        help='число одновременных запросов к API'
+    )
+    args = parser.parse_args()
+    tenants = load_tenants()
+    http_pool.install(pool_maxsize=args.concurrency)
+    store = StateStore()
+    try:
+        stats = asyncio.run(
+            Backfill(store, args.since, args.concurrency).run(tenants)
+        )
+    finally:
+        store.close()
+        http_pool.close()
+    logger.info(ed.BACKFILL_DONE_LOG.format(
+        stats.tenants, stats.records, stats.updated, stats.errors,
+        stats.rate
+    ))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,80 @@
+"""Бенчмарк поиска изменений в ответах с сотнями работ.
+
+Запуск: python benchmarks/bench_differ.py [работ] [изменившихся]
+
+Сравниваются два варианта:
+- полный ответ (from_date=0) со всеми работами, из которых
+  изменились только некоторые;
+- ответ с from_date последнего опроса, где есть только изменившиеся.
+Для сравнения приведена стоимость наивного подхода — построить
+сообщение для каждой работы и сравнить строки с прошлыми.
+"""
+import logging
+import os
+import sys
+import timeit
+
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, BASE_DIR)
+
+import homework as hw  # noqa: E402
+from differ import apply_event, diff_homeworks  # noqa: E402
+
+
+def make_homeworks(count):
+    return [
+        {
+            'id': i,
+            'homework_name': f'student__hw{i:03}.zip',
+            'status': 'reviewing',
+            'date_updated': '2023-02-13T14:40:57Z',
+        }
+        for i in range(count)
+    ]
+
+
+def naive(messages, homeworks):
+    """Сообщение для каждой работы и сравнение строк."""
+    changed = []
+    for homework in homeworks:
+        message = hw.parse_status(homework)
+        if messages.get(homework['id']) != message:
+            changed.append(message)
+    return changed
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 500
+    changes = int(sys.argv[2]) if len(sys.argv) > 2 else 5
+    logging.disable(logging.CRITICAL)
+    homeworks = make_homeworks(count)
+    snapshot = {}
+    for event in diff_homeworks(snapshot, homeworks):
+        apply_event(snapshot, event)
+    messages = {
+        homework['id']: hw.parse_status(homework) for homework in homeworks
+    }
+    updated = [
+        dict(homework, status='approved',
+             date_updated='2023-02-14T10:00:00Z')
+        for homework in homeworks[:changes]
+    ]
+    full = updated + homeworks[changes:]
+
+    number = 200
+    results = {
+        'наивный, полный ответ': timeit.timeit(
+            lambda: naive(messages, full), number=number),
+        'индекс, полный ответ': timeit.timeit(
+            lambda: diff_homeworks(snapshot, full), number=number),
+        'индекс, с from_date': timeit.timeit(
+            lambda: diff_homeworks(snapshot, updated), number=number),
+    }
+    assert len(diff_homeworks(snapshot, full)) == changes
+    print(f'Работ: {count}, изменилось: {changes}')
+    for name, elapsed in results.items():
+        print(f'{name:<24} {elapsed / number * 1e6:9.1f} мкс/опрос')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,111 @@
+"""Бенчмарк движка опроса: пользователей на ядро и память на пользователя.
+
+Запуск: python benchmarks/bench_engine.py [число пользователей]
+
+API Практикума и Telegram подменяются заглушками без сети, поэтому
+замеряется только собственная стоимость движка.
+"""
+import asyncio
+import json
+import logging
+import os
+import sys
+import time
+import tracemalloc
+from http import HTTPStatus
+
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, BASE_DIR)
+
+import requests  # noqa: E402
+
+import engine  # noqa: E402
+import homework as hw  # noqa: E402
+
+
+class FakeResponse:
+    """Ответ API без новых работ.
+
+    Повторяет ту часть requests.Response, которую читает движок:
+    тело, заголовки (для кэша ответов) и close().
+    """
+
+    status_code = HTTPStatus.OK
+    headers = {}
+
+    def __init__(self):
+        self.content = json.dumps(
+            {'homeworks': [], 'current_date': int(time.time())}
+        ).encode()
+
+    def json(self):
+        return json.loads(self.content)
+
+    def close(self):
+        pass
+
+
+class FakeBot:
+    """Бот, который ничего не отправляет."""
+
+    def send_message(self, chat_id, text):
+        pass
+
+
+def make_tenants(count):
+    return [engine.Tenant(f'token-{i}', str(i)) for i in range(count)]
+
+
+async def measure_throughput(tenants, rounds):
+    """Опросы в секунду при непрерывной нагрузке на одно ядро."""
+    polling = engine.PollingEngine(FakeBot(), tenants)
+    start = time.perf_counter()
+    for _ in range(rounds):
+        await asyncio.gather(*(polling.poll(tenant) for tenant in tenants))
+    elapsed = time.perf_counter() - start
+    polling.executor.shutdown()
+    if polling.errors:
+        # Опросы с ошибкой дешевле настоящих и исказили бы результат.
+        sys.exit(f'Ошибок при опросе: {polling.errors} из {polling.polls}')
+    return polling.polls / elapsed, polling.cache.hit_rate
+
+
+async def measure_memory(count):
+    """Память на пользователя, ожидающего следующего опроса."""
+    tracemalloc.start()
+    before, _ = tracemalloc.get_traced_memory()
+    tenants = make_tenants(count)
+    polling = engine.PollingEngine(FakeBot(), tenants)
+    tasks = [
+        asyncio.ensure_future(polling.run_tenant(tenant))
+        for tenant in tenants
+    ]
+    await asyncio.sleep(0)
+    after, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    for task in tasks:
+        task.cancel()
+    await asyncio.gather(*tasks, return_exceptions=True)
+    polling.executor.shutdown()
+    return (after - before) / count
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 5000
+    logging.disable(logging.CRITICAL)
+    requests.get = lambda *args, **kwargs: FakeResponse()
+    polls_per_sec, hit_rate = asyncio.run(
+        measure_throughput(make_tenants(count), 3)
+    )
+    per_tenant = asyncio.run(measure_memory(count))
+    print(f'Пользователей:              {count}')
+    print(f'Опросов в секунду:          {polls_per_sec:,.0f} '
+          f'(ответ не изменился: {hit_rate:.0%})')
+    per_core = polls_per_sec * hw.RETRY_PERIOD
+    print(f'Пользователей на ядро:      {per_core:,.0f} '
+          f'(период {hw.RETRY_PERIOD} с)')
+    print(f'Память на пользователя:     {per_tenant / 1024:.2f} КиБ')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,95 @@
+"""Нагрузка на заглушку API Практикума через get_api_answer.
+
+Запуск: python benchmarks/bench_fake_practicum.py [запросов] [потоков]
+    [доля сбоев]
+
+Запросы идут через request_api() и check_response() от множества
+токенов по общему пулу соединений. Доля сбоев поровну делится между
+кодом 500, испорченным JSON, ответом без homeworks и неизвестным
+статусом; выводится число запросов в секунду и исходы по классам
+исключений. Отдельно замеряется пропускная способность самой заглушки
+через http.client: накладные расходы requests на запрос заметно больше,
+чем стоимость ответа заглушки.
+"""
+import http.client
+import logging
+import os
+import sys
+import threading
+import time
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import urlsplit
+
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, BASE_DIR)
+
+import homework as hw  # noqa: E402
+import http_pool  # noqa: E402
+from fake_practicum import FakePracticumServer, Faults  # noqa: E402
+
+
+def poll(index):
+    headers = {'Authorization': f'OAuth token-{index % 1000}'}
+    try:
+        for homework in hw.check_response(
+            hw.request_api(headers, {'from_date': 0})
+        ):
+            hw.parse_status(homework)
+    except Exception as error:
+        return type(error).__name__
+    return 'ok'
+
+
+local = threading.local()
+
+
+def poll_raw(endpoint, index):
+    url = urlsplit(endpoint)
+    connection = getattr(local, 'connection', None)
+    if connection is None:
+        connection = local.connection = http.client.HTTPConnection(
+            url.hostname, url.port
+        )
+    connection.request('GET', f'{url.path}?from_date=0', headers={
+        'Authorization': f'OAuth token-{index % 1000}'
+    })
+    response = connection.getresponse()
+    response.read()
+    return str(response.status)
+
+
+def run(func, count, workers):
+    start = time.perf_counter()
+    with ThreadPoolExecutor(workers) as executor:
+        outcomes = Counter(executor.map(func, range(count)))
+    return count / (time.perf_counter() - start), outcomes
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 5000
+    workers = int(sys.argv[2]) if len(sys.argv) > 2 else 16
+    fault_rate = float(sys.argv[3]) if len(sys.argv) > 3 else 0.2
+    logging.disable(logging.CRITICAL)
+    share = fault_rate / 4
+    server = FakePracticumServer(faults=Faults(
+        error_rate=share, error_codes=[500], malformed_rate=share,
+        missing_key_rate=share, unknown_status_rate=share, seed=1
+    ))
+    hw.ENDPOINT = server.start()
+    http_pool.install(pool_maxsize=workers)
+    print(f'Запросов: {count}, потоков: {workers}, доля сбоев: {fault_rate}')
+    for name, func in (
+        ('заглушка (http.client)', lambda i: poll_raw(hw.ENDPOINT, i)),
+        ('request_api → parse_status', poll),
+    ):
+        rate, outcomes = run(func, count, workers)
+        print(f'{name}: {rate:,.0f} запросов в секунду')
+        for outcome, number in outcomes.most_common():
+            print(f'  {outcome:<22}{number}')
+    http_pool.close()
+    server.shutdown()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,70 @@
+"""Реальная скорость доставки очереди отправки через заглушку Bot API.
+
+Запуск: python benchmarks/bench_fake_telegram.py [сообщений] [чатов]
+    [задержка ответа, с]
+
+telegram.Bot отправляет сообщения через OutboundQueue на локальную
+заглушку с ограничениями Telegram (30 сообщений в секунду на бота,
+1 в секунду в чат). Выводятся доставленные сообщения в секунду, число
+ответов 429 и задержка доставки от постановки в очередь.
+"""
+import asyncio
+import logging
+import os
+import sys
+import time
+
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, BASE_DIR)
+
+import telegram  # noqa: E402
+from telegram.utils.request import Request  # noqa: E402
+
+from fake_telegram import FakeTelegramServer  # noqa: E402
+from outbound import SEND_WORKERS, OutboundQueue  # noqa: E402
+
+
+async def send(bot, count, chats):
+    queue = OutboundQueue(bot)
+    queue.start()
+    queued = {}
+    for index in range(count):
+        text = f'сообщение {index}'
+        queued[text] = time.monotonic()
+        queue.put(index % chats, text)
+    await queue.drain()
+    await queue.stop()
+    return queue, queued
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 300
+    chats = int(sys.argv[2]) if len(sys.argv) > 2 else 100
+    latency = float(sys.argv[3]) if len(sys.argv) > 3 else 0.05
+    logging.disable(logging.CRITICAL)
+    server = FakeTelegramServer(latency=latency, seed=1)
+    bot = telegram.Bot(
+        token='1234:abcdefg', base_url=server.start(),
+        request=Request(con_pool_size=SEND_WORKERS)
+    )
+    start = time.monotonic()
+    queue, queued = asyncio.run(send(bot, count, chats))
+    elapsed = time.monotonic() - start
+    server.shutdown()
+    delays = sorted(
+        delivery.received - queued[delivery.text]
+        for delivery in server.deliveries
+    )
+    print(f'Сообщений: {count}, чатов: {chats}, задержка ответа: '
+          f'{latency} с, воркеров: {SEND_WORKERS}')
+    print(f'Доставлено: {len(server.deliveries)} за {elapsed:.1f} с, '
+          f'{server.throughput():.1f} сообщений/с')
+    print(f'Ответов 429: {server.stats.get("retry_after", 0)}, '
+          f'повторов: {queue.retried}, не отправлено: {queue.failed}')
+    if delays:
+        print(f'Задержка доставки: p50 {delays[len(delays) // 2]:.2f} с, '
+              f'p99 {delays[int(len(delays) * 0.99)]:.2f} с')
+
+
+if __name__ == '__main__':
+    main()
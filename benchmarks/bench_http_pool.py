@@ -0,0 +1,72 @@
+"""Бенчмарк пула соединений: новые соединения против keep-alive.
+
+Запуск: python benchmarks/bench_http_pool.py [запросов] [потоков]
+
+Запросы идут к локальному HTTP/1.1-серверу, поэтому экономия здесь —
+только на TCP-рукопожатии; с TLS к настоящему API она заметно больше.
+"""
+import json
+import os
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, BASE_DIR)
+
+import requests  # noqa: E402
+
+import http_pool  # noqa: E402
+
+BODY = json.dumps({'homeworks': [], 'current_date': 0}).encode()
+
+
+class Handler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+    disable_nagle_algorithm = True
+
+    def do_GET(self):
+        self.send_response(200)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(BODY)))
+        self.end_headers()
+        self.wfile.write(BODY)
+
+    def log_message(self, *args):
+        pass
+
+
+def run(get, url, count, threads):
+    with ThreadPoolExecutor(max_workers=threads) as executor:
+        start = time.perf_counter()
+        for response in executor.map(lambda _: get(url), range(count)):
+            response.content
+        return time.perf_counter() - start
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 2000
+    threads = int(sys.argv[2]) if len(sys.argv) > 2 else 16
+    server = ThreadingHTTPServer(('127.0.0.1', 0), Handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    url = f'http://127.0.0.1:{server.server_address[1]}/'
+
+    plain = run(requests.get, url, count, threads)
+    session = http_pool.install(pool_maxsize=threads)
+    pooled = run(session.get, url, count, threads)
+    stats = http_pool.STATS
+    http_pool.close()
+    server.shutdown()
+
+    print(f'Запросов: {count}, потоков: {threads}')
+    print(f'requests.get:  {count / plain:,.0f} запросов/с, '
+          f'новых соединений {count}')
+    print(f'пул:           {count / pooled:,.0f} запросов/с, '
+          f'новых соединений {stats.new_connections}, '
+          f'повторно использовано {stats.reused}')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,116 @@
+"""Бенчмарк времени импорта модулей бота.
+
+Запуск:
+python benchmarks/bench_import.py [--module homework] [--runs 15]
+    [--budget 60]
+
+Модуль импортируется runs раз в новом процессе с -X importtime,
+из вывода берётся суммарное время импорта модуля со всеми
+зависимостями. Выводятся медиана и минимум, самые долгие прямые
+импорты модуля и то, загружены ли при импорте python-telegram-bot
+и requests. Если медиана больше budget миллисекунд, скрипт
+завершается с кодом 1.
+"""
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+# Модули, которые должны загружаться только при первом использовании.
+HEAVY = ('telegram.bot', 'requests.sessions')
+CHECK_HEAVY = (
+    'import sys; print(",".join(name for name in {!r} '
+    'if name in sys.modules))'
+)
+
+
+def import_profile(module, workdir):
+    """Строки -X importtime: (собственное, суммарное мкс, глубина, имя)."""
+    env = dict(os.environ, PYTHONPATH=BASE_DIR)
+    result = subprocess.run(
+        [sys.executable, '-X', 'importtime', '-c', f'import {module}'],
+        cwd=workdir, env=env, capture_output=True, text=True, check=True
+    )
+    rows = []
+    for line in result.stderr.splitlines():
+        if not line.startswith('import time:') or 'self [us]' in line:
+            continue
+        own, cumulative, name = line[len('import time:'):].split('|')
+        depth = (len(name) - len(name.lstrip())) // 2
+        rows.append((int(own), int(cumulative), depth, name.strip()))
+    return rows
+
+
+def module_time(rows, module):
+    """Суммарное время импорта модуля в миллисекундах."""
+    for _, cumulative, depth, name in rows:
+        if name == module and depth == 0:
+            return cumulative / 1000
+    raise RuntimeError(f'{module} не найден в выводе -X importtime')
+
+
+def direct_imports(rows, module):
+    """Прямые импорты модуля: (имя, мс), самые долгие первыми.
+
+    В выводе -X importtime зависимости идут перед модулем,
+    который их импортировал.
+    """
+    end = next(
+        index for index, (_, _, depth, name) in enumerate(rows)
+        if name == module and depth == 0
+    )
+    start = end
+    while start > 0 and rows[start - 1][2] > 0:
+        start -= 1
+    children = [
+        (name, cumulative / 1000)
+        for _, cumulative, depth, name in rows[start:end]
+        if depth == 1
+    ]
+    return sorted(children, key=lambda child: -child[1])
+
+
+def loaded_heavy(module, workdir):
+    """Тяжёлые модули, загруженные при импорте module."""
+    env = dict(os.environ, PYTHONPATH=BASE_DIR)
+    result = subprocess.run(
+        [sys.executable, '-c',
+         f'import {module}; ' + CHECK_HEAVY.format(HEAVY)],
+        cwd=workdir, env=env, capture_output=True, text=True, check=True
+    )
+    return result.stdout.strip()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--module', default='homework')
+    parser.add_argument('--runs', type=int, default=15)
+    parser.add_argument('--budget', type=float, default=60,
+                        help='допустимая медиана, мс')
+    parser.add_argument('--top', type=int, default=10)
+    args = parser.parse_args()
+    # Временный каталог: импорт homework создаёт main.log.
+    with tempfile.TemporaryDirectory() as workdir:
+        times = []
+        for _ in range(args.runs):
+            rows = import_profile(args.module, workdir)
+            times.append(module_time(rows, args.module))
+        heavy = loaded_heavy(args.module, workdir)
+    median = statistics.median(times)
+    print(f'Импорт {args.module}: медиана {median:.1f} мс, '
+          f'минимум {min(times):.1f} мс ({args.runs} запусков)')
+    print('Самые долгие прямые импорты (последний запуск):')
+    for name, elapsed in direct_imports(rows, args.module)[:args.top]:
+        print(f'  {name:<30} {elapsed:7.1f} мс')
+    print(f'Загружены при импорте: {heavy or "ничего из " + str(HEAVY)}')
+    if median > args.budget:
+        print(f'Превышен бюджет {args.budget:.0f} мс.')
+        sys.exit(1)
+    print(f'В пределах бюджета {args.budget:.0f} мс.')
+
+
+if __name__ == '__main__':
+    main()
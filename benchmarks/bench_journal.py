@@ -0,0 +1,73 @@
+"""Бенчмарк журнала изменений статусов: запись, чтение и сжатие.
+
+Запуск: python benchmarks/bench_journal.py [изменений] [--homeworks 100000]
+    [--batch 1000] [--no-fsync]
+
+Изменения статусов случайных работ пишутся пакетами по batch записей
+(как движок раз в STATE_FLUSH_INTERVAL), у каждого — отметка об
+отправке. Затем журнал читается заново, как при запуске, и сжимается.
+Файлы создаются во временном каталоге.
+"""
+import argparse
+import os
+import random
+import sys
+import tempfile
+import time
+
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, BASE_DIR)
+
+from journal import Journal  # noqa: E402
+
+STATUSES = ('reviewing', 'rejected', 'approved')
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('changes', type=int, nargs='?', default=200000)
+    parser.add_argument('--homeworks', type=int, default=100000)
+    parser.add_argument('--batch', type=int, default=1000)
+    parser.add_argument('--no-fsync', action='store_true')
+    args = parser.parse_args()
+    rng = random.Random(1)
+    with tempfile.TemporaryDirectory() as workdir:
+        path = os.path.join(workdir, 'journal.bin')
+        journal = Journal(path, max_bytes=0, fsync=not args.no_fsync)
+        journal.replay()
+        start = time.perf_counter()
+        for index in range(args.changes):
+            homework = rng.randrange(args.homeworks)
+            transition = journal.observe(
+                f'{homework // 3}:0123456789abcdef', homework,
+                f'student__hw{homework:06}.zip',
+                STATUSES[index % 3], STATUSES[(index + 1) % 3]
+            )
+            journal.mark_sent(transition)
+            if index % args.batch == args.batch - 1:
+                journal.flush()
+        journal.close()
+        elapsed = time.perf_counter() - start
+        size = os.path.getsize(path)
+        print(f'Запись: {2 * args.changes} записей за {elapsed:.2f} с, '
+              f'{2 * args.changes / elapsed:,.0f} записей/с, '
+              f'{size / 2 ** 20:.1f} МиБ')
+
+        replayed = Journal(path)
+        start = time.perf_counter()
+        records = replayed.replay()
+        elapsed = time.perf_counter() - start
+        print(f'Чтение: {records} записей за {elapsed:.2f} с, '
+              f'{records / elapsed:,.0f} записей/с, '
+              f'работ {len(replayed.latest)}')
+
+        start = time.perf_counter()
+        replayed.compact()
+        elapsed = time.perf_counter() - start
+        print(f'Сжатие: {elapsed:.2f} с, '
+              f'{os.path.getsize(path) / 2 ** 20:.1f} МиБ после сжатия')
+        replayed.close()
+
+
+if __name__ == '__main__':
+    main()
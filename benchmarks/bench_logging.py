@@ -0,0 +1,89 @@
+"""Накладные расходы логирования на итерацию опроса.
+
+Запуск: python benchmarks/bench_logging.py [итераций] [задержка диска, мс]
+
+Итерация пишет те же отладочные записи, что и опрос без изменений
+(CHECK_DICT_DEBUG, CHECK_LIST_DEBUG, STATUS_NOT_CHANGED_LOG).
+Сравниваются синхронная запись в файл, как у basicConfig(), и запись
+через очередь в фоновом потоке. Задержка диска имитирует медленную
+запись: она добавляется к каждому сбросу буфера файла.
+"""
+import logging
+import os
+import sys
+import tempfile
+import time
+
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, BASE_DIR)
+
+import event_descriptions as ed  # noqa: E402
+import log_queue  # noqa: E402
+
+
+class SlowFileHandler(logging.FileHandler):
+    """Файл, сброс буфера которого занимает delay секунд."""
+
+    delay_seconds = 0.0
+
+    def flush(self):
+        super().flush()
+        if self.delay_seconds:
+            time.sleep(self.delay_seconds)
+
+
+def iteration(logger):
+    logger.debug(ed.CHECK_DICT_DEBUG)
+    logger.debug(ed.CHECK_LIST_DEBUG)
+    logger.debug(ed.STATUS_NOT_CHANGED_LOG)
+
+
+def measure(logger, count):
+    timings = []
+    clock = time.perf_counter
+    for _ in range(count):
+        start = clock()
+        iteration(logger)
+        timings.append(clock() - start)
+    timings.sort()
+    return sum(timings) / count, timings[int(count * 0.99)]
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 20000
+    disk_delay = float(sys.argv[2]) / 1000 if len(sys.argv) > 2 else 0.0
+    SlowFileHandler.delay_seconds = disk_delay
+    directory = tempfile.mkdtemp()
+    print(f'Итераций: {count}, задержка диска: {disk_delay * 1000:.1f} мс')
+
+    sync_logger = logging.getLogger('bench.sync')
+    sync_logger.propagate = False
+    sync_logger.setLevel(logging.DEBUG)
+    handler = SlowFileHandler(os.path.join(directory, 'sync.log'))
+    handler.setFormatter(logging.Formatter(log_queue.LOG_FORMAT))
+    sync_logger.addHandler(handler)
+    mean, p99 = measure(sync_logger, count)
+    handler.close()
+    print(f'синхронно     среднее {mean * 1e6:8.1f} мкс, '
+          f'p99 {p99 * 1e6:8.1f} мкс')
+
+    queue_logger = logging.getLogger('bench.queue')
+    queue_logger.propagate = False
+    listener = log_queue.setup_logging(
+        os.path.join(directory, 'queue.log'), logger=queue_logger
+    )
+    slow = SlowFileHandler(os.path.join(directory, 'queue-slow.log'))
+    slow.setFormatter(logging.Formatter(log_queue.LOG_FORMAT))
+    listener.handlers[0].close()
+    listener.handlers = (slow,)
+    mean, p99 = measure(queue_logger, count)
+    start = time.perf_counter()
+    log_queue.stop_logging(queue_logger)
+    drain = time.perf_counter() - start
+    print(f'через очередь среднее {mean * 1e6:8.1f} мкс, '
+          f'p99 {p99 * 1e6:8.1f} мкс '
+          f'(дозапись очереди после опроса {drain:.2f} с)')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,116 @@
+"""Бенчмарк рассылки сообщений о смене статуса множеству чатов.
+
+Запуск: python benchmarks/bench_messages.py [чатов] [--languages ru,en]
+
+Одно и то же событие (работа сменила статус) рассылается в каждый
+чат на его языке. Сравниваются:
+- parse_status до каталога: проверки и f-строка (только русский);
+- голая f-строка без проверок (только русский);
+- str.format шаблона и вердикта из каталога для каждого чата;
+- каталог с готовыми фрагментами (messages.status_message);
+- render_status из homework с проверками работы.
+"""
+import argparse
+import itertools
+import logging
+import os
+import sys
+import timeit
+
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, BASE_DIR)
+
+import homework as hw  # noqa: E402
+import messages  # noqa: E402
+
+
+def make_events(chats, languages):
+    """События рассылки: (работа, язык чата)."""
+    statuses = itertools.cycle(hw.HOMEWORK_VERDICTS)
+    languages = itertools.cycle(languages)
+    return [
+        ({'homework_name': f'student{chat}__hw05.zip',
+          'status': next(statuses)}, next(languages))
+        for chat in range(chats)
+    ]
+
+
+def old_parse_status(homework):
+    """parse_status до каталога: проверки работы и f-строка."""
+    if isinstance(homework, list):
+        homework, *_ = homework
+    if 'homework_name' not in homework:
+        raise KeyError('homework_name')
+    name = homework.get('homework_name')
+    status = homework.get('status')
+    if status not in hw.HOMEWORK_VERDICTS:
+        raise KeyError(status)
+    verdict = hw.HOMEWORK_VERDICTS[status]
+    return f'Изменился статус проверки работы "{name}". {verdict}'
+
+
+def parse_status_before(events):
+    """Сообщение прежним parse_status."""
+    for homework, _ in events:
+        old_parse_status(homework)
+
+
+def f_string(events):
+    """Сообщение f-строкой без проверок."""
+    for homework, _ in events:
+        verdict = hw.HOMEWORK_VERDICTS[homework['status']]
+        name = homework['homework_name']
+        f'Изменился статус проверки работы "{name}". {verdict}'
+
+
+def catalog_format(events):
+    """Шаблон и вердикт из каталога, str.format на каждый чат."""
+    for homework, language in events:
+        messages.text('status_changed', language).format(
+            homework['homework_name'],
+            messages.verdict(homework['status'], language)
+        )
+
+
+def catalog_fragments(events):
+    """Готовые фрагменты каталога."""
+    for homework, language in events:
+        messages.status_message(
+            homework['homework_name'], homework['status'], language
+        )
+
+
+def render_status(events):
+    """Сообщение с проверками работы, как в движке."""
+    for homework, language in events:
+        hw.render_status(homework, language)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('chats', type=int, nargs='?', default=10000)
+    parser.add_argument('--languages', default='ru,en')
+    parser.add_argument('--number', type=int, default=20)
+    args = parser.parse_args()
+    logging.disable(logging.CRITICAL)
+    languages = args.languages.split(',')
+    events = make_events(args.chats, languages)
+    variants = {
+        'parse_status до (ru)': parse_status_before,
+        'f-строка (только ru)': f_string,
+        'str.format по каталогу': catalog_format,
+        'каталог, фрагменты': catalog_fragments,
+        'render_status': render_status,
+    }
+    print(f'Чатов: {args.chats}, языки: {", ".join(languages)}')
+    for name, variant in variants.items():
+        elapsed = min(timeit.repeat(
+            lambda: variant(events), number=args.number, repeat=3
+        ))
+        print(f'{name:<24} {elapsed / args.number / args.chats * 1e9:7.0f} '
+              'нс/сообщение')
+    print(f'Вердиктов собрано: {len(messages.STATUS_FRAGMENTS)}')
+
+
+if __name__ == '__main__':
+    main()
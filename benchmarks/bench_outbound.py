@@ -0,0 +1,73 @@
+"""Бенчмарк очереди отправки: пропускная способность при задержке Telegram.
+
+Запуск: python benchmarks/bench_outbound.py [сообщений] [чатов] [воркеров]
+
+Бот-заглушка отвечает с задержкой и изредка возвращает 429.
+Лимиты очереди подняты, чтобы за разумное время увидеть, как число
+воркеров отвязывает пропускную способность от задержки отправки.
+"""
+import asyncio
+import logging
+import os
+import random
+import sys
+import time
+
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, BASE_DIR)
+
+import telegram  # noqa: E402
+
+from outbound import OutboundQueue  # noqa: E402
+
+SEND_LATENCY = 0.05
+RETRY_AFTER_RATE = 0.01
+
+
+class SlowBot:
+    """Бот с задержкой отправки и редкими 429."""
+
+    def send_message(self, chat_id, text):
+        time.sleep(SEND_LATENCY)
+        if random.random() < RETRY_AFTER_RATE:
+            raise telegram.error.RetryAfter(0.1)
+
+
+async def run(count, chats, workers, enqueue_times):
+    queue = OutboundQueue(
+        SlowBot(), workers=workers, global_rate=1000, chat_rate=100
+    )
+    queue.start()
+    start = time.perf_counter()
+    for n in range(count):
+        put_start = time.perf_counter()
+        queue.put(n % chats, f'message {n}')
+        enqueue_times.append(time.perf_counter() - put_start)
+    await queue.drain()
+    elapsed = time.perf_counter() - start
+    await queue.stop()
+    return queue, elapsed
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 1000
+    chats = int(sys.argv[2]) if len(sys.argv) > 2 else 200
+    workers = int(sys.argv[3]) if len(sys.argv) > 3 else 16
+    logging.disable(logging.CRITICAL)
+    random.seed(0)
+    enqueue_times = []
+    queue, elapsed = asyncio.run(run(count, chats, workers, enqueue_times))
+    enqueue_times.sort()
+    print(f'Сообщений: {count}, чатов: {chats}, воркеров: {workers}, '
+          f'задержка Telegram {SEND_LATENCY * 1000:.0f} мс')
+    print(f'Отправлено {queue.sent} за {elapsed:.2f} с: '
+          f'{queue.sent / elapsed:,.0f} сообщений/с '
+          f'(последовательно: {1 / SEND_LATENCY:.0f}/с)')
+    print(f'Повторов после 429: {queue.retried}, ошибок: {queue.failed}')
+    p99 = enqueue_times[int(len(enqueue_times) * 0.99)]
+    print(f'Постановка в очередь (время, на которое блокируется опрос): '
+          f'p99 {p99 * 1e6:.1f} мкс')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,190 @@
+"""Бенчмарк конвейера homework.py на заглушках из тестов.
+
+Запуск:
+python benchmarks/bench_pipeline.py [--tenants N] [--rounds R]
+    [--change-rate P] [--save FILE] [--compare FILE] [--tolerance T]
+
+Каждый из N пользователей опрашивается R раз полным конвейером
+get_api_answer → check_response → parse_status → send_message.
+API Практикума подменяется MockResponseGET, Telegram — MockTelegramBot
+из tests/utils.py. С вероятностью P в ответе опроса есть изменившаяся
+работа, иначе список работ пуст.
+
+Выводятся опросы в секунду, p50/p99 каждой стадии и пиковый RSS.
+С --save результаты записываются в JSON как базовые, с --compare
+сравниваются с базовыми: если пропускная способность упала или медиана
+какой-либо стадии выросла больше чем на tolerance, скрипт завершается
+с кодом 1.
+"""
+import argparse
+import json
+import logging
+import os
+import random
+import resource
+import sys
+import time
+
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, BASE_DIR)
+sys.path.insert(0, os.path.join(BASE_DIR, 'tests'))
+
+import requests  # noqa: E402
+
+import homework as hw  # noqa: E402
+import utils  # noqa: E402
+
+STAGES = ('get_api_answer', 'check_response', 'parse_status', 'send_message')
+STATUSES = tuple(hw.HOMEWORK_VERDICTS)
+
+
+class FakeApi:
+    """Ответы API для множества пользователей по токену из заголовка."""
+
+    def __init__(self, change_rate, seed=1):
+        self.change_rate = change_rate
+        self.random = random.Random(seed)
+        self.versions = {}
+        self.now = 1_700_000_000
+
+    def get(self, *args, headers=None, params=None, **kwargs):
+        token = headers['Authorization']
+        self.now += 1
+        homeworks = []
+        if self.random.random() < self.change_rate:
+            version = self.versions.get(token, 0) + 1
+            self.versions[token] = version
+            homeworks.append({
+                'id': 1,
+                'homework_name': f'{token[6:]}__hw.zip',
+                'status': STATUSES[version % len(STATUSES)],
+                'reviewer_comment': 'Всё нравится.',
+                'date_updated': '2023-02-13T14:40:57Z',
+                'lesson_name': 'Итоговый проект',
+            })
+        return utils.MockResponseGET(
+            data={'homeworks': homeworks, 'current_date': self.now}
+        )
+
+
+def percentile(values, share):
+    """Перцентиль отсортированного списка."""
+    if not values:
+        return 0.0
+    return values[min(len(values) - 1, int(len(values) * share))]
+
+
+def run(tenants, rounds, change_rate):
+    """Прогон конвейера; возвращает словарь результатов."""
+    api = FakeApi(change_rate)
+    requests.get = api.get
+    bot = utils.MockTelegramBot()
+    headers = [
+        {'Authorization': f'OAuth token-{i}'} for i in range(tenants)
+    ]
+    payloads = [{'from_date': 0} for _ in range(tenants)]
+    timings = {stage: [] for stage in STAGES}
+    clock = time.perf_counter
+    start = clock()
+    for _ in range(rounds):
+        for tenant_headers, payload in zip(headers, payloads):
+            t0 = clock()
+            response = hw.request_api(tenant_headers, payload)
+            t1 = clock()
+            homeworks = hw.check_response(response)
+            t2 = clock()
+            timings['get_api_answer'].append(t1 - t0)
+            timings['check_response'].append(t2 - t1)
+            for homework in homeworks:
+                t3 = clock()
+                message = hw.parse_status(homework)
+                t4 = clock()
+                hw.send_message(bot, message)
+                timings['parse_status'].append(t4 - t3)
+                timings['send_message'].append(clock() - t4)
+            payload['from_date'] = response['current_date']
+    elapsed = clock() - start
+    stages = {}
+    for stage, values in timings.items():
+        values.sort()
+        stages[stage] = {
+            'p50': percentile(values, 0.5),
+            'p99': percentile(values, 0.99),
+            'count': len(values),
+        }
+    return {
+        'tenants': tenants,
+        'rounds': rounds,
+        'change_rate': change_rate,
+        'polls_per_sec': tenants * rounds / elapsed,
+        'stages': stages,
+        # На Linux ru_maxrss в КиБ.
+        'rss_mib': resource.getrusage(
+            resource.RUSAGE_SELF
+        ).ru_maxrss / 1024,
+    }
+
+
+def report(result):
+    print(f'Пользователей: {result["tenants"]}, опросов на пользователя: '
+          f'{result["rounds"]}, доля изменений: {result["change_rate"]}')
+    print(f'Опросов в секунду: {result["polls_per_sec"]:,.0f}')
+    print(f'{"стадия":<16}{"p50, мкс":>12}{"p99, мкс":>12}{"вызовов":>10}')
+    for stage, values in result['stages'].items():
+        print(f'{stage:<16}{values["p50"] * 1e6:>12.1f}'
+              f'{values["p99"] * 1e6:>12.1f}{values["count"]:>10}')
+    print(f'Пиковый RSS: {result["rss_mib"]:.1f} МиБ')
+
+
+def compare(result, baseline, tolerance):
+    """Список регрессий относительно базовых результатов."""
+    regressions = []
+    floor = baseline['polls_per_sec'] * (1 - tolerance)
+    if result['polls_per_sec'] < floor:
+        regressions.append(
+            f'опросов в секунду {result["polls_per_sec"]:,.0f} '
+            f'< {baseline["polls_per_sec"]:,.0f}'
+        )
+    for stage, values in baseline['stages'].items():
+        current = result['stages'].get(stage)
+        if not current or not values['count'] or not current['count']:
+            continue
+        if current['p50'] > values['p50'] * (1 + tolerance):
+            regressions.append(
+                f'{stage}: p50 {current["p50"] * 1e6:.1f} мкс '
+                f'> {values["p50"] * 1e6:.1f} мкс'
+            )
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--tenants', type=int, default=1000)
+    parser.add_argument('--rounds', type=int, default=20)
+    parser.add_argument('--change-rate', type=float, default=0.1)
+    parser.add_argument('--save', help='записать результаты как базовые')
+    parser.add_argument('--compare', help='сравнить с базовыми')
+    parser.add_argument('--tolerance', type=float, default=0.2,
+                        help='допустимое ухудшение (доля)')
+    args = parser.parse_args()
+    logging.disable(logging.CRITICAL)
+    result = run(args.tenants, args.rounds, args.change_rate)
+    report(result)
+    if args.save:
+        with open(args.save, 'w', encoding='UTF-8') as file:
+            json.dump(result, file, indent=2)
+        print(f'Базовые результаты записаны в {args.save}')
+    if args.compare:
+        with open(args.compare, encoding='UTF-8') as file:
+            baseline = json.load(file)
+        regressions = compare(result, baseline, args.tolerance)
+        if regressions:
+            print('Регрессии:')
+            for regression in regressions:
+                print(f'  {regression}')
+            sys.exit(1)
+        print('Регрессий нет.')
+
+
+if __name__ == '__main__':
+    main()
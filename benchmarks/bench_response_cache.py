@@ -0,0 +1,76 @@
+"""Бенчмарк кэша ответов: полная обработка против проверки отпечатка.
+
+Запуск: python benchmarks/bench_response_cache.py [работ в ответе]
+"""
+import json
+import logging
+import os
+import sys
+import timeit
+from http import HTTPStatus
+
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, BASE_DIR)
+
+import homework as hw  # noqa: E402
+from response_cache import ResponseCache  # noqa: E402
+
+
+class FakeResponse:
+    """Ответ API с готовым телом."""
+
+    status_code = HTTPStatus.OK
+    headers = {}
+
+    def __init__(self, content):
+        self.content = content
+
+    def json(self):
+        return json.loads(self.content)
+
+
+def make_body(count, current_date):
+    homeworks = [
+        {
+            'id': i,
+            'homework_name': f'student__hw{i:03}.zip',
+            'status': 'approved',
+            'reviewer_comment': 'Всё нравится',
+            'date_updated': '2023-02-13T14:40:57Z',
+            'lesson_name': 'Итоговый проект',
+        }
+        for i in range(count)
+    ]
+    return json.dumps(
+        {'homeworks': homeworks, 'current_date': current_date}
+    ).encode()
+
+
+def full_path(response):
+    homework = hw.check_response(hw.decode_response(response))
+    if homework:
+        hw.parse_status(homework)
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 20
+    logging.disable(logging.CRITICAL)
+    first = FakeResponse(make_body(count, 1))
+    second = FakeResponse(make_body(count, 2))
+    cache = ResponseCache()
+    cache.remember('token', first)
+
+    number = 2000
+    full = timeit.timeit(lambda: full_path(second), number=number)
+    cached = timeit.timeit(
+        lambda: cache.is_unchanged('token', second), number=number
+    )
+    print(f'Работ в ответе: {count}, размер тела: {len(second.content)} Б')
+    print(f'разбор и проверка: {full / number * 1e6:8.1f} мкс/ответ')
+    print(f'отпечаток:         {cached / number * 1e6:8.1f} мкс/ответ')
+    print(f'Ускорение на неизменившихся ответах: {full / cached:.1f}x, '
+          f'доля попаданий {cache.hit_rate:.0%}')
+
+
+if __name__ == '__main__':
+    main()
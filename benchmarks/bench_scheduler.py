@@ -0,0 +1,102 @@
+"""Моделирование адаптивного расписания против опроса раз в RETRY_PERIOD.
+
+Запуск: python benchmarks/bench_scheduler.py [пользователей] [дней]
+
+Для каждого пользователя генерируется история: работа отправлена
+на ревью, через несколько часов проверена, при замечаниях —
+исправлена и отправлена снова. Считаются запросы к API и задержка
+между вердиктом ревьюера и его обнаружением (о своей отправке
+на ревью студент знает и без бота). Если p99 задержки адаптивного
+расписания больше, чем у фиксированного, бенчмарк завершается с кодом 1.
+"""
+import os
+import random
+import statistics
+import sys
+
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, BASE_DIR)
+
+from homework import RETRY_PERIOD  # noqa: E402
+from scheduler import AdaptiveScheduler  # noqa: E402
+
+HOUR = 3600
+
+
+def make_history(horizon):
+    """Список (время, статус) изменений статуса одной работы."""
+    history = []
+    now = random.uniform(0, horizon / 2)
+    while now < horizon:
+        history.append((now, 'reviewing'))
+        now += random.expovariate(1 / (6 * HOUR))
+        status = random.choice(('approved', 'rejected'))
+        history.append((now, status))
+        if status == 'approved':
+            now += random.expovariate(1 / (48 * HOUR))
+        else:
+            now += random.expovariate(1 / (12 * HOUR))
+    return [event for event in history if event[0] < horizon]
+
+
+def simulate(history, horizon, next_delay):
+    """Число опросов и задержки обнаружения вердиктов."""
+    polls, latencies = 0, []
+    status, idle, seen = None, 0, 0
+    now = random.uniform(0, RETRY_PERIOD)
+    while now < horizon:
+        polls += 1
+        idle += 1
+        while seen < len(history) and history[seen][0] <= now:
+            status = history[seen][1]
+            if status != 'reviewing':
+                latencies.append(now - history[seen][0])
+            idle = 0
+            seen += 1
+        now += next_delay(status, idle)
+    return polls, latencies
+
+
+def report(name, polls, latencies):
+    """Строка результата; возвращает p99 задержки."""
+    latencies.sort()
+    p99 = latencies[int(len(latencies) * 0.99)] if latencies else 0
+    print(f'{name:<14} запросов {polls:>9,}  '
+          f'задержка медиана {statistics.median(latencies or [0]):>6.0f} с, '
+          f'p99 {p99:>6.0f} с')
+    return p99
+
+
+def main():
+    tenants = int(sys.argv[1]) if len(sys.argv) > 1 else 1000
+    days = int(sys.argv[2]) if len(sys.argv) > 2 else 7
+    horizon = days * 24 * HOUR
+    random.seed(0)
+    histories = [make_history(horizon) for _ in range(tenants)]
+
+    fixed_polls, fixed_latencies = 0, []
+    scheduler = AdaptiveScheduler()
+    adaptive_polls, adaptive_latencies = 0, []
+    for history in histories:
+        polls, latencies = simulate(
+            history, horizon, lambda status, idle: RETRY_PERIOD
+        )
+        fixed_polls += polls
+        fixed_latencies += latencies
+        polls, latencies = simulate(history, horizon, scheduler.next_delay)
+        adaptive_polls += polls
+        adaptive_latencies += latencies
+
+    print(f'Пользователей: {tenants}, дней: {days}')
+    fixed_p99 = report('фиксированный', fixed_polls, fixed_latencies)
+    adaptive_p99 = report('адаптивный', adaptive_polls, adaptive_latencies)
+    saved = 1 - adaptive_polls / fixed_polls
+    print(f'Сэкономлено запросов: {fixed_polls - adaptive_polls:,} '
+          f'({saved:.0%})')
+    if adaptive_p99 > fixed_p99:
+        sys.exit(f'p99 задержки выше, чем при фиксированном опросе: '
+                 f'{adaptive_p99:.0f} с против {fixed_p99:.0f} с')
+
+
+if __name__ == '__main__':
+    main()
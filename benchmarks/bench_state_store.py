@@ -0,0 +1,74 @@
+"""Бенчмарк хранилища состояния: загрузка и пакетная запись.
+
+Запуск: python benchmarks/bench_state_store.py [пользователей] [работ]
+"""
+import os
+import sys
+import tempfile
+import time
+
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, BASE_DIR)
+
+from state_store import StateStore, tenant_key  # noqa: E402
+
+
+def fill(store, tenants, homeworks):
+    for n in range(tenants):
+        key = tenant_key(f'token-{n}', str(n))
+        store.set_watermark(key, 1_700_000_000 + n)
+        for h in range(homeworks):
+            store.set_status(key, str(h), 'approved', '2023-02-13T14:40:57Z')
+
+
+def main():
+    tenants = int(sys.argv[1]) if len(sys.argv) > 1 else 100_000
+    homeworks = int(sys.argv[2]) if len(sys.argv) > 2 else 3
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, 'state.sqlite3')
+        store = StateStore(path)
+        fill(store, tenants, homeworks)
+        start = time.perf_counter()
+        written = store.flush()
+        batch = time.perf_counter() - start
+        store.close()
+
+        start = time.perf_counter()
+        store = StateStore(path)
+        store.get(tenant_key('token-0', '0'))
+        startup = time.perf_counter() - start
+
+        keys = [tenant_key(f'token-{n}', str(n)) for n in range(tenants)]
+        start = time.perf_counter()
+        for key in keys:
+            store.get(key)
+        lookup = (time.perf_counter() - start) / tenants
+
+        start = time.perf_counter()
+        watermarks, statuses = store.load()
+        load = time.perf_counter() - start
+
+        # Запись по одной транзакции на опрос, как без буфера.
+        sample = 1000
+        start = time.perf_counter()
+        for n in range(sample):
+            store.set_watermark(tenant_key(f'token-{n}', str(n)), n)
+            store.flush()
+        single = (time.perf_counter() - start) / sample
+        store.close()
+
+    print(f'Пользователей: {tenants}, работ у каждого: {homeworks}')
+    print(f'Запуск:          {startup * 1000:8.1f} мс '
+          '(открытие базы и первый пользователь)')
+    print(f'Точечное чтение: {lookup * 1e6:8.1f} мкс на пользователя '
+          '(перед его первым опросом)')
+    print(f'Полная загрузка: {load * 1000:8.1f} мс '
+          f'({len(watermarks)} пользователей, '
+          f'{sum(map(len, statuses.values()))} работ) — для сравнения')
+    print(f'Пакетная запись: {batch * 1000:8.1f} мс на {written} изменений '
+          f'({batch / written * 1e6:.1f} мкс на изменение)')
+    print(f'Запись по одной: {single * 1e6:8.1f} мкс на изменение')
+
+
+if __name__ == '__main__':
+    main()
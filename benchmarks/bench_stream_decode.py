@@ -0,0 +1,83 @@
+"""Бенчмарк памяти: response.json() против потокового разбора.
+
+Запуск: python benchmarks/bench_stream_decode.py [работ в истории]
+
+Тело ответа генерируется кусками, как приходит по сети. Для обычного
+пути куски склеиваются в одно тело (так делает requests), для
+потокового — разбираются по мере поступления.
+"""
+import json
+import logging
+import os
+import sys
+import time
+import tracemalloc
+
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, BASE_DIR)
+
+import homework as hw  # noqa: E402
+from differ import diff_homeworks, status_code  # noqa: E402
+from stream_decode import STREAM_CHUNK_SIZE, HomeworkStream  # noqa: E402
+
+
+def body_chunks(count):
+    """Тело ответа с историей из count работ кусками по 16 КиБ."""
+    buffer = b'{"homeworks": ['
+    for i in range(count):
+        record = json.dumps({
+            'id': i,
+            'homework_name': f'student__hw{i:05}.zip',
+            'status': 'approved',
+            'reviewer_comment': 'Всё нравится, но есть пара замечаний.',
+            'date_updated': '2023-02-13T14:40:57Z',
+            'lesson_name': 'Итоговый проект',
+        }).encode()
+        buffer += (b', ' if i else b'') + record
+        if len(buffer) >= STREAM_CHUNK_SIZE:
+            yield buffer
+            buffer = b''
+    yield buffer + b'], "current_date": 1700000000}'
+
+
+class KnownSnapshot(dict):
+    """Снимок, в котором любая работа уже известна: изменений нет."""
+
+    def get(self, key, default=None):
+        # Статусы в снимке хранятся кодами, как в движке.
+        return (status_code('approved'), '2023-02-13T14:40:57Z')
+
+
+def full(count):
+    response = json.loads(b''.join(body_chunks(count)))
+    return diff_homeworks(KnownSnapshot(), hw.check_response(response))
+
+
+def streamed(count):
+    return diff_homeworks(
+        KnownSnapshot(), HomeworkStream(body_chunks(count))
+    )
+
+
+def measure(func, count):
+    tracemalloc.start()
+    start = time.perf_counter()
+    func(count)
+    elapsed = time.perf_counter() - start
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return peak, elapsed
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 50_000
+    logging.disable(logging.CRITICAL)
+    print(f'Работ в истории: {count}')
+    for name, func in (('response.json()', full), ('потоковый', streamed)):
+        peak, elapsed = measure(func, count)
+        print(f'{name:<16} пик памяти {peak / 2 ** 20:8.2f} МиБ, '
+              f'время {elapsed:.2f} с')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,132 @@
+"""Бенчмарк памяти на состояние пользователей.
+
+Запуск:
+python benchmarks/bench_tenant_memory.py [N ...] [--homeworks H]
+    [--models naive,tenant]
+
+Для каждого N и каждой модели в отдельном процессе создаётся
+N пользователей с H работами, и измеряется прирост пикового RSS.
+naive — словарь на пользователя, как локальные переменные main():
+заголовки, payload, текст последнего сообщения и статусы работ
+строками. tenant — engine.Tenant: запись со __slots__, коды статусов,
+без заранее созданных истории и названий.
+"""
+import argparse
+import gc
+import logging
+import os
+import resource
+import subprocess
+import sys
+
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, BASE_DIR)
+
+import homework as hw  # noqa: E402
+from differ import status_code  # noqa: E402
+from engine import Tenant  # noqa: E402
+
+STATUSES = tuple(hw.HOMEWORK_VERDICTS)
+
+
+def token_of(index):
+    """Токен похожей на настоящий длины."""
+    return f'y0_AgAAAAA{index:012}XXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXX'
+
+
+def homeworks_of(index, homeworks):
+    """Работы пользователя: (id, статус, название, date_updated)."""
+    return [
+        (index * 100 + number, STATUSES[(index + number) % len(STATUSES)],
+         f'user{index}__hw{number:02}.zip',
+         f'2023-02-{1 + number % 28:02}T14:40:{index % 60:02}Z')
+        for number in range(homeworks)
+    ]
+
+
+def make_naive(count, homeworks):
+    """Словарь на пользователя со статусами и сообщением строками."""
+    tenants = []
+    for index in range(count):
+        token = token_of(index)
+        works = homeworks_of(index, homeworks)
+        key, status, name, _ = works[-1]
+        tenants.append({
+            'token': token,
+            'chat_id': str(100000 + index),
+            'headers': {'Authorization': f'OAuth {token}'},
+            'payload': {'from_date': 1676300000 + index},
+            'last_status': hw.parse_status(
+                {'homework_name': name, 'status': status}
+            ),
+            'last_error': None,
+            'homeworks': {
+                key: {'status': status + '', 'date_updated': date}
+                for key, status, _, date in works
+            },
+        })
+    return tenants
+
+
+def make_tenants(count, homeworks):
+    """engine.Tenant с кодами статусов."""
+    tenants = []
+    for index in range(count):
+        tenant = Tenant(token_of(index), str(100000 + index),
+                        from_date=1676300000 + index)
+        works = homeworks_of(index, homeworks)
+        tenant.homeworks = {
+            key: (status_code(status), date)
+            for key, status, _, date in works
+        }
+        tenant.status = tenant.homeworks[works[-1][0]][0]
+        tenants.append(tenant)
+    return tenants
+
+
+MODELS = {'naive': make_naive, 'tenant': make_tenants}
+
+
+def peak_rss():
+    """Пиковый RSS процесса в байтах."""
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak if sys.platform == 'darwin' else peak * 1024
+
+
+def measure(model, count, homeworks):
+    """Прирост пикового RSS на модель; выполняется в дочернем процессе."""
+    gc.collect()
+    before = peak_rss()
+    tenants = MODELS[model](count, homeworks)
+    gc.collect()
+    print(peak_rss() - before, len(tenants))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('counts', type=int, nargs='*',
+                        default=[100000, 1000000])
+    parser.add_argument('--homeworks', type=int, default=3)
+    parser.add_argument('--models', default='naive,tenant')
+    parser.add_argument('--child', help=argparse.SUPPRESS)
+    args = parser.parse_args()
+    if args.child:
+        measure(args.child, args.counts[0], args.homeworks)
+        return
+    print(f'Работ на пользователя: {args.homeworks}')
+    for count in args.counts:
+        for model in args.models.split(','):
+            result = subprocess.run(
+                [sys.executable, __file__, str(count),
+                 '--homeworks', str(args.homeworks), '--child', model],
+                capture_output=True, text=True, check=True
+            )
+            used = int(result.stdout.split()[0])
+            print(f'{count:>9} пользователей, {model:<7}: '
+                  f'{used / 2 ** 20:8.1f} МБ, {used / count:7.0f} байт '
+                  f'на пользователя')
+
+
+if __name__ == '__main__':
+    logging.disable(logging.CRITICAL)
+    main()
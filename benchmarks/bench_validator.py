@@ -0,0 +1,109 @@
+"""Бенчмарк проверки ответа API с сотнями и тысячами работ.
+
+Запуск: python benchmarks/bench_validator.py [работ ...] [--number 200]
+
+Сравниваются:
+- прежние check_response() и проверки из parse_status() для каждой
+  работы, с logger.debug на каждую проверку (логгер на уровне DEBUG,
+  как в main(), записи уходят в NullHandler);
+- скомпилированная схема (homework.RESPONSE_VALIDATOR), которая
+  проверяет ответ и все работы за один проход.
+"""
+import argparse
+import logging
+import os
+import sys
+import timeit
+
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, BASE_DIR)
+
+import exceptions as ex  # noqa: E402
+import event_descriptions as ed  # noqa: E402
+import homework as hw  # noqa: E402
+
+logger = logging.getLogger('bench_validator')
+
+
+def make_response(count):
+    return {
+        'homeworks': [
+            {
+                'id': i,
+                'homework_name': f'student__hw{i:04}.zip',
+                'status': ('approved', 'reviewing', 'rejected')[i % 3],
+                'date_updated': '2023-02-13T14:40:57Z',
+                'lesson_name': 'Итоговый проект',
+                'reviewer_comment': 'Принято!',
+            }
+            for i in range(count)
+        ],
+        'current_date': 1676300000,
+    }
+
+
+def old_check_response(response):
+    """check_response() до компилируемой схемы."""
+    if isinstance(response, dict):
+        logger.debug(ed.CHECK_DICT_DEBUG)
+    else:
+        raise ex.ResponseFormatError(ed.CHECK_DICT_ERROR)
+    if 'homeworks' not in response:
+        logger.error(ed.HOMEWORKS_MISSING_ERROR)
+        raise ex.MissingKeyError(ed.HOMEWORKS_MISSING_ERROR)
+    homeworks = response.get('homeworks')
+    if isinstance(homeworks, list):
+        logger.debug(ed.CHECK_LIST_DEBUG)
+    else:
+        raise ex.ResponseFormatError(ed.CHECK_LIST_ERROR)
+    return homeworks
+
+
+def old_check_homework(homework):
+    """Проверки работы из parse_status() до компилируемой схемы."""
+    if isinstance(homework, list):
+        homework, *_ = homework
+    if 'homework_name' not in homework:
+        raise ex.MissingKeyError(ed.MISSING_KEY_ERROR)
+    homework_status = homework.get('status')
+    if homework_status not in hw.HOMEWORK_VERDICTS:
+        raise ex.UnknownStatusError(
+            ed.UNKNOWN_STATUS_ERROR.format(homework_status)
+        )
+
+
+def old(response):
+    for homework in old_check_response(response):
+        old_check_homework(homework)
+
+
+def compiled(response):
+    hw.check_response(response)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('counts', type=int, nargs='*',
+                        default=[10, 500, 5000])
+    parser.add_argument('--number', type=int, default=200)
+    args = parser.parse_args()
+    logger.addHandler(logging.NullHandler())
+    logger.setLevel(logging.DEBUG)
+    logger.propagate = False
+    print(f'{"работ":>6} {"прежние, мкс":>14} {"схема, мкс":>12} '
+          f'{"ускорение":>10}')
+    for count in args.counts:
+        response = make_response(count)
+        number = max(1, args.number * 500 // max(count, 500))
+        results = [
+            min(timeit.repeat(
+                lambda: variant(response), number=number, repeat=3
+            )) / number * 1e6
+            for variant in (old, compiled)
+        ]
+        print(f'{count:>6} {results[0]:>14.1f} {results[1]:>12.1f} '
+              f'{results[0] / results[1]:>9.1f}x')
+
+
+if __name__ == '__main__':
+    main()
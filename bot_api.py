@@ -0,0 +1,74 @@
+"""Минимальная отправка сообщений через Telegram Bot API.
+
+Боту из homework.py нужен только метод sendMessage, а загрузка
+python-telegram-bot со всеми зависимостями занимает больше времени,
+чем весь остальной запуск. BotApiSender отправляет sendMessage одним
+POST-запросом через свою сессию requests, так что соединение с Bot API
+(и TLS) открывается один раз и переиспользуется. Включается переменной
+окружения TELEGRAM_SENDER=light — и в homework.py, и в engine.py,
+где через него идёт только отправка: команды по-прежнему читает
+python-telegram-bot.
+"""
+import os
+
+import event_descriptions as ed  # Импорт описания событий
+import exceptions as ex  # Импорт польз. исключений.
+from lazy import lazy_import
+
+requests = lazy_import('requests')
+
+TELEGRAM_API_URL = 'https://api.telegram.org/bot'
+# ptb — python-telegram-bot, light — BotApiSender.
+TELEGRAM_SENDER = os.getenv('TELEGRAM_SENDER', 'ptb')
+SEND_TIMEOUT = 10
+
+
+class BotApiSender:
+    """Бот с единственным методом send_message()."""
+
+    def __init__(self, token, base_url=None, timeout=SEND_TIMEOUT):
+        self.url = f'{base_url or TELEGRAM_API_URL}{token}/'
+        self.timeout = timeout
+        # Создаётся при первой отправке, чтобы не загружать requests
+        # при импорте.
+        self.session = None
+
+    def request(self, method, payload):
+        """Вызов метода Bot API; возвращает поле result ответа."""
+        if self.session is None:
+            self.session = requests.Session()
+        try:
+            response = self.session.post(
+                self.url + method, json=payload, timeout=self.timeout
+            )
+            data = response.json()
+        except requests.RequestException as error:
+            raise ex.BotAPIError(
+                ed.BOT_API_REQUEST_ERROR.format(error)
+            ) from error
+        except ValueError as error:
+            raise ex.BotAPIError(
+                ed.BOT_API_ERROR.format(response.status_code, response.text),
+                error_code=response.status_code
+            ) from error
+        if not data.get('ok'):
+            raise ex.BotAPIError(
+                ed.BOT_API_ERROR.format(
+                    data.get('error_code'), data.get('description')
+                ),
+                retry_after=data.get('parameters', {}).get('retry_after'),
+                error_code=data.get('error_code')
+            )
+        return data['result']
+
+    def send_message(self, chat_id, text, **kwargs):
+        """Отправка сообщения в чат."""
+        return self.request(
+            'sendMessage', dict(kwargs, chat_id=chat_id, text=text)
+        )
+
+    def close(self):
+        """Закрытие соединений сессии."""
+        if self.session is not None:
+            self.session.close()
+            self.session = None
@@ -0,0 +1,168 @@
+"""Команды /status и /history из сохранённого состояния.
+
+Обновления Telegram читаются длинным опросом getUpdates в отдельном
+потоке и обрабатываются в цикле событий движка параллельно с опросом
+API. Ответы строятся только из состояния пользователя в памяти:
+последних статусов работ и истории их изменений, без запросов к API
+Практикума. Ответы отправляются через общую очередь отправки
+и подчиняются её ограничениям скорости. Язык ответа — язык чата
+из каталога сообщений (messages).
+"""
+import asyncio
+import logging
+import os
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+
+import telegram
+
+import event_descriptions as ed  # Импорт описания событий
+import messages
+import metrics
+from differ import status_name
+
+COMMAND_POLL_TIMEOUT = int(os.getenv('COMMAND_POLL_TIMEOUT', 25))
+# Пауза перед повтором getUpdates после ошибки.
+COMMAND_RETRY_DELAY = 5
+# Сколько изменений статусов показывать в /history.
+HISTORY_LIMIT = int(os.getenv('HISTORY_LIMIT', 10))
+
+logger = logging.getLogger(__name__)
+
+
+def verdict(status, language=None):
+    """Текст статуса работы по его коду."""
+    return messages.verdict(status_name(status), language)
+
+
+def short_date(date_updated):
+    """Дата изменения без секунд: 2023-02-13 14:40."""
+    if not date_updated:
+        return '—'
+    return date_updated[:16].replace('T', ' ')
+
+
+def chat_language(tenants):
+    """Язык чата: язык первого из его пользователей."""
+    return getattr(tenants[0], 'language', None)
+
+
+def status_reply(tenants):
+    """Ответ на /status: последний статус каждой работы."""
+    language = chat_language(tenants)
+    lines = [
+        messages.render(
+            'status_line', language,
+            tenant.name_of(key), verdict(status, language)
+        )
+        for tenant in tenants
+        for key, (status, _) in tenant.homeworks.items()
+    ]
+    if not lines:
+        return messages.text('status_empty', language)
+    return '\n'.join([messages.text('status_header', language), *lines])
+
+
+def history_reply(tenants):
+    """Ответ на /history: последние изменения статусов."""
+    language = chat_language(tenants)
+    lines = [
+        messages.render(
+            'history_line', language,
+            short_date(date_updated), name or key, verdict(status, language)
+        )
+        for tenant in tenants
+        for key, name, status, date_updated in tenant.history
+    ]
+    if not lines:
+        return messages.text('history_empty', language)
+    return '\n'.join([
+        messages.text('history_header', language), *lines[-HISTORY_LIMIT:]
+    ])
+
+
+COMMANDS = {
+    '/status': status_reply,
+    '/history': history_reply,
+}
+
+
+class CommandListener:
+    """Чтение команд из Telegram и ответы на них."""
+
+    def __init__(self, bot, tenants, outbound,
+                 timeout=COMMAND_POLL_TIMEOUT, active=None, refresh=None):
+        self.bot = bot
+        self.outbound = outbound
+        self.timeout = timeout
+        # При нескольких воркерах команды читает только один из них
+        # (active), а состояние чужих пользователей он перечитывает
+        # из хранилища перед ответом (refresh).
+        self.active = active
+        self.refresh = refresh
+        self.by_chat = {}
+        for tenant in tenants:
+            self.by_chat.setdefault(str(tenant.chat_id), []).append(tenant)
+        # Длинный опрос держит поток, поэтому у него свой пул.
+        self.executor = ThreadPoolExecutor(
+            max_workers=1, thread_name_prefix='commands'
+        )
+        self.offset = None
+        self.handled = 0
+
+    def answer(self, chat_id, text):
+        """Ответ на сообщение; None — сообщение не из наших чатов."""
+        tenants = self.by_chat.get(str(chat_id))
+        if not tenants:
+            return None
+        command = text.split(maxsplit=1)[0].split('@')[0].lower()
+        reply = COMMANDS.get(command)
+        if reply is None:
+            return messages.text('help', chat_language(tenants))
+        with metrics.COMMAND_LATENCY.time(command):
+            if self.refresh is not None:
+                self.refresh(tenants)
+            return reply(tenants)
+
+    def handle(self, update):
+        """Обработка одного обновления."""
+        message = update.message
+        if message is None or not message.text:
+            return
+        reply = self.answer(message.chat_id, message.text)
+        if reply is not None:
+            self.outbound.put(message.chat_id, reply)
+            self.handled += 1
+
+    async def poll_once(self):
+        """Один запрос getUpdates и обработка полученных обновлений."""
+        loop = asyncio.get_running_loop()
+        updates = await loop.run_in_executor(self.executor, partial(
+            self.bot.get_updates,
+            offset=self.offset,
+            timeout=self.timeout,
+            allowed_updates=['message'],
+        ))
+        for update in updates:
+            self.offset = update.update_id + 1
+            self.handle(update)
+
+    async def run(self):
+        """Бесконечный цикл чтения команд."""
+        try:
+            while True:
+                if self.active is not None and not self.active():
+                    await asyncio.sleep(COMMAND_RETRY_DELAY)
+                    continue
+                try:
+                    await self.poll_once()
+                except telegram.error.TelegramError as error:
+                    logger.error(ed.COMMAND_POLL_ERROR.format(error))
+                    await asyncio.sleep(COMMAND_RETRY_DELAY)
+                except Exception as error:
+                    logger.exception(
+                        ed.BACKGROUND_TASK_ERROR.format('commands', error)
+                    )
+                    await asyncio.sleep(COMMAND_RETRY_DELAY)
+        finally:
+            self.executor.shutdown(wait=False)
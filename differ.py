@@ -0,0 +1,111 @@
+"""Поиск изменившихся работ в ответе API Практикума.
+
+Работы индексируются по id, и для каждой сравнивается пара
+(статус, date_updated) с последним известным снимком. Каждое
+реальное изменение даёт одно событие, даже если в ответе изменились
+сразу несколько работ, а изменение формулировок сообщений событием
+не считается.
+"""
+import threading
+from collections import namedtuple
+
+HomeworkEvent = namedtuple(
+    'HomeworkEvent', ('key', 'homework', 'old_state', 'state')
+)
+
+# Статус в состоянии работы хранится кодом — небольшим числом из кэша
+# малых целых, а не отдельной строкой из каждого ответа API. Коды
+# назначаются при первой встрече статуса; известные статусы заранее
+# регистрирует homework.py. Коды действуют только внутри процесса,
+# на диск статусы пишутся строками.
+STATUS_NAMES = []
+STATUS_CODES = {}
+MAX_STATUS_CODES = 256
+_codes_lock = threading.Lock()
+
+
+def status_code(status):
+    """Код статуса.
+
+    Статус не строкой (испорченный ответ) сначала приводится к строке,
+    как при записи в базу. Когда кодов слишком много, возвращается
+    сама строка.
+    """
+    if status is None:
+        return None
+    if not isinstance(status, str):
+        status = str(status)
+    code = STATUS_CODES.get(status)
+    if code is not None:
+        return code
+    with _codes_lock:
+        code = STATUS_CODES.get(status)
+        if code is None:
+            if len(STATUS_NAMES) >= MAX_STATUS_CODES:
+                return status
+            code = len(STATUS_NAMES)
+            STATUS_NAMES.append(status)
+            STATUS_CODES[status] = code
+    return code
+
+
+def status_name(code):
+    """Статус по коду; строки и None возвращаются как есть."""
+    if isinstance(code, int):
+        return STATUS_NAMES[code]
+    return code
+
+
+def status_codes(statuses):
+    """Коды статусов списком; известные берутся прямо из словаря."""
+    try:
+        codes = list(map(STATUS_CODES.get, statuses))
+    except TypeError:
+        # В испорченном ответе статус может быть списком или словарём.
+        return list(map(status_code, statuses))
+    if None in codes:
+        codes = [
+            status_code(status) if code is None else code
+            for status, code in zip(statuses, codes)
+        ]
+    return codes
+
+
+def register_statuses(statuses):
+    """Коды для известных статусов в порядке перечисления."""
+    for status in statuses:
+        status_code(status)
+
+
+def diff_homeworks(snapshot, homeworks):
+    """События для работ, состояние которых отличается от снимка.
+
+    Работа определяется по id, а без него — по названию.
+    snapshot — словарь {id работы: (код статуса, date_updated)}, он
+    не меняется: событие применяется через apply_event() после того,
+    как уведомление о нём успешно подготовлено.
+    При опросе с from_date в ответе только изменившиеся работы,
+    поэтому стоимость пропорциональна числу изменений.
+    """
+    # Индекс по id: если работа встречается в ответе дважды,
+    # учитывается последняя запись.
+    events = {}
+    get = snapshot.get
+    for homework in homeworks:
+        key = homework.get('id')
+        if key is None:
+            key = homework.get('homework_name')
+        state = (
+            status_code(homework.get('status')), homework.get('date_updated')
+        )
+        old_state = get(key)
+        if old_state != state:
+            events[key] = HomeworkEvent(key, homework, old_state, state)
+        elif key in events:
+            del events[key]
+    return list(events.values())
+
+
+def apply_event(snapshot, event):
+    """Запись нового состояния работы в снимок."""
+    snapshot[event.key] = event.state
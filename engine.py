@@ -0,0 +1,678 @@
+"""Асинхронный движок опроса API Практикума для множества пользователей.
+
+Каждый пользователь (tenant) — это пара «токен Практикума — чат Telegram».
+Все пользователи опрашиваются в одном процессе: блокирующие запросы
+к API и к Telegram выполняются в общем пуле потоков, а ожидание между
+опросами — в цикле событий asyncio, поэтому простаивающий пользователь
+стоит только одной спящей корутины.
+"""
+import asyncio
+import csv
+import logging
+import os
+import random
+import signal
+import sqlite3
+import sys
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+from http import HTTPStatus
+
+import telegram
+from telegram.utils.request import Request
+
+import exceptions as ex  # Импорт польз. исключений.
+import event_descriptions as ed  # Импорт описания событий
+import homework as hw
+import http_pool
+import metrics
+from bot_api import TELEGRAM_SENDER, BotApiSender
+from commands import HISTORY_LIMIT, CommandListener
+from differ import apply_event, diff_homeworks, status_name
+from error_digest import DIGEST_INTERVAL, ErrorDigest
+from journal import JOURNAL_FILE, Journal
+from messages import language_of, status_message
+from outbound import (
+    GLOBAL_RATE, SEND_WORKERS, TELEGRAM_BASE_URL, OutboundQueue
+)
+from resilience import CircuitBreaker, RetryPolicy, is_transient
+from response_cache import ResponseCache
+from scheduler import AdaptiveScheduler
+from sharding import COMMANDS_LEASE, WORKER_ID, LeaseManager
+from single_flight import SharedResponse, SingleFlight
+from state_store import STATE_FLUSH_INTERVAL, StateStore, tenant_key
+from stream_decode import STREAM_CHUNK_SIZE, HomeworkStream
+
+TENANTS_FILE = os.getenv('TENANTS_FILE', 'tenants.csv')
+POLL_CONCURRENCY = int(os.getenv('POLL_CONCURRENCY', 64))
+# Потоковый разбор ответов вместо response.json().
+STREAM_RESPONSES = os.getenv('STREAM_RESPONSES', '') == '1'
+# Ответы на /status и /history через getUpdates.
+COMMANDS_ENABLED = os.getenv('COMMANDS_ENABLED', '1') == '1'
+# Воркер из нескольких: пользователи делятся через аренды (sharding.py).
+SHARDING = os.getenv('SHARDING', '') == '1'
+
+logger = logging.getLogger(__name__)
+
+
+class Tenant:
+    """Пользователь бота и состояние его опроса.
+
+    Пользователей — сотни тысяч, поэтому у записи нет __dict__, статусы
+    хранятся кодами (differ.status_code), а заголовки и параметры
+    запроса собираются при обращении. История изменений и названия
+    работ заводятся при первом изменении статуса.
+    """
+
+    __slots__ = (
+        'token', 'chat_id', 'language', 'key', 'from_date', 'homeworks',
+        'status', 'idle_polls', 'history', 'names',
+    )
+
+    def __init__(self, token, chat_id, from_date=None, language=None):
+        self.token = token
+        self.chat_id = chat_id
+        # Язык сообщений чата; None — язык по умолчанию.
+        self.language = language_of(language) if language else None
+        self.key = tenant_key(token, chat_id)
+        self.from_date = from_date or int(time.time())
+        # Работа -> (код статуса, date_updated) из последних ответов API.
+        self.homeworks = {}
+        # Код статуса из ответа API и опросы подряд без изменений.
+        self.status = None
+        self.idle_polls = 0
+        # Последние изменения статусов и названия работ для команд.
+        self.history = ()
+        self.names = None
+
+    @property
+    def headers(self):
+        """Заголовки запроса к API."""
+        return {'Authorization': f'OAuth {self.token}'}
+
+    @property
+    def payload(self):
+        """Параметры запроса к API."""
+        return {'from_date': self.from_date}
+
+    def reset(self):
+        """Забыть состояние перед повторным чтением из хранилища."""
+        self.homeworks = {}
+        self.history = ()
+
+    def restore(self, from_date, homeworks, history=()):
+        """Восстановление состояния, сохранённого до перезапуска."""
+        for transition in history:
+            self.record(*transition)
+        if from_date is not None:
+            self.from_date = from_date
+        if homeworks:
+            self.homeworks = homeworks
+            # Для расписания важен статус последней изменившейся работы.
+            self.status, _ = max(
+                homeworks.values(), key=lambda state: state[1] or ''
+            )
+
+    def record(self, key, name, status, date_updated):
+        """Запоминание изменения статуса для /status и /history."""
+        if name:
+            if self.names is None:
+                self.names = {}
+            self.names[key] = name
+        if not self.history:
+            self.history = deque(maxlen=HISTORY_LIMIT)
+        self.history.append((key, name, status, date_updated))
+
+    def name_of(self, key):
+        """Название работы; без названия — её id."""
+        return self.names.get(key, key) if self.names else key
+
+
+def load_tenants(path=TENANTS_FILE):
+    """Загрузка пользователей из CSV-файла «токен,chat_id[,язык]».
+
+    Пустые строки и строки, начинающиеся с #, пропускаются.
+    Если файла нет, единственный пользователь берётся
+    из переменных окружения, как в homework.main().
+    """
+    if not os.path.exists(path):
+        logger.info(ed.TENANTS_FILE_MISSING_LOG.format(path))
+        if hw.PRACTICUM_TOKEN and hw.TELEGRAM_CHAT_ID:
+            return [Tenant(hw.PRACTICUM_TOKEN, hw.TELEGRAM_CHAT_ID)]
+        return []
+    tenants = []
+    with open(path, encoding='UTF-8', newline='') as file:
+        for line_no, row in enumerate(csv.reader(file), start=1):
+            if not row or row[0].lstrip().startswith('#'):
+                continue
+            if len(row) not in (2, 3) or not all(
+                value.strip() for value in row[:2]
+            ):
+                logger.error(ed.TENANT_LINE_ERROR.format(line_no, row))
+                continue
+            token, chat_id, *language = (value.strip() for value in row)
+            tenants.append(Tenant(token, chat_id, language=(
+                language[0] if language else None
+            )))
+    return tenants
+
+
+def fetch_shared(headers, payload):
+    """Запрос к API с ответом, который можно отдать нескольким."""
+    return SharedResponse(hw.fetch_api(headers, payload))
+
+
+class PollingEngine:
+    """Опрос API Практикума для всех пользователей в одном процессе."""
+
+    def __init__(self, bot, tenants, scheduler=None, store=None,
+                 concurrency=POLL_CONCURRENCY, stream=STREAM_RESPONSES,
+                 retry=None, breaker=None, commands=False, leases=None,
+                 journal=None, sender=None):
+        self.bot = bot
+        self.tenants = list(tenants)
+        self.store = store
+        self.journal = journal
+        self.stream = stream
+        self.leases = leases
+        # Пользователи, опрос которых идёт сейчас: их аренды
+        # не отпускаются до конца опроса.
+        self.busy = set()
+        self.scheduler = scheduler or AdaptiveScheduler()
+        self.retry = retry or RetryPolicy()
+        self.breaker = breaker or CircuitBreaker()
+        self.digest = ErrorDigest()
+        self.cache = ResponseCache(fingerprint_body=not stream)
+        # Кэшируются только успешные ответы: сбой нужно повторить.
+        self.flights = SingleFlight(
+            cacheable=lambda response: response.status_code == HTTPStatus.OK
+        )
+        # sender — отдельный бот только для отправки (BotApiSender);
+        # команды всегда читает bot.
+        self.outbound = OutboundQueue(sender or bot)
+        self.executor = ThreadPoolExecutor(
+            max_workers=concurrency, thread_name_prefix='poll'
+        )
+        self.commands = None
+        if commands and leases is None:
+            self.commands = CommandListener(bot, self.tenants, self.outbound)
+        elif commands:
+            self.commands = CommandListener(
+                bot, self.tenants, self.outbound,
+                active=lambda: leases.lease(COMMANDS_LEASE) is not None,
+                refresh=self.refresh
+            )
+        self.polls = 0
+        self.errors = 0
+        self.retries = 0
+        metrics.BREAKER_STATE.set_function(lambda: self.breaker.state_code)
+        for outcome in ('upstream', 'coalesced', 'cached'):
+            metrics.API_CALLS.set_function(
+                lambda outcome=outcome: getattr(self.flights, outcome),
+                outcome
+            )
+        metrics.QUEUE_DEPTH.set_function(
+            lambda: self.outbound.depth, 'outbound'
+        )
+        metrics.QUEUE_DEPTH.set_function(
+            lambda: self.executor._work_queue.qsize(), 'poll_executor'
+        )
+        if store is not None:
+            metrics.QUEUE_DEPTH.set_function(
+                lambda: store.pending, 'state_store'
+            )
+
+    async def call(self, func, *args):
+        """Выполнение блокирующей функции в пуле потоков движка."""
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self.executor, func, *args)
+
+    async def notify(self, tenant, message, on_sent=None):
+        """Постановка сообщения пользователю в очередь отправки."""
+        self.outbound.put(tenant.chat_id, message, on_sent=on_sent)
+
+    async def notify_error(self, tenant, error, message):
+        """Сообщение об ошибке, если такая же не отправлялась в окне."""
+        if self.digest.report(error, tenant.chat_id):
+            await self.notify(tenant, message)
+        else:
+            metrics.ERRORS_SUPPRESSED.inc()
+
+    async def poll(self, tenant):
+        """Один цикл опроса: запрос, проверка ответа, уведомление."""
+        tenant.idle_polls += 1
+        start = time.perf_counter()
+        try:
+            with metrics.STAGE_LATENCY.time('get_api_answer'):
+                api_response = await self.fetch(tenant)
+            if self.cache.is_unchanged(tenant.key, api_response):
+                logger.debug(ed.RESPONSE_NOT_CHANGED_LOG)
+                return
+            with metrics.STAGE_LATENCY.time('check_response'):
+                events, current_date = await self.decode(
+                    tenant, api_response
+                )
+            for event in events:
+                with metrics.STAGE_LATENCY.time('parse_status'):
+                    message = hw.render_status(
+                        event.homework, tenant.language
+                    )
+                await self.notify(tenant, message, self.observe(tenant, event))
+                self.commit(tenant, event)
+            if not events:
+                logger.debug(ed.STATUS_NOT_CHANGED_LOG)
+            self.advance(tenant, current_date)
+            self.cache.remember(tenant.key, api_response)
+        except (
+            ex.ResponseFormatError,
+            ex.MissingKeyError,
+            ex.UnknownStatusError,
+            ex.HTTPStatusError,
+            ex.APIRequestError
+        ) as error:
+            self.errors += 1
+            metrics.ERRORS.inc(type(error).__name__)
+            logger.error(error)
+            await self.notify_error(tenant, error, str(error))
+        except ex.CircuitOpenError as error:
+            # Сбой общий для всех: пользователям о нём не пишем.
+            metrics.ERRORS.inc(type(error).__name__)
+            logger.warning(error)
+        except Exception as error:
+            self.errors += 1
+            metrics.ERRORS.inc(type(error).__name__)
+            message = ed.UNIVERSAL_ERROR.format(error)
+            logger.error(message)
+            await self.notify_error(tenant, error, message)
+        finally:
+            self.polls += 1
+            metrics.POLL_DURATION.observe(time.perf_counter() - start)
+
+    async def fetch(self, tenant):
+        """Запрос к API с повторами временных сбоев.
+
+        Каждый запрос проходит через общий предохранитель и любым
+        исходом, кроме ответа, засчитывается ему как сбой: иначе
+        зависшая проба оставила бы его полуоткрытым навсегда. Если
+        повторы исчерпаны, возвращается последний ответ (его код
+        проверит разбор) или пробрасывается APIRequestError.
+        """
+        headers = self.cache.conditional_headers(tenant.key, tenant.headers)
+        retry = 0
+        while True:
+            if not self.breaker.allow():
+                metrics.BREAKER_REJECTED.inc()
+                raise ex.CircuitOpenError(ed.CIRCUIT_OPEN_ERROR)
+            try:
+                api_response = await self.call(
+                    self.request, headers, tenant.payload
+                )
+            except ex.APIRequestError:
+                self.breaker.failure()
+                if retry + 1 >= self.retry.attempts:
+                    raise
+            except BaseException:
+                self.breaker.failure()
+                raise
+            else:
+                metrics.HTTP_RESPONSES.inc(str(api_response.status_code))
+                if not is_transient(api_response.status_code):
+                    self.breaker.success()
+                    return api_response
+                self.breaker.failure()
+                if retry + 1 >= self.retry.attempts:
+                    return api_response
+                api_response.close()
+            retry += 1
+            self.retries += 1
+            metrics.RETRIES.inc()
+            delay = self.retry.delay(retry)
+            logger.debug(ed.API_RETRY_LOG.format(retry, delay))
+            await asyncio.sleep(delay)
+
+    def request(self, headers, payload):
+        """Запрос к API; выполняется в пуле потоков.
+
+        Одинаковые запросы (токен, from_date и условные заголовки)
+        объединяются. Потоковый ответ можно прочитать только один раз,
+        поэтому при stream запросы не объединяются.
+        """
+        if self.stream:
+            return hw.fetch_api(headers, payload, True)
+        key = (payload['from_date'], *sorted(headers.items()))
+        return self.flights.do(key, fetch_shared, headers, payload)
+
+    async def decode(self, tenant, api_response):
+        """События по ответу API и current_date этого ответа."""
+        if self.stream:
+            return await self.call(self.decode_stream, tenant, api_response)
+        response = hw.decode_response(api_response)
+        homeworks = hw.check_response(response)
+        return (
+            diff_homeworks(tenant.homeworks, homeworks),
+            response.get('current_date')
+        )
+
+    def decode_stream(self, tenant, api_response):
+        """Потоковый разбор ответа; выполняется в пуле потоков.
+
+        В памяти остаются только изменившиеся работы, а не весь ответ.
+        """
+        try:
+            hw.check_status_code(api_response)
+            stream = HomeworkStream(
+                api_response.iter_content(STREAM_CHUNK_SIZE),
+                hw.HOMEWORK_VALIDATOR
+            )
+            events = diff_homeworks(tenant.homeworks, stream)
+            return events, stream.fields.get('current_date')
+        finally:
+            api_response.close()
+
+    def advance(self, tenant, current_date):
+        """Сдвиг from_date после успешного опроса.
+
+        from_date двигаем на каждом успешном опросе: тогда в ответах
+        только изменившиеся работы.
+        """
+        if current_date is None:
+            return
+        tenant.from_date = int(current_date)
+        if self.store is not None:
+            self.store.set_watermark(tenant.key, tenant.from_date)
+
+    def observe(self, tenant, event):
+        """Запись изменения в журнал; вызов для отметки об отправке."""
+        if self.journal is None:
+            return None
+        transition = self.journal.observe(
+            tenant.key, event.key, event.homework.get('homework_name'),
+            status_name(event.old_state[0]) if event.old_state else None,
+            status_name(event.state[0])
+        )
+        return partial(self.journal.mark_sent, transition)
+
+    def resend_unsent(self):
+        """Повторная отправка уведомлений, не ушедших до перезапуска.
+
+        Если процесс упал после отправки, но до записи отметки о ней,
+        уведомление придёт второй раз: лучше дважды, чем ни разу.
+        """
+        records = self.journal.replay()
+        by_key = {tenant.key: tenant for tenant in self.tenants}
+        resent = 0
+        for transition in self.journal.unsent():
+            tenant = by_key.get(transition.tenant)
+            if tenant is None:
+                continue
+            self.outbound.put(
+                tenant.chat_id,
+                status_message(
+                    transition.name or transition.homework,
+                    transition.status, tenant.language
+                ),
+                on_sent=partial(self.journal.mark_sent, transition)
+            )
+            resent += 1
+        logger.info(ed.JOURNAL_REPLAY_LOG.format(
+            records, len(self.journal.latest), resent
+        ))
+
+    def commit(self, tenant, event):
+        """Запись изменения статуса работы после уведомления."""
+        apply_event(tenant.homeworks, event)
+        name = event.homework.get('homework_name')
+        tenant.record(event.key, name, *event.state)
+        tenant.status = event.state[0]
+        tenant.idle_polls = 0
+        if self.store is not None:
+            self.store.set_status(tenant.key, event.key, *event.state)
+            self.store.add_transition(
+                tenant.key, event.key, name, *event.state
+            )
+
+    def lease(self, tenant):
+        """Номер аренды пользователя; None — его опрашивает другой воркер.
+
+        Без аренд все пользователи свои, и номер один и тот же.
+        """
+        if self.leases is None:
+            return 0
+        return self.leases.lease(tenant.key)
+
+    def load_state(self, tenant):
+        """Чтение состояния пользователя из хранилища."""
+        if self.store is None:
+            return
+        tenant.reset()
+        tenant.restore(
+            *self.store.get(tenant.key),
+            self.store.history(tenant.key, HISTORY_LIMIT)
+        )
+
+    def refresh(self, tenants):
+        """Перечитывание состояния пользователей других воркеров."""
+        for tenant in tenants:
+            if self.lease(tenant) is None:
+                self.load_state(tenant)
+
+    async def run_tenant(self, tenant):
+        """Бесконечный цикл опроса одного пользователя.
+
+        Состояние читается из хранилища при каждом получении аренды:
+        пока пользователь был у другого воркера, оно могло измениться.
+        """
+        # Первые запросы разносим по периоду, чтобы не было всплеска.
+        await asyncio.sleep(random.uniform(0, hw.RETRY_PERIOD))
+        loaded = None
+        while True:
+            lease = self.lease(tenant)
+            if lease is None:
+                loaded = None
+                await asyncio.sleep(self.leases.renew_interval)
+                continue
+            if lease != loaded:
+                self.load_state(tenant)
+                loaded = lease
+            self.busy.add(tenant.key)
+            try:
+                await self.poll(tenant)
+            finally:
+                self.busy.discard(tenant.key)
+            await asyncio.sleep(
+                self.scheduler.next_delay(tenant.status, tenant.idle_polls)
+            )
+
+    async def rebalance(self):
+        """Продление аренд и передача пользователей другим воркерам.
+
+        Состояние уходящих пользователей записывается на диск до того,
+        как их аренды станут доступны новому владельцу.
+        """
+        while True:
+            try:
+                leaving = await self.call(
+                    self.leases.renew, frozenset(self.busy)
+                )
+                if leaving:
+                    if self.store is not None:
+                        await self.call(self.store.flush)
+                    await self.call(self.leases.release, leaving)
+                logger.debug(ed.LEASE_RENEW_LOG.format(
+                    len(self.leases.workers), len(self.leases.owned),
+                    len(leaving)
+                ))
+                # Ограничение Telegram общее для бота: делим его поровну.
+                self.outbound.set_global_rate(
+                    GLOBAL_RATE / max(1, len(self.leases.workers))
+                )
+            except sqlite3.Error as error:
+                logger.error(ed.LEASE_ERROR.format(error))
+            except Exception as error:
+                logger.exception(
+                    ed.BACKGROUND_TASK_ERROR.format('rebalance', error)
+                )
+            await asyncio.sleep(self.leases.renew_interval)
+
+    async def flush_state(self):
+        """Периодическая запись состояния и журнала на диск."""
+        while True:
+            await asyncio.sleep(STATE_FLUSH_INTERVAL)
+            if self.store is not None:
+                try:
+                    await self.call(self.store.flush)
+                except Exception as error:
+                    logger.error(ed.STATE_FLUSH_ERROR.format(error))
+            if self.journal is not None:
+                try:
+                    await self.call(self.journal.flush)
+                except OSError as error:
+                    logger.error(ed.JOURNAL_FLUSH_ERROR.format(error))
+                except Exception as error:
+                    logger.exception(
+                        ed.BACKGROUND_TASK_ERROR.format('journal', error)
+                    )
+
+    async def flush_digests(self):
+        """Периодическая отправка сводок по подавленным ошибкам."""
+        while True:
+            await asyncio.sleep(DIGEST_INTERVAL)
+            try:
+                for chat_id, message in self.digest.flush():
+                    self.outbound.put(chat_id, message)
+            except Exception as error:
+                logger.exception(
+                    ed.BACKGROUND_TASK_ERROR.format('digests', error)
+                )
+
+    async def run(self):
+        """Запуск опроса всех пользователей.
+
+        Фоновые циклы сами ловят и логируют свои ошибки: исключение
+        из любой задачи gather() остановило бы опрос всех пользователей.
+        """
+        logger.info(ed.ENGINE_START_LOG.format(len(self.tenants)))
+        tasks = [self.run_tenant(tenant) for tenant in self.tenants]
+        tasks.append(self.flush_digests())
+        if self.commands is not None:
+            tasks.append(self.commands.run())
+        if self.store is not None or self.journal is not None:
+            tasks.append(self.flush_state())
+        if self.leases is not None:
+            tasks.append(self.rebalance())
+        if self.journal is not None:
+            self.resend_unsent()
+        self.outbound.start()
+        try:
+            await asyncio.gather(*tasks)
+        finally:
+            if self.store is not None:
+                self.store.flush()
+            if self.journal is not None:
+                self.journal.flush()
+                logger.info(ed.JOURNAL_STATS_LOG.format(
+                    self.journal.written, self.journal.compactions,
+                    self.journal.size
+                ))
+            if self.leases is not None:
+                self.leases.close()
+                logger.info(ed.LEASE_STATS_LOG.format(
+                    self.leases.acquired, self.leases.released
+                ))
+            await self.outbound.stop()
+            self.executor.shutdown(wait=False)
+            logger.info(ed.OUTBOUND_STATS_LOG.format(
+                self.outbound.sent, self.outbound.failed,
+                self.outbound.retried, self.outbound.depth
+            ))
+            stats = http_pool.STATS
+            logger.info(ed.HTTP_POOL_STATS_LOG.format(
+                stats.requests, stats.new_connections, stats.reused
+            ))
+            logger.info(ed.SCHEDULER_STATS_LOG.format(
+                self.scheduler.polls, self.scheduler.calls_saved
+            ))
+            logger.info(ed.BREAKER_STATS_LOG.format(
+                self.breaker.opened, self.breaker.rejected, self.retries
+            ))
+            logger.info(ed.COALESCE_STATS_LOG.format(
+                self.flights.upstream, self.flights.coalesced,
+                self.flights.cached
+            ))
+            logger.info(ed.RESPONSE_CACHE_STATS_LOG.format(
+                self.cache.hits, self.cache.misses,
+                self.cache.not_modified, self.cache.hit_rate
+            ))
+
+
+async def run_until_stopped(polling):
+    """Работа движка до SIGTERM.
+
+    SIGTERM при остановке или перезапуске платформой отменяет опрос,
+    как Ctrl+C, и run() успевает записать состояние и журнал
+    и отпустить аренды.
+    """
+    loop = asyncio.get_running_loop()
+    task = asyncio.current_task()
+
+    def stop():
+        logger.info(ed.SHUTDOWN_SIGNAL_LOG.format(signal.SIGTERM.name))
+        task.cancel()
+
+    loop.add_signal_handler(signal.SIGTERM, stop)
+    try:
+        await polling.run()
+    except asyncio.CancelledError:
+        pass
+    finally:
+        loop.remove_signal_handler(signal.SIGTERM)
+
+
+def main():
+    """Запуск движка для всех пользователей из файла."""
+    if not hw.TELEGRAM_TOKEN:
+        logger.critical(ed.TOKEN_CRIT_ERROR)
+        sys.exit(1)
+    tenants = load_tenants()
+    if not tenants:
+        logger.critical(ed.TENANTS_EMPTY_ERROR)
+        sys.exit(1)
+    bot = telegram.Bot(
+        token=hw.TELEGRAM_TOKEN,
+        base_url=TELEGRAM_BASE_URL,
+        # Ещё одно соединение — для длинного опроса команд.
+        request=Request(con_pool_size=SEND_WORKERS + 1)
+    )
+    sender = BotApiSender(
+        token=hw.TELEGRAM_TOKEN, base_url=TELEGRAM_BASE_URL
+    ) if TELEGRAM_SENDER == 'light' else None
+    http_pool.install(pool_maxsize=POLL_CONCURRENCY)
+    store = StateStore()
+    # У каждого воркера свой журнал: файл дописывает один процесс.
+    journal = Journal(
+        f'{JOURNAL_FILE}.{WORKER_ID.replace(":", "-")}'
+        if SHARDING else JOURNAL_FILE
+    )
+    leases = LeaseManager(
+        [tenant.key for tenant in tenants] + [COMMANDS_LEASE]
+    ) if SHARDING else None
+    server = metrics.serve() if metrics.METRICS_PORT else None
+    try:
+        asyncio.run(run_until_stopped(PollingEngine(
+            bot, tenants, store=store, commands=COMMANDS_ENABLED,
+            leases=leases, journal=journal, sender=sender
+        )))
+    finally:
+        if sender is not None:
+            sender.close()
+        if server is not None:
+            server.shutdown()
+        journal.close()
+        store.close()
+        http_pool.close()
+
+
+if __name__ == '__main__':
+    main()
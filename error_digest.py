@@ -0,0 +1,117 @@
+"""Подавление повторяющихся ошибок и сводки по ним.
+
+Ошибка определяется классом исключения и шаблоном сообщения
+из event_descriptions: «Ошибка доступа к API ... HTTPStatus = 500»
+и «... HTTPStatus = 503» — одна и та же ошибка HTTP_STATUS_ERROR.
+Первая ошибка в окне ERROR_WINDOW секунд отправляется сразу,
+повторы в этом окне только считаются, а после окончания окна
+отправляется сводка: сколько раз ошибка повторилась.
+"""
+import os
+import re
+import time
+from functools import lru_cache
+
+import event_descriptions as ed  # Импорт описания событий
+
+ERROR_WINDOW = int(os.getenv('ERROR_WINDOW', 3600))
+# Как часто движок проверяет, не пора ли отправить сводки.
+DIGEST_INTERVAL = 60
+
+PLACEHOLDER = re.compile(r'\{[^{}]*\}')
+DIGITS = re.compile(r'\d+')
+
+
+def compile_templates(module):
+    """Регулярные выражения для строк-шаблонов модуля описаний.
+
+    Более длинные шаблоны проверяются первыми: у них больше
+    постоянного текста, и они точнее.
+    """
+    templates = []
+    for name, value in vars(module).items():
+        if not name.isupper() or not isinstance(value, str):
+            continue
+        pattern = '(?:.*)'.join(
+            re.escape(part) for part in PLACEHOLDER.split(value)
+        )
+        templates.append((
+            len(PLACEHOLDER.sub('', value)),
+            name,
+            re.compile(pattern, re.DOTALL),
+        ))
+    templates.sort(key=lambda template: -template[0])
+    return [(name, regex) for _, name, regex in templates]
+
+
+@lru_cache(maxsize=None)
+def templates():
+    """Шаблоны event_descriptions; компилируются при первой ошибке."""
+    return compile_templates(ed)
+
+
+@lru_cache(maxsize=1024)
+def template_of(message):
+    """Имя шаблона сообщения; без шаблона — сообщение без чисел."""
+    for name, regex in templates():
+        if regex.fullmatch(message):
+            return name
+    return DIGITS.sub('#', message)
+
+
+def fingerprint(error):
+    """Отпечаток ошибки: (класс исключения, шаблон сообщения)."""
+    return type(error).__name__, template_of(str(error))
+
+
+class DigestEntry:
+    """Окно подавления одной ошибки в одном чате."""
+
+    __slots__ = ('name', 'started', 'suppressed')
+
+    def __init__(self, name, started):
+        self.name = name
+        self.started = started
+        self.suppressed = 0
+
+
+class ErrorDigest:
+    """Окна подавления ошибок по чатам."""
+
+    def __init__(self, window=ERROR_WINDOW, clock=time.monotonic):
+        self.window = window
+        self.clock = clock
+        self.entries = {}
+        self.suppressed = 0
+
+    def report(self, error, chat_id=None):
+        """Учёт ошибки; True — о ней нужно сообщить сейчас."""
+        now = self.clock()
+        key = (chat_id, fingerprint(error))
+        entry = self.entries.get(key)
+        if entry is not None and now - entry.started < self.window:
+            entry.suppressed += 1
+            self.suppressed += 1
+            return False
+        if entry is None or not entry.suppressed:
+            self.entries[key] = DigestEntry(key[1][0], now)
+            return True
+        # Окно закончилось, а сводка по нему ещё не отправлена:
+        # ошибка войдёт в неё, новое окно откроет flush().
+        entry.suppressed += 1
+        self.suppressed += 1
+        return False
+
+    def flush(self):
+        """Сводки по закончившимся окнам: список (chat_id, текст)."""
+        now = self.clock()
+        digests = []
+        for key, entry in list(self.entries.items()):
+            if now - entry.started < self.window:
+                continue
+            del self.entries[key]
+            if entry.suppressed:
+                digests.append((key[0], ed.ERROR_DIGEST.format(
+                    entry.name, entry.suppressed, self.window // 60
+                )))
+        return digests
@@ -16,3 +16,67 @@ UNKNOWN_STATUS_ERROR = 'Неизвестный статус проверки: {}
 STATUS_NOT_CHANGED_LOG = 'Статус работы не изменился'
 HTTP_STATUS_ERROR = ('Ошибка доступа к API Я.Практикума'
                      'HTTPStatus = {}')
+ENGINE_START_LOG = 'Запуск движка опроса. Пользователей: {}.'
+TENANTS_FILE_MISSING_LOG = ('Файл пользователей {} не найден, '
+                            'используются переменные окружения.')
+TENANTS_EMPTY_ERROR = 'Не задано ни одного пользователя для опроса!'
+TENANT_LINE_ERROR = 'Некорректная строка {} в файле пользователей: {}'
+HTTP_POOL_STATS_LOG = ('Пул HTTP: запросов {}, новых соединений {}, '
+                       'повторно использовано {}.')
+SCHEDULER_STATS_LOG = ('Расписание: запланировано опросов {}, '
+                       'сэкономлено запросов {:.0f}.')
+RESPONSE_NOT_CHANGED_LOG = 'Ответ API не изменился, обработка пропущена'
+RESPONSE_CACHE_STATS_LOG = ('Кэш ответов: попаданий {}, промахов {}, '
+                            'из них 304 — {}, доля попаданий {:.1%}.')
+TELEGRAM_RETRY_AFTER_LOG = ('Telegram ограничил частоту отправки, '
+                            'повтор через {} с.')
+OUTBOUND_STATS_LOG = ('Очередь отправки: отправлено {}, ошибок {}, '
+                      'повторов {}, осталось в очереди {}.')
+STATE_FLUSH_ERROR = 'Не удалось сохранить состояние: {}'
+BACKGROUND_TASK_ERROR = 'Сбой фоновой задачи {}: {}'
+BACKFILL_TENANT_ERROR = 'Не удалось загрузить историю чата {}: {}'
+BACKFILL_PROGRESS_LOG = ('Загрузка истории: пользователей {} из {}, '
+                         'записей {}, {:.0f} записей/с.')
+BACKFILL_DONE_LOG = ('Загрузка истории завершена: пользователей {}, '
+                     'записей {}, обновлено работ {}, ошибок {}, '
+                     '{:.0f} записей/с.')
+METRICS_SERVER_LOG = 'Метрики доступны по адресу http://{}:{}/metrics'
+FAKE_PRACTICUM_START_LOG = 'Заглушка API Практикума: {}'
+FAKE_PRACTICUM_STATS_LOG = 'Ответы заглушки API Практикума: {}'
+FAKE_TELEGRAM_START_LOG = 'Заглушка Telegram Bot API: {}'
+FAKE_TELEGRAM_STATS_LOG = ('Ответы заглушки Telegram: {}, '
+                           '{:.1f} сообщений/с.')
+API_REQUEST_ERROR = 'Ошибка запроса к API Я.Практикума: {}'
+CIRCUIT_OPEN_ERROR = ('API Я.Практикума недоступно, запросы '
+                      'приостановлены.')
+API_RETRY_LOG = 'Временный сбой API, повтор {} через {:.2f} с.'
+BREAKER_STATS_LOG = ('Предохранитель API: размыканий {}, отклонено '
+                     'запросов {}, повторов {}.')
+ERROR_DIGEST = ('Ошибка {} повторилась ещё {} раз за последние '
+                '{} мин.')
+COMMAND_STATUS_HEADER = 'Статусы ваших работ:'
+COMMAND_STATUS_LINE = '«{}»: {}'
+COMMAND_STATUS_EMPTY = 'Пока нет данных о ваших работах.'
+COMMAND_HISTORY_HEADER = 'Последние изменения статусов:'
+COMMAND_HISTORY_LINE = '{} «{}»: {}'
+COMMAND_HISTORY_EMPTY = 'Изменений статусов пока не было.'
+COMMAND_HELP = ('Команды: /status — текущие статусы работ, '
+                '/history — последние изменения статусов.')
+COMMAND_POLL_ERROR = 'Ошибка получения команд Telegram: {}'
+COALESCE_STATS_LOG = ('Объединение запросов к API: отправлено {}, '
+                      'объединено {}, из кэша {}.')
+LEASE_RENEW_LOG = ('Аренды: живых воркеров {}, своих пользователей {}, '
+                   'передано другим {}.')
+LEASE_ERROR = 'Ошибка продления аренд: {}'
+LEASE_STATS_LOG = 'Аренды: получено {}, отпущено {}.'
+WORKER_START_LOG = 'Запущен воркер {} (pid {}).'
+WORKER_EXIT_LOG = 'Воркер {} завершился с кодом {}, перезапуск.'
+SHUTDOWN_SIGNAL_LOG = 'Получен сигнал {}, остановка.'
+BOT_API_REQUEST_ERROR = 'Ошибка запроса к Telegram Bot API: {}'
+BOT_API_ERROR = 'Telegram Bot API вернул ошибку {}: {}'
+STATUS_CHANGED = 'Изменился статус проверки работы "{}". {}'
+HOMEWORK_TYPE_ERROR = 'Работа в ответе API не является словарем'
+JOURNAL_REPLAY_LOG = ('Журнал: прочитано записей {}, работ {}, '
+                      'повторно отправлено уведомлений {}.')
+JOURNAL_FLUSH_ERROR = 'Не удалось дописать журнал: {}'
+JOURNAL_STATS_LOG = 'Журнал: записано {}, сжатий {}, размер {} байт.'
@@ -35,3 +35,28 @@ class ResponseFormatError(TypeError):
     """Исключение: Формат ответа не соответствует ожидаемому."""
 
     pass
+
+
+class APIRequestError(Exception):
+    """Исключение: запрос к API не выполнен из-за сетевой ошибки."""
+
+    pass
+
+
+class CircuitOpenError(Exception):
+    """Исключение: предохранитель разомкнут, запрос к API не отправлен."""
+
+    pass
+
+
+class BotAPIError(Exception):
+    """Исключение: Telegram Bot API не принял запрос.
+    retry_after — сколько секунд ждать перед повтором,
+    если Telegram ответил 429; error_code — код ошибки из ответа,
+    None, если ответа не было.
+    """
+
+    def __init__(self, message, retry_after=None, error_code=None):
+        super().__init__(message)
+        self.retry_after = retry_after
+        self.error_code = error_code
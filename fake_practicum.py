@@ -0,0 +1,283 @@
+"""Локальная замена API Практикума для нагрузочных проверок.
+
+Запуск: python fake_practicum.py [--port 8080] [--latency 0.05] ...
+Бот и движок направляются на сервер переменной окружения
+PRACTICUM_ENDPOINT=http://127.0.0.1:8080/api/user_api/homework_statuses/
+
+Сервер отвечает на homework_statuses/ как настоящий API: принимает
+любой токен в заголовке Authorization: OAuth <токен>, для каждого
+токена детерминированно генерирует историю работ и отдаёт работы,
+изменившиеся начиная с from_date. Часть смен статусов лежит в будущем
+относительно запуска сервера, поэтому при опросе статусы меняются.
+
+Задержка ответа и доли сбоев настраиваются: ответы с кодом не 200,
+испорченный JSON, ответ без ключа homeworks и неизвестный статус
+работы. Так можно проверить каждую ветку check_response(),
+parse_status() и исключений из exceptions.py.
+"""
+import argparse
+import bisect
+import json
+import logging
+import random
+import threading
+import time
+from datetime import datetime, timezone
+from http import HTTPStatus
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlsplit
+
+import event_descriptions as ed  # Импорт описания событий
+
+FAKE_API_PATH = '/api/user_api/homework_statuses/'
+# Смена статусов работы: от сдачи до принятия.
+STATUS_FLOW = ('reviewing', 'rejected', 'reviewing', 'approved')
+UNKNOWN_STATUS = 'unknown'
+
+logger = logging.getLogger(__name__)
+
+
+class Faults:
+    """Задержка ответа и доли сбоев.
+
+    Задержка — latency секунд с разбросом по распределению
+    distribution: fixed (без разброса), uniform (от 0 до 2 * latency)
+    или exponential (со средним latency).
+    """
+
+    def __init__(self, latency=0.0, distribution='fixed', error_rate=0.0,
+                 error_codes=(500, 502, 503), malformed_rate=0.0,
+                 missing_key_rate=0.0, unknown_status_rate=0.0, seed=None):
+        self.latency = latency
+        self.distribution = distribution
+        self.error_rate = error_rate
+        self.error_codes = tuple(error_codes)
+        self.malformed_rate = malformed_rate
+        self.missing_key_rate = missing_key_rate
+        self.unknown_status_rate = unknown_status_rate
+        self.random = random.Random(seed)
+
+    def delay(self):
+        """Задержка очередного ответа в секундах."""
+        if not self.latency:
+            return 0.0
+        if self.distribution == 'uniform':
+            return self.random.uniform(0, 2 * self.latency)
+        if self.distribution == 'exponential':
+            return self.random.expovariate(1 / self.latency)
+        return self.latency
+
+    def pick(self):
+        """Сбой для очередного ответа или None."""
+        roll = self.random.random()
+        for fault, rate in (
+            ('error', self.error_rate),
+            ('malformed', self.malformed_rate),
+            ('missing_key', self.missing_key_rate),
+            ('unknown_status', self.unknown_status_rate),
+        ):
+            if roll < rate:
+                return fault
+            roll -= rate
+        return None
+
+
+class HomeworkHistory:
+    """История работ одного токена.
+
+    Для каждой работы хранятся моменты смены статуса; состояние
+    работы на момент now — последняя смена не позже now.
+    """
+
+    def __init__(self, token, started, homeworks=3, change_interval=600):
+        rng = random.Random(token)
+        self.homeworks = []
+        for index in range(homeworks):
+            moment = started - rng.uniform(0, homeworks * change_interval)
+            times = []
+            for _ in STATUS_FLOW:
+                times.append(int(moment))
+                moment += rng.uniform(0.5, 1.5) * change_interval
+            self.homeworks.append((
+                {
+                    'id': rng.randrange(1, 10 ** 6) * 100 + index,
+                    'homework_name': f'{token[:8]}__hw{index:02}.zip',
+                    'lesson_name': f'Спринт {index + 1}',
+                    'reviewer_comment': 'Комментарий ревьюера.',
+                },
+                times,
+            ))
+
+    def changed_since(self, from_date, now):
+        """Работы в состоянии на момент now, изменившиеся после from_date."""
+        result = []
+        for fields, times in self.homeworks:
+            step = bisect.bisect_right(times, now) - 1
+            if step < 0 or times[step] < from_date:
+                continue
+            updated = datetime.fromtimestamp(times[step], timezone.utc)
+            result.append(dict(
+                fields,
+                status=STATUS_FLOW[step],
+                date_updated=updated.strftime('%Y-%m-%dT%H:%M:%SZ'),
+            ))
+        return result
+
+
+class FakePracticumHandler(BaseHTTPRequestHandler):
+    """Ответы на запросы к homework_statuses/."""
+
+    protocol_version = 'HTTP/1.1'
+    disable_nagle_algorithm = True
+
+    def do_GET(self):
+        """Ответ с работами, изменившимися начиная с from_date."""
+        server = self.server
+        url = urlsplit(self.path)
+        if url.path != FAKE_API_PATH:
+            self.reply(HTTPStatus.NOT_FOUND, {'detail': 'Not found.'})
+            return
+        auth = self.headers.get('Authorization', '')
+        if not auth.startswith('OAuth ') or not auth[6:].strip():
+            self.reply(HTTPStatus.UNAUTHORIZED, {
+                'code': 'not_authenticated',
+                'message': 'Учетные данные не были предоставлены.',
+            })
+            return
+        try:
+            from_date = int(parse_qs(url.query).get('from_date', ['0'])[0])
+        except ValueError:
+            self.reply(HTTPStatus.BAD_REQUEST, {
+                'code': 'UnknownError',
+                'error': {'error': 'Wrong from_date format'},
+            })
+            return
+        delay = server.faults.delay()
+        if delay:
+            time.sleep(delay)
+        fault = server.faults.pick()
+        server.count(fault or 'ok')
+        now = int(time.time())
+        if fault == 'error':
+            code = server.faults.random.choice(server.faults.error_codes)
+            self.reply(code, {'code': 'service_unavailable'})
+        elif fault == 'malformed':
+            self.reply(HTTPStatus.OK, b'{"homeworks": [{"id": ')
+        elif fault == 'missing_key':
+            self.reply(HTTPStatus.OK, {'current_date': now})
+        else:
+            homeworks = server.history(auth[6:].strip()).changed_since(
+                from_date, now
+            )
+            if fault == 'unknown_status':
+                homeworks = [
+                    dict(homework, status=UNKNOWN_STATUS)
+                    for homework in homeworks
+                ] or [{'homework_name': 'hw.zip', 'status': UNKNOWN_STATUS}]
+            self.reply(HTTPStatus.OK, {
+                'homeworks': homeworks, 'current_date': now
+            })
+
+    def reply(self, code, body):
+        """Отправка ответа; body — словарь или готовые байты."""
+        if not isinstance(body, bytes):
+            body = json.dumps(body, ensure_ascii=False).encode()
+        self.send_response(code)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        """Запросы не логируются: их тысячи в секунду."""
+
+
+class FakePracticumServer(ThreadingHTTPServer):
+    """HTTP-сервер с историями работ для множества токенов."""
+
+    daemon_threads = True
+    request_queue_size = 1024
+
+    def __init__(self, address=('127.0.0.1', 0), faults=None,
+                 homeworks=3, change_interval=600):
+        super().__init__(address, FakePracticumHandler)
+        self.faults = faults or Faults()
+        self.homeworks = homeworks
+        self.change_interval = change_interval
+        self.started = time.time()
+        self.histories = {}
+        self.stats = {}
+        self._lock = threading.Lock()
+
+    @property
+    def endpoint(self):
+        """Адрес для PRACTICUM_ENDPOINT."""
+        host, port = self.server_address[:2]
+        return f'http://{host}:{port}{FAKE_API_PATH}'
+
+    def history(self, token):
+        """История работ токена, созданная при первом запросе."""
+        history = self.histories.get(token)
+        if history is None:
+            history = self.histories.setdefault(token, HomeworkHistory(
+                token, self.started, self.homeworks, self.change_interval
+            ))
+        return history
+
+    def count(self, outcome):
+        """Учёт исхода запроса."""
+        with self._lock:
+            self.stats[outcome] = self.stats.get(outcome, 0) + 1
+
+    def start(self):
+        """Запуск в фоновом потоке; возвращает адрес API."""
+        threading.Thread(
+            target=self.serve_forever, name='fake-practicum', daemon=True
+        ).start()
+        return self.endpoint
+
+
+def main():
+    """Запуск сервера из командной строки."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8080)
+    parser.add_argument('--homeworks', type=int, default=3,
+                        help='работ на токен')
+    parser.add_argument('--change-interval', type=float, default=600,
+                        help='средний интервал смены статуса, с')
+    parser.add_argument('--latency', type=float, default=0.0,
+                        help='задержка ответа, с')
+    parser.add_argument('--distribution', default='fixed',
+                        choices=('fixed', 'uniform', 'exponential'))
+    parser.add_argument('--error-rate', type=float, default=0.0)
+    parser.add_argument('--error-codes', default='500,502,503')
+    parser.add_argument('--malformed-rate', type=float, default=0.0)
+    parser.add_argument('--missing-key-rate', type=float, default=0.0)
+    parser.add_argument('--unknown-status-rate', type=float, default=0.0)
+    args = parser.parse_args()
+    faults = Faults(
+        latency=args.latency,
+        distribution=args.distribution,
+        error_rate=args.error_rate,
+        error_codes=[int(code) for code in args.error_codes.split(',')],
+        malformed_rate=args.malformed_rate,
+        missing_key_rate=args.missing_key_rate,
+        unknown_status_rate=args.unknown_status_rate,
+    )
+    server = FakePracticumServer(
+        (args.host, args.port), faults, args.homeworks, args.change_interval
+    )
+    logger.info(ed.FAKE_PRACTICUM_START_LOG.format(server.endpoint))
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        logger.info(ed.FAKE_PRACTICUM_STATS_LOG.format(server.stats))
+
+
+if __name__ == '__main__':
+    logging.basicConfig(level=logging.INFO, format='%(message)s')
+    main()
@@ -0,0 +1,278 @@
+"""Локальная замена Telegram Bot API для замеров отправки.
+
+Запуск: python fake_telegram.py [--port 8081] [--latency 0.05] ...
+Движок направляется на сервер переменной окружения
+TELEGRAM_BASE_URL=http://127.0.0.1:8081/bot
+
+Сервер принимает sendMessage так же, как Bot API: ответ в формате
+{"ok": true, "result": ...}, а при превышении ограничений — 429
+с parameters.retry_after, на который telegram.Bot отвечает RetryAfter.
+Ограничения: GLOBAL_RATE сообщений в секунду на бота и CHAT_RATE
+в секунду в один чат. Задержку ответа и долю ошибок можно задать,
+а моменты доставки каждого сообщения записываются, чтобы считать
+реальную пропускную способность отправки.
+"""
+import argparse
+import json
+import logging
+import math
+import random
+import threading
+import time
+from http import HTTPStatus
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qsl
+
+import event_descriptions as ed  # Импорт описания событий
+from outbound import CHAT_RATE, GLOBAL_RATE
+
+logger = logging.getLogger(__name__)
+
+
+class RateLimit:
+    """Ведро токенов, которое отказывает вместо ожидания."""
+
+    __slots__ = ('rate', 'capacity', 'tokens', 'updated')
+
+    def __init__(self, rate, capacity, now):
+        self.rate = rate
+        self.capacity = capacity
+        self.tokens = capacity
+        self.updated = now
+
+    def wait(self, now):
+        """Сколько секунд ждать до появления токена; 0 — токен есть."""
+        self.tokens = min(
+            self.capacity, self.tokens + (now - self.updated) * self.rate
+        )
+        self.updated = now
+        if self.tokens >= 1:
+            return 0.0
+        return (1 - self.tokens) / self.rate
+
+    def take(self):
+        """Списание токена после проверки wait()."""
+        self.tokens -= 1
+
+
+class Delivery:
+    """Принятое сообщение и момент его приёма."""
+
+    __slots__ = ('chat_id', 'text', 'received')
+
+    def __init__(self, chat_id, text, received):
+        self.chat_id = chat_id
+        self.text = text
+        self.received = received
+
+
+class FakeTelegramHandler(BaseHTTPRequestHandler):
+    """Ответы на запросы /bot<токен>/<метод>."""
+
+    protocol_version = 'HTTP/1.1'
+    disable_nagle_algorithm = True
+
+    def do_POST(self):
+        """Вызов метода Bot API."""
+        length = int(self.headers.get('Content-Length', 0))
+        body = self.rfile.read(length)
+        if self.headers.get('Content-Type', '').startswith(
+            'application/json'
+        ):
+            params = json.loads(body or b'{}')
+        else:
+            params = dict(parse_qsl(body.decode()))
+        self.dispatch(params)
+
+    def do_GET(self):
+        """Вызов метода Bot API без тела."""
+        self.dispatch({})
+
+    def dispatch(self, params):
+        """Выбор метода по пути запроса."""
+        parts = self.path.split('?')[0].strip('/').split('/')
+        if len(parts) != 2 or not parts[0].startswith('bot'):
+            self.error(HTTPStatus.NOT_FOUND, 'Not Found')
+            return
+        method = parts[1]
+        if method == 'getMe':
+            self.reply({'ok': True, 'result': {
+                'id': 1, 'is_bot': True, 'first_name': 'fake',
+                'username': 'fake_bot',
+            }})
+        elif method == 'sendMessage':
+            self.send_message(params)
+        else:
+            self.error(HTTPStatus.NOT_FOUND, 'Not Found')
+
+    def send_message(self, params):
+        """Метод sendMessage с ограничениями скорости и сбоями."""
+        server = self.server
+        delay = server.delay()
+        if delay:
+            time.sleep(delay)
+        chat_id, text = params.get('chat_id'), params.get('text')
+        if chat_id is None or not text:
+            server.count('bad_request')
+            self.error(
+                HTTPStatus.BAD_REQUEST, 'Bad Request: message text is empty'
+            )
+            return
+        if server.random.random() < server.error_rate:
+            server.count('error')
+            self.error(
+                server.random.choice(server.error_codes),
+                'Internal Server Error'
+            )
+            return
+        try:
+            # telegram.Bot передаёт числа строками.
+            chat_id = int(chat_id)
+        except ValueError:
+            pass
+        retry_after, message_id = server.accept(chat_id, text)
+        if retry_after:
+            server.count('retry_after')
+            self.error(
+                HTTPStatus.TOO_MANY_REQUESTS,
+                f'Too Many Requests: retry after {retry_after}',
+                {'retry_after': retry_after}
+            )
+            return
+        server.count('ok')
+        self.reply({'ok': True, 'result': {
+            'message_id': message_id,
+            'date': int(time.time()),
+            'chat': {'id': chat_id, 'type': 'private'},
+            'text': text,
+        }})
+
+    def error(self, code, description, parameters=None):
+        """Ответ об ошибке в формате Bot API."""
+        body = {'ok': False, 'error_code': int(code),
+                'description': description}
+        if parameters:
+            body['parameters'] = parameters
+        self.reply(body, code)
+
+    def reply(self, body, code=HTTPStatus.OK):
+        """Отправка JSON-ответа."""
+        data = json.dumps(body, ensure_ascii=False).encode()
+        self.send_response(code)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def log_message(self, format, *args):
+        """Запросы не логируются."""
+
+
+class FakeTelegramServer(ThreadingHTTPServer):
+    """HTTP-сервер Bot API с ограничениями Telegram."""
+
+    daemon_threads = True
+    request_queue_size = 1024
+
+    def __init__(self, address=('127.0.0.1', 0), global_rate=GLOBAL_RATE,
+                 chat_rate=CHAT_RATE, latency=0.0, error_rate=0.0,
+                 error_codes=(500, 502), seed=None):
+        super().__init__(address, FakeTelegramHandler)
+        self.global_rate = global_rate
+        self.chat_rate = chat_rate
+        self.latency = latency
+        self.error_rate = error_rate
+        self.error_codes = tuple(error_codes)
+        self.random = random.Random(seed)
+        self.global_limit = RateLimit(
+            global_rate, global_rate, time.monotonic()
+        )
+        self.chat_limits = {}
+        self.deliveries = []
+        self.stats = {}
+        self._lock = threading.Lock()
+
+    @property
+    def base_url(self):
+        """Адрес для telegram.Bot(base_url=...) и TELEGRAM_BASE_URL."""
+        host, port = self.server_address[:2]
+        return f'http://{host}:{port}/bot'
+
+    def delay(self):
+        """Задержка ответа: экспоненциальная со средним latency."""
+        if not self.latency:
+            return 0.0
+        return self.random.expovariate(1 / self.latency)
+
+    def accept(self, chat_id, text):
+        """Приём сообщения: (retry_after, message_id).
+
+        retry_after — целое число секунд, как в Telegram; если оно
+        не 0, сообщение отклонено и токены не списаны.
+        """
+        now = time.monotonic()
+        with self._lock:
+            chat = self.chat_limits.get(chat_id)
+            if chat is None:
+                chat = self.chat_limits[chat_id] = RateLimit(
+                    self.chat_rate, 1, now
+                )
+            wait = max(self.global_limit.wait(now), chat.wait(now))
+            if wait:
+                return max(1, math.ceil(wait)), None
+            self.global_limit.take()
+            chat.take()
+            self.deliveries.append(Delivery(chat_id, text, now))
+            return 0, len(self.deliveries)
+
+    def count(self, outcome):
+        """Учёт исхода запроса."""
+        with self._lock:
+            self.stats[outcome] = self.stats.get(outcome, 0) + 1
+
+    def throughput(self):
+        """Принятых сообщений в секунду от первого до последнего."""
+        with self._lock:
+            if len(self.deliveries) < 2:
+                return 0.0
+            span = self.deliveries[-1].received - self.deliveries[0].received
+            return (len(self.deliveries) - 1) / span if span else 0.0
+
+    def start(self):
+        """Запуск в фоновом потоке; возвращает base_url."""
+        threading.Thread(
+            target=self.serve_forever, name='fake-telegram', daemon=True
+        ).start()
+        return self.base_url
+
+
+def main():
+    """Запуск сервера из командной строки."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8081)
+    parser.add_argument('--global-rate', type=float, default=GLOBAL_RATE)
+    parser.add_argument('--chat-rate', type=float, default=CHAT_RATE)
+    parser.add_argument('--latency', type=float, default=0.0,
+                        help='средняя задержка ответа, с')
+    parser.add_argument('--error-rate', type=float, default=0.0)
+    args = parser.parse_args()
+    server = FakeTelegramServer(
+        (args.host, args.port), args.global_rate, args.chat_rate,
+        args.latency, args.error_rate
+    )
+    logger.info(ed.FAKE_TELEGRAM_START_LOG.format(server.base_url))
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        logger.info(ed.FAKE_TELEGRAM_STATS_LOG.format(
+            server.stats, server.throughput()
+        ))
+
+
+if __name__ == '__main__':
+    logging.basicConfig(level=logging.INFO, format='%(message)s')
+    main()
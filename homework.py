@@ -5,12 +5,22 @@ import time
 from json import JSONDecodeError
 from http import HTTPStatus
 
-import requests
-import telegram
 from dotenv import load_dotenv
 
 import exceptions as ex  # Импорт польз. исключений.
 import event_descriptions as ed  # Импорт описания событий
+import log_queue
+from bot_api import TELEGRAM_SENDER, BotApiSender
+from differ import apply_event, diff_homeworks, register_statuses
+from error_digest import ErrorDigest
+from lazy import lazy_import
+from messages import STATUS_FRAGMENTS, status_message
+from validator import Validator, homework_schema, response_schema
+
+# Загружаются при первом запросе к API и первой отправке сообщения.
+requests = lazy_import('requests')
+telegram = lazy_import('telegram')
+http_pool = lazy_import('http_pool')
 
 load_dotenv()
 
@@ -21,7 +31,12 @@ TELEGRAM_CHAT_ID = os.getenv('TELEGRAM_CHAT_ID')
 
 
 RETRY_PERIOD = 600
-ENDPOINT = 'https://practicum.yandex.ru/api/user_api/homework_statuses/'
+# Таймаут соединения и чтения запроса к API Практикума, секунды.
+API_TIMEOUT = float(os.getenv('API_TIMEOUT', 30))
+ENDPOINT = os.getenv(
+    'PRACTICUM_ENDPOINT',
+    'https://practicum.yandex.ru/api/user_api/homework_statuses/'
+)
 HEADERS = {'Authorization': f'OAuth {PRACTICUM_TOKEN}'}
 
 
@@ -30,13 +45,17 @@ HOMEWORK_VERDICTS = {
     'reviewing': 'Работа взята на проверку ревьюером.',
     'rejected': 'Работа проверена: у ревьюера есть замечания.'
 }
+register_statuses(HOMEWORK_VERDICTS)
+# Проверки ответа и работы компилируются один раз при запуске.
+RESPONSE_VALIDATOR = Validator(response_schema(HOMEWORK_VERDICTS))
+HOMEWORK_VALIDATOR = Validator(homework_schema(HOMEWORK_VERDICTS))
 
 
-logging.basicConfig(
-    format='%(asctime)s - %(levelname)s - %(message)s',
-    filename='main.log',
-    encoding='UTF-8',
-    level=logging.DEBUG
+# Запись в main.log идёт в фоновом потоке с ротацией файла.
+log_queue.setup_logging(
+    filename=log_queue.LOG_FILE,
+    level=logging.DEBUG,
+    fmt='%(asctime)s - %(levelname)s - %(message)s'
 )
 logger = logging.getLogger(__name__)
 handler = logging.StreamHandler(sys.stdout)
@@ -66,28 +85,63 @@ def check_tokens():
 
 def send_message(bot, message):
     """Отправка сообщения в Telegram."""
+    send_to_chat(bot, TELEGRAM_CHAT_ID, message)
+
+
+def send_to_chat(bot, chat_id, message):
+    """Отправка сообщения в указанный чат Telegram."""
     try:
         logger.debug(ed.SEND_MESSAGE_LOG)
-        bot.send_message(TELEGRAM_CHAT_ID, message)
+        bot.send_message(chat_id, message)
         logger.debug(ed.SEND_MESSAGE_SECCESSFUL.format(message))
+    except ex.BotAPIError as error:
+        logging.error(error)
     except telegram.error.TelegramError as error:
         logging.error(error)
 
 
 def get_api_answer(timestamp):
     """Запрос к API Практикума."""
+    return request_api(HEADERS, timestamp)
+
+
+def request_api(headers, params):
+    """Запрос к API Практикума с заголовками конкретного пользователя."""
+    return decode_response(fetch_api(headers, params))
+
+
+def fetch_api(headers, params, stream=False):
+    """Запрос к API Практикума без разбора ответа.
+
+    При stream=True тело ответа не загружается заранее
+    и читается по мере разбора. Сетевая ошибка и таймаут
+    (API_TIMEOUT) превращаются в APIRequestError.
+    """
     try:
-        homework_statuses = requests.get(
+        return http_pool.client().get(
             ENDPOINT,
-            headers=HEADERS,
-            params=timestamp
+            headers=headers,
+            params=params,
+            stream=stream,
+            timeout=API_TIMEOUT
         )
     except requests.RequestException as error:
-        logger.error(ed.UNIVERSAL_ERROR.format(error))
+        raise ex.APIRequestError(
+            ed.API_REQUEST_ERROR.format(error)
+        ) from error
+
+
+def check_status_code(homework_statuses):
+    """Проверка кода ответа API."""
     if homework_statuses.status_code != HTTPStatus.OK:
         raise ex.HTTPStatusError(
             ed.HTTP_STATUS_ERROR.format(homework_statuses.status_code)
         )
+
+
+def decode_response(homework_statuses):
+    """Проверка кода ответа API и преобразование ответа в словарь."""
+    check_status_code(homework_statuses)
     try:
         hw_dict = homework_statuses.json()
         return hw_dict
@@ -96,37 +150,49 @@ def get_api_answer(timestamp):
 
 
 def check_response(response):
-    """Проверка ответа от API Практикума."""
-    if isinstance(response, dict):
-        logger.debug(ed.CHECK_DICT_DEBUG)
-    else:
-        raise ex.ResponseFormatError(ed.CHECK_DICT_ERROR)
-    if 'homeworks' not in response:
-        logger.error(ed.HOMEWORKS_MISSING_ERROR)
-        raise ex.MissingKeyError(ed.HOMEWORKS_MISSING_ERROR)
-    homeworks = response.get('homeworks')
-    if isinstance(homeworks, list):
-        logger.debug(ed.CHECK_LIST_DEBUG)
-    else:
-        raise ex.ResponseFormatError(ed.CHECK_LIST_ERROR)
-    return homeworks
+    """Проверка ответа от API Практикума вместе со всеми работами."""
+    RESPONSE_VALIDATOR.check(response)
+    return response['homeworks']
 
 
 def parse_status(homework):
     """Выгрузка статуса проверки задания."""
+    return render_status(homework)
+
+
+def render_status(homework, language=None):
+    """Сообщение о статусе проверки задания на языке чата.
+
+    Готовые фрагменты есть только для статусов, уже прошедших
+    проверку, поэтому работа проверяется схемой, лишь когда их нет
+    (первая работа с таким статусом и языком или ошибка в работе).
+    """
     # По идее эта функция срабатывает после check_response,
     # где данная проверка уже есть, но у pytest видимо своя логика.
     if isinstance(homework, list):
         homework, *_ = homework
-    if 'homework_name' not in homework:
-        raise ex.MissingKeyError(ed.MISSING_KEY_ERROR)
-    homework_name = homework.get('homework_name')
-    homework_status = homework.get('status')
-    if homework_status not in HOMEWORK_VERDICTS:
-        raise ex.UnknownStatusError(ed.UNKNOWN_STATUS_ERROR
-                                    .format(homework_status))
-    verdict = HOMEWORK_VERDICTS[homework_status]
-    return f'Изменился статус проверки работы "{homework_name}". {verdict}'
+    try:
+        if homework.__class__ is dict:
+            start, end = STATUS_FRAGMENTS[homework['status'], language]
+            return f'{start}{homework["homework_name"]}{end}'
+    except (KeyError, TypeError):
+        pass
+    HOMEWORK_VALIDATOR.check(homework)
+    return status_message(
+        homework['homework_name'], homework['status'], language
+    )
+
+
+def report_error(bot, digest, error, message):
+    """Сообщение об ошибке, если такая же не отправлялась в окне."""
+    if digest.report(error):
+        send_message(bot, message)
+
+
+def send_digests(bot, digest):
+    """Отправка сводок по повторявшимся ошибкам."""
+    for _, message in digest.flush():
+        send_message(bot, message)
 
 
 def main():
@@ -137,38 +203,42 @@ def main():
         logger.critical(error)
         sys.exit(1)
 
-    bot = telegram.Bot(token=TELEGRAM_TOKEN)
+    if TELEGRAM_SENDER == 'light':
+        bot = BotApiSender(token=TELEGRAM_TOKEN)
+    else:
+        bot = telegram.Bot(token=TELEGRAM_TOKEN)
     timestamp = int(time.time())
-    last_status = ''
-    last_error = ''
+    snapshot = {}  # id работы -> (статус, date_updated)
+    digest = ErrorDigest()
     payload = {'from_date': timestamp}
 
     while True:
         try:
+            send_digests(bot, digest)
             response = get_api_answer(payload)
-            homework = check_response(response)
-            if homework:
-                status_hw = parse_status(homework)
-                if status_hw != last_status:
-                    send_message(bot, status_hw)
-                    payload['from_date'] = int(response['current_date'])
-                    last_status = status_hw
-            else:
+            homeworks = check_response(response)
+            events = diff_homeworks(snapshot, homeworks)
+            for event in events:
+                send_message(bot, parse_status(event.homework))
+                apply_event(snapshot, event)
+            if not events:
                 logger.debug(ed.STATUS_NOT_CHANGED_LOG)
+            payload['from_date'] = int(
+                response.get('current_date', payload['from_date'])
+            )
         except (
             ex.ResponseFormatError,
             ex.MissingKeyError,
             ex.UnknownStatusError,
-            ex.HTTPStatusError
+            ex.HTTPStatusError,
+            ex.APIRequestError
         ) as error:
             logging.error(error)
-            if error != last_error:
-                last_error = error
-                send_message(bot, error)
+            report_error(bot, digest, error, str(error))
         except Exception as error:
             message = ed.UNIVERSAL_ERROR.format(error)
             logging.error(message)
-            send_message(bot, message)
+            report_error(bot, digest, error, message)
         finally:
             time.sleep(RETRY_PERIOD)
 
@@ -0,0 +1,123 @@
+"""Общий пул HTTP-соединений с keep-alive для запросов к API.
+
+Пока пул не установлен через install(), запросы идут через модуль
+requests, как раньше: каждый вызов открывает новое соединение.
+После установки все опросы и все пользователи используют одну сессию
+с ограниченным числом соединений на хост.
+"""
+import os
+import threading
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.connectionpool import HTTPConnectionPool, HTTPSConnectionPool
+
+# Сколько хостов держать в пуле одновременно.
+POOL_CONNECTIONS = int(os.getenv('HTTP_POOL_CONNECTIONS', 4))
+# Сколько соединений держать открытыми к одному хосту.
+POOL_MAXSIZE = int(os.getenv('HTTP_POOL_MAXSIZE', 64))
+
+
+class PoolStats:
+    """Счётчики новых соединений и запросов через пул."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.new_connections = 0
+        self.requests = 0
+
+    def connection_opened(self):
+        """Учёт нового соединения."""
+        with self._lock:
+            self.new_connections += 1
+
+    def request_sent(self):
+        """Учёт отправленного запроса."""
+        with self._lock:
+            self.requests += 1
+
+    @property
+    def reused(self):
+        """Запросы, ушедшие по уже открытому соединению."""
+        return max(self.requests - self.new_connections, 0)
+
+    def reset(self):
+        """Обнуление счётчиков."""
+        with self._lock:
+            self.new_connections = 0
+            self.requests = 0
+
+
+STATS = PoolStats()
+
+
+class CountingHTTPConnectionPool(HTTPConnectionPool):
+    """Пул соединений urllib3, который ведёт STATS."""
+
+    def _new_conn(self):
+        STATS.connection_opened()
+        return super()._new_conn()
+
+    def _make_request(self, *args, **kwargs):
+        STATS.request_sent()
+        return super()._make_request(*args, **kwargs)
+
+
+class CountingHTTPSConnectionPool(HTTPSConnectionPool):
+    """Пул TLS-соединений urllib3, который ведёт STATS."""
+
+    def _new_conn(self):
+        STATS.connection_opened()
+        return super()._new_conn()
+
+    def _make_request(self, *args, **kwargs):
+        STATS.request_sent()
+        return super()._make_request(*args, **kwargs)
+
+
+class PooledAdapter(HTTPAdapter):
+    """Адаптер requests со счётчиками соединений."""
+
+    def init_poolmanager(self, *args, **kwargs):
+        """Подключение пулов со счётчиками."""
+        super().init_poolmanager(*args, **kwargs)
+        self.poolmanager.pool_classes_by_scheme = {
+            'http': CountingHTTPConnectionPool,
+            'https': CountingHTTPSConnectionPool,
+        }
+
+
+_session = None
+
+
+def install(pool_connections=POOL_CONNECTIONS, pool_maxsize=POOL_MAXSIZE):
+    """Создание общей сессии с пулом соединений.
+
+    pool_block=True не даёт открыть к хосту больше pool_maxsize
+    соединений: лишние запросы ждут освободившееся соединение.
+    """
+    global _session
+    close()
+    adapter = PooledAdapter(
+        pool_connections=pool_connections,
+        pool_maxsize=pool_maxsize,
+        pool_block=True
+    )
+    session = requests.Session()
+    session.mount('https://', adapter)
+    session.mount('http://', adapter)
+    _session = session
+    return session
+
+
+def client():
+    """Сессия пула, если он установлен, иначе модуль requests."""
+    return _session or requests
+
+
+def close():
+    """Закрытие всех соединений пула."""
+    global _session
+    if _session is not None:
+        _session.close()
+        _session = None
@@ -0,0 +1,324 @@
+"""Журнал изменений статусов: двоичный файл только для дозаписи.
+
+Каждое изменение статуса работы записывается дважды: когда движок
+его заметил (OBSERVED) и когда Telegram принял уведомление (SENT).
+Запись — длина тела и его CRC32 (по 4 байта), затем тело: вид записи,
+время наблюдения и отправки, ключ пользователя, работа, её название,
+старый и новый статус. Записи копятся в памяти и дописываются в файл
+одной операцией в flush().
+
+При запуске replay() читает журнал и восстанавливает последнее
+изменение каждой работы; оборванная при сбое запись в конце файла
+отрезается. Изменения, о которых уведомление так и не ушло, движок
+отправляет повторно. Когда файл вырастает больше JOURNAL_MAX_BYTES
+и хотя бы вдвое больше, чем после прошлого сжатия, он переписывается:
+остаётся последнее изменение каждой работы, а прежний файл сохраняется
+рядом с номером (JOURNAL_BACKUP_COUNT штук) для разбора и аналитики.
+
+Просмотр журнала: python journal.py [--path journal.bin] [--tail 20]
+"""
+import argparse
+import os
+import struct
+import threading
+import time
+import zlib
+from collections import namedtuple
+
+JOURNAL_FILE = os.getenv('JOURNAL_FILE', 'journal.bin')
+JOURNAL_MAX_BYTES = int(os.getenv('JOURNAL_MAX_BYTES', 64 * 2 ** 20))
+JOURNAL_BACKUP_COUNT = int(os.getenv('JOURNAL_BACKUP_COUNT', 1))
+JOURNAL_FSYNC = os.getenv('JOURNAL_FSYNC', '1') == '1'
+# Чтение файла при replay() кусками такого размера.
+READ_CHUNK = 2 ** 20
+
+OBSERVED = 1
+SENT = 2
+
+# Длина тела и CRC32 тела.
+HEADER = struct.Struct('<II')
+# Вид записи, время наблюдения, время отправки (0 — не отправлено).
+FIXED = struct.Struct('<Bdd')
+# Метки типа значений в теле записи.
+TAG_NONE = 0
+TAG_INT = 1
+TAG_STR = 2
+INT = struct.Struct('<q')
+LENGTH = struct.Struct('<I')
+
+Transition = namedtuple('Transition', (
+    'kind', 'tenant', 'homework', 'name', 'old_status', 'status',
+    'observed', 'sent',
+))
+
+
+def encode_value(value, parts):
+    """Значение поля с меткой типа: None, целое или строка."""
+    if value is None:
+        parts.append(bytes((TAG_NONE,)))
+    elif value.__class__ is int and -2 ** 63 <= value < 2 ** 63:
+        parts.append(bytes((TAG_INT,)))
+        parts.append(INT.pack(value))
+    else:
+        data = str(value).encode()
+        parts.append(bytes((TAG_STR,)))
+        parts.append(LENGTH.pack(len(data)))
+        parts.append(data)
+
+
+def decode_value(body, offset):
+    """Значение поля и смещение следующего."""
+    tag = body[offset]
+    offset += 1
+    if tag == TAG_NONE:
+        return None, offset
+    if tag == TAG_INT:
+        return INT.unpack_from(body, offset)[0], offset + INT.size
+    (length,) = LENGTH.unpack_from(body, offset)
+    offset += LENGTH.size
+    return str(body[offset:offset + length], 'utf-8'), offset + length
+
+
+def encode(transition):
+    """Запись журнала: заголовок и тело."""
+    parts = [FIXED.pack(
+        transition.kind, transition.observed, transition.sent
+    )]
+    for value in transition[1:6]:
+        encode_value(value, parts)
+    body = b''.join(parts)
+    return HEADER.pack(len(body), zlib.crc32(body)) + body
+
+
+def decode(body):
+    """Изменение из тела записи."""
+    kind, observed, sent = FIXED.unpack_from(body)
+    offset = FIXED.size
+    values = []
+    for _ in range(5):
+        value, offset = decode_value(body, offset)
+        values.append(value)
+    return Transition(kind, *values, observed, sent)
+
+
+def read_records(file):
+    """Записи файла по порядку: (изменение, смещение после записи).
+
+    Чтение останавливается на оборванной или испорченной записи.
+    """
+    buffer = b''
+    position = 0
+    offset = 0
+    while True:
+        chunk = file.read(READ_CHUNK)
+        if not chunk:
+            return
+        buffer = buffer[position:] + chunk
+        position = 0
+        while len(buffer) - position >= HEADER.size:
+            length, crc = HEADER.unpack_from(buffer, position)
+            end = position + HEADER.size + length
+            if end > len(buffer):
+                break
+            body = buffer[position + HEADER.size:end]
+            if zlib.crc32(body) != crc:
+                return
+            try:
+                transition = decode(body)
+            except (struct.error, IndexError, UnicodeDecodeError):
+                return
+            offset += end - position
+            position = end
+            yield transition, offset
+
+
+class Journal:
+    """Журнал изменений статусов с пакетной записью и сжатием."""
+
+    def __init__(self, path=JOURNAL_FILE, max_bytes=JOURNAL_MAX_BYTES,
+                 backup_count=JOURNAL_BACKUP_COUNT, fsync=JOURNAL_FSYNC,
+                 clock=time.time):
+        self.path = path
+        self.max_bytes = max_bytes
+        self.backup_count = backup_count
+        self.fsync = fsync
+        self.clock = clock
+        # (пользователь, работа) -> последнее изменение.
+        self.latest = {}
+        self.pending = []
+        self.size = 0
+        # Размер файла после последнего сжатия.
+        self.compacted_size = 0
+        self.written = 0
+        self.compactions = 0
+        self._lock = threading.Lock()
+        self._write_lock = threading.Lock()
+        self.file = None
+
+    def apply(self, transition):
+        """Учёт изменения в последнем состоянии работ."""
+        key = (transition.tenant, transition.homework)
+        if transition.kind == OBSERVED:
+            self.latest[key] = transition
+            return
+        last = self.latest.get(key)
+        if last is not None and last.observed == transition.observed:
+            self.latest[key] = last._replace(sent=transition.sent)
+
+    def replay(self):
+        """Чтение журнала при запуске; возвращает число записей.
+
+        Оборванный хвост после последней целой записи отрезается,
+        чтобы новые записи шли сразу за ней.
+        """
+        records = 0
+        valid = 0
+        if os.path.exists(self.path):
+            with open(self.path, 'rb') as file:
+                for transition, valid in read_records(file):
+                    self.apply(transition)
+                    records += 1
+        self.file = open(self.path, 'ab')
+        if self.file.tell() != valid:
+            self.file.truncate(valid)
+            self.file.seek(valid)
+        self.size = valid
+        return records
+
+    def unsent(self):
+        """Изменения, уведомление о которых не было отправлено."""
+        return [
+            transition for transition in self.latest.values()
+            if not transition.sent
+        ]
+
+    def observe(self, tenant, homework, name, old_status, status):
+        """Запись замеченного изменения; возвращает его."""
+        transition = Transition(
+            OBSERVED, tenant, homework, name, old_status, status,
+            self.clock(), 0.0
+        )
+        self.append(transition)
+        return transition
+
+    def mark_sent(self, transition):
+        """Запись об отправке уведомления об изменении."""
+        self.append(transition._replace(kind=SENT, sent=self.clock()))
+
+    def append(self, transition):
+        """Изменение в очередь на запись."""
+        with self._lock:
+            self.apply(transition)
+            self.pending.append(encode(transition))
+
+    def flush(self):
+        """Дозапись накопленных записей одной операцией.
+
+        Когда файл становится больше max_bytes, он сжимается
+        (см. compaction_due()).
+        Возвращает число записанных записей.
+        """
+        with self._write_lock:
+            with self._lock:
+                pending, self.pending = self.pending, []
+            if pending:
+                if self.file is None:
+                    self.file = open(self.path, 'ab')
+                    self.size = self.file.tell()
+                data = b''.join(pending)
+                self.file.write(data)
+                self.file.flush()
+                if self.fsync:
+                    os.fsync(self.file.fileno())
+                self.size += len(data)
+                self.written += len(pending)
+            if self.compaction_due():
+                self.compact()
+        return len(pending)
+
+    def compaction_due(self):
+        """Пора ли сжимать файл.
+
+        Если последних изменений больше, чем на max_bytes, сжатый файл
+        сам больше предела; тогда сжатие ждёт, пока файл не вырастет
+        вдвое, а не переписывает его и резервную копию на каждом flush().
+        """
+        if not self.max_bytes:
+            return False
+        return self.size > max(self.max_bytes, 2 * self.compacted_size)
+
+    def compact(self):
+        """Переписывание журнала: последнее изменение каждой работы.
+
+        Новый файл пишется рядом и подменяет старый атомарно; старый
+        сохраняется как path.1 (и далее до backup_count).
+        """
+        with self._lock:
+            records = [encode(transition)
+                       for transition in self.latest.values()]
+        temporary = self.path + '.tmp'
+        with open(temporary, 'wb') as file:
+            file.write(b''.join(records))
+            file.flush()
+            os.fsync(file.fileno())
+        if self.file is not None:
+            self.file.close()
+        self.rotate()
+        os.replace(temporary, self.path)
+        self.file = open(self.path, 'ab')
+        self.size = self.compacted_size = self.file.tell()
+        self.compactions += 1
+
+    def rotate(self):
+        """Сдвиг старых файлов: path -> path.1 -> path.2 ..."""
+        if not self.backup_count:
+            return
+        for index in range(self.backup_count - 1, 0, -1):
+            source = f'{self.path}.{index}'
+            if os.path.exists(source):
+                os.replace(source, f'{self.path}.{index + 1}')
+        if os.path.exists(self.path):
+            os.replace(self.path, f'{self.path}.1')
+
+    def close(self):
+        """Дозапись очереди и закрытие файла."""
+        self.flush()
+        if self.file is not None:
+            self.file.close()
+            self.file = None
+
+
+def format_transition(transition):
+    """Строка журнала для просмотра."""
+    observed = time.strftime(
+        '%Y-%m-%d %H:%M:%S', time.localtime(transition.observed)
+    )
+    sent = (time.strftime('%H:%M:%S', time.localtime(transition.sent))
+            if transition.sent else '—')
+    kind = 'sent' if transition.kind == SENT else 'observed'
+    return (f'{observed} {kind:<8} {transition.tenant} '
+            f'{transition.name or transition.homework}: '
+            f'{transition.old_status} -> {transition.status}, '
+            f'отправлено {sent}')
+
+
+def main():
+    """Просмотр журнала из командной строки."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--path', default=JOURNAL_FILE)
+    parser.add_argument('--tail', type=int, default=20,
+                        help='сколько последних записей показать')
+    args = parser.parse_args()
+    records, tail = 0, []
+    with open(args.path, 'rb') as file:
+        for transition, _ in read_records(file):
+            records += 1
+            tail.append(transition)
+            del tail[:-args.tail]
+    for transition in tail:
+        print(format_transition(transition))
+    print(f'Записей: {records}')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,30 @@
+"""Отложенный импорт тяжёлых библиотек.
+
+Модуль, импортированный через lazy_import(), загружается при первом
+обращении к его атрибуту. Пока бот только запускается, проверяет
+переменные окружения и ждёт, python-telegram-bot и requests
+с их зависимостями не загружаются.
+"""
+import importlib.util
+import sys
+
+
+def lazy_import(name):
+    """Модуль name, который загрузится при первом обращении.
+
+    Уже загруженный модуль возвращается как есть. Отложенный модуль
+    сразу попадает в sys.modules, поэтому обычный import в другом
+    месте получит его же.
+    """
+    module = sys.modules.get(name)
+    if module is not None:
+        return module
+    spec = importlib.util.find_spec(name)
+    if spec is None:
+        raise ModuleNotFoundError(f'No module named {name!r}', name=name)
+    loader = importlib.util.LazyLoader(spec.loader)
+    spec.loader = loader
+    module = importlib.util.module_from_spec(spec)
+    sys.modules[name] = module
+    loader.exec_module(module)
+    return module
@@ -0,0 +1,142 @@
+"""Запись логов в файл в фоновом потоке с ротацией.
+
+Обработчики логгера только кладут запись в очередь (QueueHandler),
+а форматирование и запись на диск выполняет отдельный поток
+(QueueListener), поэтому медленный диск не задерживает опрос.
+Файл лога ротируется по размеру (LOG_MAX_BYTES) и по возрасту
+(LOG_MAX_AGE секунд с открытия файла), хранится LOG_BACKUP_COUNT
+старых файлов, при LOG_COMPRESS=1 они сжимаются gzip.
+
+Ротацию одного файла несколько процессов не поддерживают, поэтому
+воркеры sharding.py (SHARDING=1) пишут каждый в свой файл с WORKER_ID
+в имени, как и журнал изменений.
+"""
+import atexit
+import gzip
+import logging
+import os
+import queue
+import shutil
+import time
+from logging.handlers import QueueHandler, QueueListener, RotatingFileHandler
+
+
+def worker_log_file(filename, environ=os.environ):
+    """Файл лога процесса: у воркера к имени добавляется WORKER_ID."""
+    worker = environ.get('WORKER_ID')
+    if environ.get('SHARDING', '') == '1' and worker:
+        return f'{filename}.{worker.replace(":", "-")}'
+    return filename
+
+
+LOG_FILE = worker_log_file(os.getenv('LOG_FILE', 'main.log'))
+LOG_MAX_BYTES = int(os.getenv('LOG_MAX_BYTES', 10 * 2 ** 20))
+LOG_MAX_AGE = float(os.getenv('LOG_MAX_AGE', 24 * 60 * 60))
+LOG_BACKUP_COUNT = int(os.getenv('LOG_BACKUP_COUNT', 5))
+LOG_COMPRESS = os.getenv('LOG_COMPRESS', '1') == '1'
+LOG_FORMAT = '%(asctime)s - %(levelname)s - %(message)s'
+
+_listeners = {}
+
+
+def gzip_namer(name):
+    """Имя сжатого файла ротации."""
+    return name + '.gz'
+
+
+def gzip_rotator(source, dest):
+    """Сжатие файла ротации с удалением исходного."""
+    with open(source, 'rb') as src, gzip.open(dest, 'wb') as dst:
+        shutil.copyfileobj(src, dst)
+    os.remove(source)
+
+
+class DeferredQueueHandler(QueueHandler):
+    """Постановка записи в очередь без форматирования.
+
+    Стандартный QueueHandler копирует и форматирует запись в потоке
+    вызова; здесь это делает поток записи, а опрос только кладёт
+    запись в очередь.
+    """
+
+    def prepare(self, record):
+        """Запись отправляется в очередь как есть."""
+        return record
+
+
+class AgeRotatingFileHandler(RotatingFileHandler):
+    """Ротация по размеру и по возрасту файла.
+
+    Возраст считается с момента открытия файла: после перезапуска
+    отсчёт начинается заново.
+    """
+
+    def __init__(self, filename, max_bytes=LOG_MAX_BYTES,
+                 max_age=LOG_MAX_AGE, backup_count=LOG_BACKUP_COUNT,
+                 compress=LOG_COMPRESS, encoding='UTF-8'):
+        super().__init__(
+            filename, maxBytes=max_bytes, backupCount=backup_count,
+            encoding=encoding
+        )
+        self.max_age = max_age
+        self.opened_at = time.time()
+        if compress:
+            self.namer = gzip_namer
+            self.rotator = gzip_rotator
+
+    def shouldRollover(self, record):
+        """Пора ли начинать новый файл."""
+        if super().shouldRollover(record):
+            return True
+        return bool(
+            self.max_age
+            and self.stream is not None
+            and time.time() - self.opened_at >= self.max_age
+            and self.stream.tell() > 0
+        )
+
+    def doRollover(self):
+        """Ротация с перезапуском отсчёта возраста."""
+        super().doRollover()
+        self.opened_at = time.time()
+
+
+def setup_logging(filename=LOG_FILE, level=logging.DEBUG, fmt=LOG_FORMAT,
+                  logger=None, **rotation):
+    """Подключение логгера к фоновой записи в файл.
+
+    По умолчанию настраивается корневой логгер, как basicConfig().
+    Повторный вызов для того же логгера возвращает уже запущенный
+    QueueListener. При выходе из процесса очередь дописывается на диск.
+    """
+    logger = logger or logging.getLogger()
+    if logger.name in _listeners:
+        return _listeners[logger.name]
+    file_handler = AgeRotatingFileHandler(filename, **rotation)
+    file_handler.setFormatter(logging.Formatter(fmt))
+    records = queue.SimpleQueue()
+    listener = QueueListener(
+        records, file_handler, respect_handler_level=True
+    )
+    logger.addHandler(DeferredQueueHandler(records))
+    logger.setLevel(level)
+    listener.start()
+    _listeners[logger.name] = listener
+    atexit.register(stop_logging, logger)
+    return listener
+
+
+def stop_logging(logger=None):
+    """Остановка фоновой записи с дописыванием очереди."""
+    logger = logger or logging.getLogger()
+    listener = _listeners.pop(logger.name, None)
+    if listener is None:
+        return
+    for handler in list(logger.handlers):
+        if isinstance(handler, QueueHandler) and (
+            handler.queue is listener.queue
+        ):
+            logger.removeHandler(handler)
+    listener.stop()
+    for handler in listener.handlers:
+        handler.close()
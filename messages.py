@@ -0,0 +1,162 @@
+"""Каталог сообщений пользователям на нескольких языках.
+
+Тексты для каждого языка загружаются при импорте; русские берутся
+из event_descriptions и homework.HOMEWORK_VERDICTS, остальные переводы
+лежат здесь. Язык чата задаётся третьим столбцом tenants.csv, без него
+используется DEFAULT_LANGUAGE.
+
+Шаблон разбирается один раз: известные значения подставляются сразу,
+а на местах подстановок шаблон режется на готовые фрагменты. Сообщение
+о смене статуса для пары (статус, язык) собирается с вердиктом один
+раз и хранится в STATUS_FRAGMENTS по паре (статус, язык) как есть,
+без разбора кода языка, так что при рассылке тысячам чатов сообщение —
+один поиск в словаре и одна f-строка.
+"""
+import os
+from functools import lru_cache
+
+import event_descriptions as ed  # Импорт описания событий
+
+# Язык, на котором написаны тексты в event_descriptions.
+SOURCE_LANGUAGE = 'ru'
+# Место подстановки в разобранном шаблоне.
+SLOT = '\0'
+
+CATALOGS = {
+    'ru': {
+        'status_changed': ed.STATUS_CHANGED,
+        # Заполняются из homework при первом обращении.
+        'verdicts': None,
+        'status_header': ed.COMMAND_STATUS_HEADER,
+        'status_line': ed.COMMAND_STATUS_LINE,
+        'status_empty': ed.COMMAND_STATUS_EMPTY,
+        'history_header': ed.COMMAND_HISTORY_HEADER,
+        'history_line': ed.COMMAND_HISTORY_LINE,
+        'history_empty': ed.COMMAND_HISTORY_EMPTY,
+        'help': ed.COMMAND_HELP,
+    },
+    'en': {
+        'status_changed': 'The review status of "{}" has changed. {}',
+        'verdicts': {
+            'approved': 'The work has been reviewed: '
+                        'the reviewer liked everything. Hooray!',
+            'reviewing': 'The reviewer has started reviewing the work.',
+            'rejected': 'The work has been reviewed: '
+                        'the reviewer has some remarks.',
+        },
+        'status_header': 'Statuses of your works:',
+        'status_line': '“{}”: {}',
+        'status_empty': 'No data about your works yet.',
+        'history_header': 'Recent status changes:',
+        'history_line': '{} “{}”: {}',
+        'history_empty': 'No status changes yet.',
+        'help': ('Commands: /status — current statuses of your works, '
+                 '/history — recent status changes.'),
+    },
+}
+
+DEFAULT_LANGUAGE = os.getenv('DEFAULT_LANGUAGE', SOURCE_LANGUAGE)
+
+
+@lru_cache(maxsize=64)
+def language_of(language):
+    """Язык из каталога для кода вида en, en-US или EN_us.
+
+    Неизвестный или пустой код — язык по умолчанию.
+    """
+    if language:
+        language = language.strip().lower().replace('_', '-')
+        for code in (language, language.split('-')[0]):
+            if code in CATALOGS:
+                return code
+    if DEFAULT_LANGUAGE in CATALOGS:
+        return DEFAULT_LANGUAGE
+    return SOURCE_LANGUAGE
+
+
+def text(key, language=None):
+    """Текст или шаблон по ключу; без перевода — исходный текст."""
+    value = CATALOGS[language_of(language)].get(key)
+    if value is None:
+        value = CATALOGS[SOURCE_LANGUAGE][key]
+    return value
+
+
+def verdicts(language):
+    """Вердикты языка: статус -> текст."""
+    catalog = CATALOGS[language]
+    if catalog.get('verdicts') is None and language == SOURCE_LANGUAGE:
+        # homework сам импортирует каталог, поэтому исходные
+        # вердикты читаются при первом обращении, а не при импорте.
+        from homework import HOMEWORK_VERDICTS
+        catalog['verdicts'] = HOMEWORK_VERDICTS
+    return catalog.get('verdicts') or {}
+
+
+def verdict(status, language=None):
+    """Вердикт по статусу; без перевода — исходный, без него — статус."""
+    language = language_of(language)
+    for code in (language, SOURCE_LANGUAGE):
+        value = verdicts(code).get(status)
+        if value is not None:
+            return value
+    return status
+
+
+def compile_template(template, *args):
+    """Шаблон str.format, разрезанный по местам подстановок.
+
+    Значения args подставляются сразу; аргумент SLOT оставляет
+    место пустым. Возвращает кортеж готовых фрагментов, между
+    которыми при заполнении встают значения для мест SLOT.
+    """
+    return tuple(template.format(*args).split(SLOT))
+
+
+def fill(fragments, *values):
+    """Сообщение из разобранного шаблона и значений для его мест."""
+    if len(fragments) == 1:
+        return fragments[0]
+    parts = [fragments[0]]
+    for value, fragment in zip(values, fragments[1:]):
+        parts.append(str(value))
+        parts.append(fragment)
+    return ''.join(parts)
+
+
+@lru_cache(maxsize=1024)
+def template_fragments(key, language):
+    """Разобранный шаблон каталога: все значения — места SLOT."""
+    template = text(key, language)
+    return compile_template(template, *[SLOT] * template.count('{}'))
+
+
+@lru_cache(maxsize=1024)
+def status_fragments(status, language):
+    """Сообщение о смене статуса с готовым вердиктом: (начало, конец)."""
+    language = language_of(language)
+    return compile_template(
+        text('status_changed', language), SLOT, verdict(status, language)
+    )
+
+
+def render(key, language, *values):
+    """Сообщение по ключу каталога на языке чата."""
+    return fill(template_fragments(key, language_of(language)), *values)
+
+
+# (статус, язык) -> (начало, конец) сообщения о смене статуса.
+# Заполняется status_message(); ключи — проверенные статусы и коды
+# языков пользователей, поэтому словарь не растёт без предела.
+STATUS_FRAGMENTS = {}
+
+
+def status_message(homework_name, status, language=None):
+    """Сообщение об изменении статуса работы на языке чата."""
+    fragments = STATUS_FRAGMENTS.get((status, language))
+    if fragments is None:
+        fragments = STATUS_FRAGMENTS[status, language] = status_fragments(
+            status, language
+        )
+    start, end = fragments
+    return f'{start}{homework_name}{end}'
@@ -0,0 +1,271 @@
+"""Метрики опроса в текстовом формате Prometheus.
+
+Счётчики, значения и гистограммы задержек стадий опроса копятся
+в памяти процесса и отдаются по HTTP на локальном порту METRICS_PORT
+(путь /metrics). Без METRICS_PORT сервер не запускается, а метрики
+просто считаются.
+"""
+import logging
+import os
+import threading
+import time
+from contextlib import contextmanager
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import event_descriptions as ed  # Импорт описания событий
+
+METRICS_HOST = os.getenv('METRICS_HOST', '127.0.0.1')
+METRICS_PORT = int(os.getenv('METRICS_PORT', 0))
+
+# Границы корзин гистограмм задержек в секундах.
+LATENCY_BUCKETS = (
+    0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05,
+    0.1, 0.25, 0.5, 1, 2.5, 5, 10,
+)
+
+logger = logging.getLogger(__name__)
+
+
+def escape(value):
+    """Экранирование значения метки."""
+    return (str(value).replace('\\', r'\\')
+            .replace('\n', r'\n').replace('"', r'\"'))
+
+
+def format_labels(names, values, extra=''):
+    """Метки в виде {name="value",...}."""
+    pairs = [f'{name}="{escape(value)}"' for name, value in zip(names, values)]
+    if extra:
+        pairs.append(extra)
+    return '{' + ','.join(pairs) + '}' if pairs else ''
+
+
+class Registry:
+    """Набор метрик, отдаваемых вместе."""
+
+    def __init__(self):
+        self.metrics = []
+
+    def register(self, metric):
+        """Добавление метрики."""
+        self.metrics.append(metric)
+
+    def render(self):
+        """Все метрики в текстовом формате Prometheus."""
+        lines = []
+        for metric in self.metrics:
+            lines.append(f'# HELP {metric.name} {metric.documentation}')
+            lines.append(f'# TYPE {metric.name} {metric.kind}')
+            lines.extend(metric.render())
+        return '\n'.join(lines) + '\n'
+
+
+REGISTRY = Registry()
+
+
+class Metric:
+    """Общая часть метрик: имя, описание, метки и блокировка."""
+
+    kind = 'untyped'
+
+    def __init__(self, name, documentation, labelnames=(),
+                 registry=REGISTRY):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._lock = threading.Lock()
+        self.values = {}
+        registry.register(self)
+
+    def render(self):
+        """Строки значений метрики."""
+        with self._lock:
+            items = sorted(self.values.items())
+        for labels, value in items:
+            yield (f'{self.name}{format_labels(self.labelnames, labels)} '
+                   f'{value}')
+
+
+class Counter(Metric):
+    """Монотонно растущий счётчик."""
+
+    kind = 'counter'
+
+    def inc(self, *labels, amount=1):
+        """Увеличение счётчика."""
+        with self._lock:
+            self.values[labels] = self.values.get(labels, 0) + amount
+
+
+class Gauge(Metric):
+    """Текущее значение: заданное явно или вычисляемое при чтении."""
+
+    kind = 'gauge'
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.functions = {}
+
+    def set(self, value, *labels):
+        """Запись значения."""
+        with self._lock:
+            self.values[labels] = value
+
+    def set_function(self, function, *labels):
+        """Значение, вычисляемое функцией при каждом чтении."""
+        with self._lock:
+            self.functions[labels] = function
+
+    def render(self):
+        """Строки значений с вычислением функций."""
+        with self._lock:
+            values = dict(self.values)
+            functions = dict(self.functions)
+        for labels, function in functions.items():
+            values[labels] = function()
+        for labels, value in sorted(values.items()):
+            yield (f'{self.name}{format_labels(self.labelnames, labels)} '
+                   f'{value}')
+
+
+class Histogram(Metric):
+    """Распределение значений по корзинам."""
+
+    kind = 'histogram'
+
+    def __init__(self, *args, buckets=LATENCY_BUCKETS, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.buckets = tuple(buckets)
+
+    def observe(self, value, *labels):
+        """Учёт одного значения."""
+        with self._lock:
+            state = self.values.get(labels)
+            if state is None:
+                # Счётчики корзин, сумма и количество.
+                state = self.values[labels] = [
+                    [0] * len(self.buckets), 0.0, 0
+                ]
+            counts = state[0]
+            for index, bound in enumerate(self.buckets):
+                if value <= bound:
+                    counts[index] += 1
+                    break
+            state[1] += value
+            state[2] += 1
+
+    @contextmanager
+    def time(self, *labels):
+        """Замер длительности блока кода."""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(time.perf_counter() - start, *labels)
+
+    def render(self):
+        """Корзины нарастающим итогом, сумма и количество."""
+        with self._lock:
+            items = sorted(
+                (labels, (list(state[0]), state[1], state[2]))
+                for labels, state in self.values.items()
+            )
+        for labels, (counts, total, count) in items:
+            cumulative = 0
+            for bound, bucket in zip(self.buckets, counts):
+                cumulative += bucket
+                label_text = format_labels(
+                    self.labelnames, labels, f'le="{bound}"'
+                )
+                yield f'{self.name}_bucket{label_text} {cumulative}'
+            label_text = format_labels(self.labelnames, labels, 'le="+Inf"')
+            yield f'{self.name}_bucket{label_text} {count}'
+            label_text = format_labels(self.labelnames, labels)
+            yield f'{self.name}_sum{label_text} {total}'
+            yield f'{self.name}_count{label_text} {count}'
+
+
+STAGE_LATENCY = Histogram(
+    'homework_bot_stage_seconds',
+    'Длительность стадий опроса: get_api_answer, check_response, '
+    'parse_status, send_message.',
+    ('stage',)
+)
+COMMAND_LATENCY = Histogram(
+    'homework_bot_command_seconds',
+    'Время подготовки ответа на команду бота.',
+    ('command',)
+)
+POLL_DURATION = Histogram(
+    'homework_bot_poll_seconds',
+    'Длительность одной итерации опроса пользователя.'
+)
+HTTP_RESPONSES = Counter(
+    'homework_bot_http_responses_total',
+    'Ответы API Практикума по HTTP-коду.',
+    ('code',)
+)
+ERRORS = Counter(
+    'homework_bot_errors_total',
+    'Ошибки опроса по классу исключения.',
+    ('error',)
+)
+ERRORS_SUPPRESSED = Counter(
+    'homework_bot_errors_suppressed_total',
+    'Сообщения об ошибках, отложенные в сводку.'
+)
+RETRIES = Counter(
+    'homework_bot_api_retries_total',
+    'Повторы запросов к API после временных сбоев.'
+)
+BREAKER_STATE = Gauge(
+    'homework_bot_breaker_state',
+    'Предохранитель API: 0 — замкнут, 1 — проба, 2 — разомкнут.'
+)
+BREAKER_REJECTED = Counter(
+    'homework_bot_breaker_rejected_total',
+    'Запросы к API, не отправленные из-за разомкнутого предохранителя.'
+)
+API_CALLS = Gauge(
+    'homework_bot_api_calls',
+    'Запросы к API: upstream — отправленные, coalesced — дождавшиеся '
+    'одинакового запроса, cached — из кэша объединения.',
+    ('outcome',)
+)
+QUEUE_DEPTH = Gauge(
+    'homework_bot_queue_depth',
+    'Длина очередей: отправки сообщений, записи состояния, пула опроса.',
+    ('queue',)
+)
+
+
+class MetricsHandler(BaseHTTPRequestHandler):
+    """Отдача метрик по GET /metrics."""
+
+    registry = REGISTRY
+
+    def do_GET(self):
+        """Ответ с метриками."""
+        if self.path.split('?')[0] != '/metrics':
+            self.send_error(404)
+            return
+        body = self.registry.render().encode()
+        self.send_response(200)
+        self.send_header('Content-Type', 'text/plain; version=0.0.4')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        """Запросы к метрикам не логируются."""
+
+
+def serve(port=METRICS_PORT, host=METRICS_HOST):
+    """Запуск HTTP-сервера метрик в фоновом потоке."""
+    server = ThreadingHTTPServer((host, port), MetricsHandler)
+    thread = threading.Thread(
+        target=server.serve_forever, name='metrics', daemon=True
+    )
+    thread.start()
+    logger.info(ed.METRICS_SERVER_LOG.format(host, server.server_address[1]))
+    return server
@@ -0,0 +1,227 @@
+"""Фоновая очередь исходящих сообщений Telegram.
+
+Опрос API только ставит сообщение в очередь и сразу продолжает работу.
+Отправкой занимаются воркеры: они соблюдают ограничения Telegram
+(около 30 сообщений в секунду на бота и 1 сообщение в секунду в чат)
+и при ответе 429 ждут указанные в retry_after секунды. Ошибки
+python-telegram-bot и BotApiSender (ex.BotAPIError) разбираются
+одинаково.
+"""
+import asyncio
+import heapq
+import itertools
+import logging
+import os
+from concurrent.futures import ThreadPoolExecutor
+
+import telegram
+
+import event_descriptions as ed  # Импорт описания событий
+import exceptions as ex  # Импорт польз. исключений.
+import metrics
+
+GLOBAL_RATE = float(os.getenv('TELEGRAM_GLOBAL_RATE', 30))
+CHAT_RATE = float(os.getenv('TELEGRAM_CHAT_RATE', 1))
+SEND_WORKERS = int(os.getenv('TELEGRAM_SEND_WORKERS', 8))
+# Адрес Bot API; None — api.telegram.org.
+TELEGRAM_BASE_URL = os.getenv('TELEGRAM_BASE_URL')
+# Сколько раз повторять отправку при сетевых ошибках.
+MAX_ATTEMPTS = 3
+
+logger = logging.getLogger(__name__)
+
+
+def is_retryable(error):
+    """Может ли повтор отправки помочь: сеть или сбой на стороне Telegram."""
+    if isinstance(error, ex.BotAPIError):
+        return error.error_code is None or error.error_code >= 500
+    # BadRequest наследует NetworkError, но повтор не поможет.
+    return (isinstance(error, telegram.error.NetworkError)
+            and not isinstance(error, telegram.error.BadRequest))
+
+
+class TokenBucket:
+    """Ведро токенов с резервированием слотов в будущем.
+
+    reserve() всегда забирает токен и возвращает, сколько нужно
+    подождать до его появления, поэтому очередность запросов
+    определяется порядком вызовов, а не гонкой за токен.
+    """
+
+    __slots__ = ('rate', 'capacity', 'tokens', 'updated')
+
+    def __init__(self, rate, capacity=1, now=0.0):
+        self.rate = rate
+        self.capacity = capacity
+        self.tokens = capacity
+        self.updated = now
+
+    def reserve(self, now):
+        """Резервирование токена: пауза до его появления в секундах."""
+        self.tokens = min(
+            self.capacity, self.tokens + (now - self.updated) * self.rate
+        )
+        self.updated = now
+        self.tokens -= 1
+        return 0.0 if self.tokens >= 0 else -self.tokens / self.rate
+
+    def is_full(self, now):
+        """Восстановилось ли ведро полностью к моменту now."""
+        return self.tokens + (now - self.updated) * self.rate >= self.capacity
+
+
+class OutboundQueue:
+    """Очередь сообщений с ограничением скорости по чатам и в целом."""
+
+    def __init__(self, bot, workers=SEND_WORKERS, global_rate=GLOBAL_RATE,
+                 chat_rate=CHAT_RATE):
+        self.bot = bot
+        self.workers = workers
+        self.global_rate = global_rate
+        self.chat_rate = chat_rate
+        self.global_bucket = TokenBucket(global_rate, capacity=global_rate)
+        self.chat_buckets = {}
+        # Куча (время готовности, номер, chat_id, текст, попытка,
+        # вызов после успешной отправки).
+        self.pending = []
+        self.sequence = itertools.count()
+        self.ready = None
+        self.wakeup = None
+        self.tasks = []
+        self.executor = ThreadPoolExecutor(
+            max_workers=workers, thread_name_prefix='send'
+        )
+        self.paused_until = 0.0
+        self.in_flight = 0
+        self.sent = 0
+        self.failed = 0
+        self.retried = 0
+
+    def set_global_rate(self, rate):
+        """Новое ограничение на бота, например при смене числа воркеров."""
+        if rate == self.global_rate:
+            return
+        self.global_rate = rate
+        self.global_bucket.rate = rate
+        self.global_bucket.capacity = rate
+        self.global_bucket.tokens = min(self.global_bucket.tokens, rate)
+
+    @property
+    def depth(self):
+        """Сообщения, ожидающие отправки."""
+        ready = self.ready.qsize() if self.ready else 0
+        return len(self.pending) + ready
+
+    def put(self, chat_id, text, attempt=1, not_before=0.0, on_sent=None):
+        """Постановка сообщения в очередь без ожидания отправки.
+
+        on_sent вызывается без аргументов, когда Telegram принял
+        сообщение.
+        """
+        now = asyncio.get_running_loop().time()
+        bucket = self.chat_buckets.get(chat_id)
+        if bucket is None:
+            bucket = self.chat_buckets[chat_id] = TokenBucket(
+                self.chat_rate, now=now
+            )
+        ready_at = max(now + bucket.reserve(now), not_before)
+        heapq.heappush(
+            self.pending,
+            (ready_at, next(self.sequence), chat_id, text, attempt, on_sent)
+        )
+        if self.wakeup is not None:
+            self.wakeup.set()
+
+    def start(self):
+        """Запуск диспетчера и воркеров в текущем цикле событий."""
+        self.ready = asyncio.Queue(maxsize=self.workers)
+        self.wakeup = asyncio.Event()
+        self.tasks = [asyncio.ensure_future(self.dispatch())]
+        self.tasks += [
+            asyncio.ensure_future(self.work()) for _ in range(self.workers)
+        ]
+
+    async def drain(self):
+        """Ожидание отправки всех сообщений из очереди."""
+        while self.pending or self.in_flight or not self.ready.empty():
+            await asyncio.sleep(0.01)
+
+    async def stop(self):
+        """Остановка воркеров; неотправленные сообщения остаются в очереди."""
+        for task in self.tasks:
+            task.cancel()
+        await asyncio.gather(*self.tasks, return_exceptions=True)
+        self.tasks = []
+        self.executor.shutdown(wait=False)
+
+    async def dispatch(self):
+        """Выдача воркерам сообщений, чей слот по чату и боту наступил."""
+        loop = asyncio.get_running_loop()
+        while True:
+            if not self.pending:
+                self.wakeup.clear()
+                await self.wakeup.wait()
+                continue
+            now = loop.time()
+            ready_at = max(self.pending[0][0], self.paused_until)
+            if ready_at > now:
+                self.wakeup.clear()
+                try:
+                    await asyncio.wait_for(
+                        self.wakeup.wait(), timeout=ready_at - now
+                    )
+                except asyncio.TimeoutError:
+                    pass
+                continue
+            item = heapq.heappop(self.pending)
+            self.in_flight += 1
+            delay = self.global_bucket.reserve(now)
+            if delay:
+                await asyncio.sleep(delay)
+            await self.ready.put(item)
+            self.prune_buckets(now)
+
+    def prune_buckets(self, now):
+        """Удаление вёдер чатов, которые полностью восстановились."""
+        if len(self.chat_buckets) < 4 * self.global_rate * 60:
+            return
+        self.chat_buckets = {
+            chat_id: bucket for chat_id, bucket in self.chat_buckets.items()
+            if not bucket.is_full(now)
+        }
+
+    async def work(self):
+        """Отправка сообщений из очереди готовых."""
+        loop = asyncio.get_running_loop()
+        while True:
+            _, _, chat_id, text, attempt, on_sent = await self.ready.get()
+            try:
+                with metrics.STAGE_LATENCY.time('send_message'):
+                    await loop.run_in_executor(
+                        self.executor, self.bot.send_message, chat_id, text
+                    )
+                self.sent += 1
+                logger.debug(ed.SEND_MESSAGE_SECCESSFUL.format(text))
+                if on_sent is not None:
+                    on_sent()
+            except (telegram.error.TelegramError, ex.BotAPIError) as error:
+                self.on_error(error, chat_id, text, attempt, on_sent)
+            finally:
+                self.in_flight -= 1
+
+    def on_error(self, error, chat_id, text, attempt, on_sent):
+        """Повтор или отказ от сообщения, которое не удалось отправить."""
+        retry_after = getattr(error, 'retry_after', None)
+        if retry_after is not None:
+            # 429 касается всего бота: притормаживаем всю отправку.
+            loop = asyncio.get_running_loop()
+            self.paused_until = loop.time() + retry_after
+            self.retried += 1
+            logger.warning(ed.TELEGRAM_RETRY_AFTER_LOG.format(retry_after))
+            self.put(chat_id, text, attempt, self.paused_until, on_sent)
+        elif is_retryable(error) and attempt < MAX_ATTEMPTS:
+            self.retried += 1
+            self.put(chat_id, text, attempt + 1, on_sent=on_sent)
+        else:
+            self.failed += 1
+            logger.error(error)
@@ -0,0 +1,115 @@
+"""Повторы временных сбоев и общий предохранитель для API Практикума.
+
+Временный сбой (сетевая ошибка, ответ 5xx или 429) повторяется
+несколько раз с экспоненциальной паузой и полным разбросом, а не
+откладывается на целый период опроса. Предохранитель общий для всех
+пользователей: после BREAKER_FAILURES сбоев подряд он размыкается,
+и запросы к API не отправляются BREAKER_RESET_TIMEOUT секунд. Затем
+он пропускает до BREAKER_PROBES пробных запросов: успех замыкает его,
+сбой размыкает снова.
+"""
+import os
+import random
+import threading
+import time
+
+RETRY_ATTEMPTS = int(os.getenv('RETRY_ATTEMPTS', 3))
+RETRY_BASE_DELAY = float(os.getenv('RETRY_BASE_DELAY', 0.5))
+RETRY_MAX_DELAY = float(os.getenv('RETRY_MAX_DELAY', 8))
+BREAKER_FAILURES = int(os.getenv('BREAKER_FAILURES', 10))
+BREAKER_RESET_TIMEOUT = float(os.getenv('BREAKER_RESET_TIMEOUT', 30))
+BREAKER_PROBES = int(os.getenv('BREAKER_PROBES', 1))
+
+CLOSED = 'closed'
+OPEN = 'open'
+HALF_OPEN = 'half_open'
+# Числовые коды состояний для метрик.
+STATE_CODES = {CLOSED: 0, HALF_OPEN: 1, OPEN: 2}
+
+
+def is_transient(status_code):
+    """Стоит ли повторять запрос с таким кодом ответа."""
+    return status_code >= 500 or status_code == 429
+
+
+class RetryPolicy:
+    """Число попыток и паузы между ними."""
+
+    def __init__(self, attempts=RETRY_ATTEMPTS, base_delay=RETRY_BASE_DELAY,
+                 max_delay=RETRY_MAX_DELAY):
+        self.attempts = attempts
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+
+    def delay(self, retry):
+        """Пауза перед повтором номер retry (с 1).
+
+        Полный разброс от нуля до экспоненциальной границы, чтобы
+        повторы разных пользователей не совпадали по времени.
+        """
+        return random.uniform(
+            0, min(self.max_delay, self.base_delay * 2 ** (retry - 1))
+        )
+
+
+class CircuitBreaker:
+    """Предохранитель, общий для всех потоков опроса."""
+
+    def __init__(self, failures=BREAKER_FAILURES,
+                 reset_timeout=BREAKER_RESET_TIMEOUT, probes=BREAKER_PROBES,
+                 clock=time.monotonic):
+        self.failures = failures
+        self.reset_timeout = reset_timeout
+        self.probes = probes
+        self.clock = clock
+        self.state = CLOSED
+        self.consecutive = 0
+        self.opened_at = 0.0
+        self.in_probe = 0
+        self.opened = 0
+        self.rejected = 0
+        self._lock = threading.Lock()
+
+    def allow(self):
+        """Можно ли отправить запрос.
+
+        Каждый разрешённый запрос должен завершиться вызовом
+        success() или failure().
+        """
+        with self._lock:
+            if self.state == OPEN:
+                if self.clock() - self.opened_at < self.reset_timeout:
+                    self.rejected += 1
+                    return False
+                self.state = HALF_OPEN
+                self.in_probe = 0
+            if self.state == HALF_OPEN:
+                if self.in_probe >= self.probes:
+                    self.rejected += 1
+                    return False
+                self.in_probe += 1
+            return True
+
+    def success(self):
+        """Учёт успешного запроса."""
+        with self._lock:
+            self.consecutive = 0
+            if self.state == HALF_OPEN:
+                self.state = CLOSED
+                self.in_probe = 0
+
+    def failure(self):
+        """Учёт сбоя."""
+        with self._lock:
+            self.consecutive += 1
+            if self.state == HALF_OPEN or self.consecutive >= self.failures:
+                if self.state != OPEN:
+                    self.opened += 1
+                self.state = OPEN
+                self.opened_at = self.clock()
+                self.in_probe = 0
+
+    @property
+    def state_code(self):
+        """Состояние числом: 0 — замкнут, 1 — проба, 2 — разомкнут."""
+        return STATE_CODES[self.state]
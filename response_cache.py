@@ -0,0 +1,91 @@
+"""Кэш отпечатков ответов API Практикума.
+
+Если ответ совпадает с предыдущим ответом того же пользователя,
+его не нужно ни разбирать, ни проверять, ни превращать в сообщение.
+Ответ считается неизменившимся, если сервер вернул 304 на условный
+запрос (ETag / Last-Modified) или отпечаток тела совпал с прошлым.
+При потоковом разборе тело заранее не читается, и тогда работают
+только условные запросы.
+"""
+import hashlib
+import re
+from http import HTTPStatus
+
+# current_date — время сервера, оно разное в каждом ответе,
+# поэтому в отпечаток тела не входит.
+CURRENT_DATE = re.compile(rb'"current_date"\s*:\s*[\d.]+')
+
+
+def fingerprint(body):
+    """Отпечаток тела ответа без поля current_date."""
+    return hashlib.blake2b(
+        CURRENT_DATE.sub(b'', body), digest_size=16
+    ).digest()
+
+
+class CacheEntry:
+    """Отпечаток и заголовки валидации последнего ответа."""
+
+    __slots__ = ('fingerprint', 'etag', 'last_modified')
+
+    def __init__(self, fingerprint, etag, last_modified):
+        self.fingerprint = fingerprint
+        self.etag = etag
+        self.last_modified = last_modified
+
+
+class ResponseCache:
+    """Отпечатки последних ответов по ключу пользователя."""
+
+    def __init__(self, fingerprint_body=True):
+        self.fingerprint_body = fingerprint_body
+        self.entries = {}
+        self.hits = 0
+        self.misses = 0
+        self.not_modified = 0
+
+    def conditional_headers(self, key, headers):
+        """Заголовки запроса с условиями из последнего ответа."""
+        entry = self.entries.get(key)
+        if entry is None or not (entry.etag or entry.last_modified):
+            return headers
+        headers = dict(headers)
+        if entry.etag:
+            headers['If-None-Match'] = entry.etag
+        if entry.last_modified:
+            headers['If-Modified-Since'] = entry.last_modified
+        return headers
+
+    def is_unchanged(self, key, response):
+        """Совпадает ли ответ с последним запомненным."""
+        entry = self.entries.get(key)
+        if entry is not None:
+            if response.status_code == HTTPStatus.NOT_MODIFIED:
+                self.hits += 1
+                self.not_modified += 1
+                return True
+            if (self.fingerprint_body
+                    and response.status_code == HTTPStatus.OK
+                    and entry.fingerprint == fingerprint(response.content)):
+                self.hits += 1
+                return True
+        self.misses += 1
+        return False
+
+    def remember(self, key, response):
+        """Запоминание успешно обработанного ответа.
+
+        Отпечаток считается заново: промахи редки, и так не нужно
+        хранить отпечаток между проверкой и обработкой ответа.
+        """
+        self.entries[key] = CacheEntry(
+            fingerprint(response.content) if self.fingerprint_body else None,
+            response.headers.get('ETag'),
+            response.headers.get('Last-Modified')
+        )
+
+    @property
+    def hit_rate(self):
+        """Доля ответов, обработка которых была пропущена."""
+        total = self.hits + self.misses
+        return self.hits / total if total else 0.0
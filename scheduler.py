@@ -0,0 +1,77 @@
+"""Адаптивное расписание опросов API Практикума.
+
+Период следующего опроса зависит от последнего известного статуса
+работы и от того, сколько опросов подряд ничего не изменили:
+пока работа на проверке, опрашиваем часто; когда новых событий
+не ждём, постепенно увеличиваем период до верхней границы.
+
+Граница простоя MAX_POLL_PERIOD выбрана по benchmarks/bench_scheduler.py
+так, чтобы p99 задержки уведомления о вердикте не превышал задержку
+при опросе раз в RETRY_PERIOD: работу могут отправить и проверить,
+пока пользователь простаивает, и длинный период сразу виден в хвосте.
+Пока работа на проверке, период не превышает RETRY_PERIOD даже
+с разбросом.
+"""
+import os
+import random
+
+from differ import status_name
+from homework import RETRY_PERIOD
+
+MIN_POLL_PERIOD = int(os.getenv('MIN_POLL_PERIOD', 60))
+MAX_POLL_PERIOD = int(os.getenv('MAX_POLL_PERIOD', 1000))
+IDLE_BACKOFF = float(os.getenv('IDLE_BACKOFF', 1.5))
+# Разброс периода, чтобы опросы пользователей не синхронизировались.
+JITTER = 0.1
+
+# Статус -> (начальный период, предельный период при простое).
+# None — статус ещё не известен: работ на проверке нет.
+STATUS_PERIODS = {
+    'reviewing': (120, RETRY_PERIOD),
+    'rejected': (RETRY_PERIOD, MAX_POLL_PERIOD),
+    'approved': (RETRY_PERIOD, MAX_POLL_PERIOD),
+    None: (RETRY_PERIOD, MAX_POLL_PERIOD),
+}
+
+
+class AdaptiveScheduler:
+    """Выбор времени следующего опроса и учёт сэкономленных запросов."""
+
+    def __init__(self, min_period=MIN_POLL_PERIOD, max_period=MAX_POLL_PERIOD,
+                 backoff=IDLE_BACKOFF, periods=None, jitter=JITTER):
+        self.min_period = min_period
+        self.max_period = max_period
+        self.backoff = backoff
+        self.periods = STATUS_PERIODS if periods is None else periods
+        self.jitter = jitter
+        self.polls = 0
+        self.scheduled_time = 0.0
+
+    def next_delay(self, status, idle_polls):
+        """Пауза до следующего опроса в секундах.
+
+        status — код или название последнего известного статуса работы,
+        idle_polls — число опросов подряд без изменений.
+        """
+        base, limit = self.periods.get(
+            status_name(status), self.periods[None]
+        )
+        delay = min(base * self.backoff ** idle_polls, limit)
+        # Разброс не выводит период за предел статуса.
+        delay = min(
+            delay * random.uniform(1 - self.jitter, 1 + self.jitter), limit
+        )
+        delay = min(max(delay, self.min_period), self.max_period)
+        self.polls += 1
+        self.scheduled_time += delay
+        return delay
+
+    @property
+    def fixed_polls(self):
+        """Сколько запросов ушло бы за то же время с RETRY_PERIOD."""
+        return self.scheduled_time / RETRY_PERIOD
+
+    @property
+    def calls_saved(self):
+        """Сэкономленные запросы относительно опроса раз в RETRY_PERIOD."""
+        return self.fixed_polls - self.polls
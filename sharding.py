@@ -0,0 +1,274 @@
+"""Распределение пользователей между процессами-воркерами.
+
+Запуск N воркеров движка: python sharding.py (число — SHARD_WORKERS).
+
+Воркеры договариваются через общую базу SQLite (LEASE_DB). Каждые
+LEASE_TTL / 3 секунд воркер продлевает свою запись в таблице workers
+и строит кольцо согласованного хеширования из живых воркеров — тех,
+чья запись не истекла. Пользователь закреплён за воркером, ближайшим
+по кольцу к хешу его ключа, но опрашивать его воркер может, только
+взяв аренду — строку в таблице leases со сроком LEASE_TTL. Свою аренду
+воркер продлевает на каждом обходе, чужую может взять, только когда
+она истекла или отпущена.
+
+Новый воркер занимает на кольце лишь свои отрезки, и к нему переходит
+около 1/N пользователей; прежний владелец отпускает их на следующем
+обходе. Аренды остановившегося воркера истекают через LEASE_TTL,
+после чего их забирают владельцы по новому кольцу.
+
+Воркеры на нескольких хостах могут работать с одной LEASE_DB, если она
+лежит на общем диске с рабочими блокировками файлов.
+"""
+import bisect
+import hashlib
+import itertools
+import logging
+import os
+import signal
+import socket
+import sqlite3
+import subprocess
+import sys
+import time
+
+import event_descriptions as ed  # Импорт описания событий
+
+LEASE_DB = os.getenv('LEASE_DB', 'leases.sqlite3')
+LEASE_TTL = float(os.getenv('LEASE_TTL', 30))
+WORKER_ID = os.getenv('WORKER_ID') or f'{socket.gethostname()}:{os.getpid()}'
+SHARD_WORKERS = int(os.getenv('SHARD_WORKERS', 2))
+# Точек на кольце на воркер: чем больше, тем ровнее распределение.
+RING_VNODES = 128
+# Аренда на чтение команд Telegram: getUpdates может читать
+# только один процесс на бота.
+COMMANDS_LEASE = '@commands'
+# Как часто супервизор проверяет, живы ли воркеры.
+SUPERVISE_INTERVAL = 5
+ENGINE_SCRIPT = os.path.join(os.path.dirname(os.path.abspath(__file__)),
+                             'engine.py')
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS workers (
+    worker TEXT PRIMARY KEY,
+    expires REAL NOT NULL
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS leases (
+    tenant TEXT PRIMARY KEY,
+    worker TEXT NOT NULL,
+    expires REAL NOT NULL
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS leases_worker ON leases (worker);
+"""
+
+logger = logging.getLogger(__name__)
+
+
+def ring_hash(value):
+    """Положение строки на кольце."""
+    return int.from_bytes(
+        hashlib.blake2b(value.encode(), digest_size=8).digest(), 'big'
+    )
+
+
+class HashRing:
+    """Кольцо согласованного хеширования."""
+
+    def __init__(self, nodes, vnodes=RING_VNODES):
+        points = sorted(
+            (ring_hash(f'{node}#{index}'), node)
+            for node in nodes
+            for index in range(vnodes)
+        )
+        self.hashes = [point for point, _ in points]
+        self.nodes = [node for _, node in points]
+
+    def owner(self, key):
+        """Узел, за которым закреплён ключ; None — кольцо пусто."""
+        if not self.nodes:
+            return None
+        index = bisect.bisect(self.hashes, ring_hash(key))
+        return self.nodes[index % len(self.nodes)]
+
+
+class LeaseManager:
+    """Аренды пользователей одного воркера.
+
+    renew() и release() обращаются к базе и выполняются в пуле потоков,
+    lease() читает только память и вызывается из цикла событий.
+    """
+
+    def __init__(self, keys, path=LEASE_DB, worker=WORKER_ID, ttl=LEASE_TTL,
+                 vnodes=RING_VNODES, clock=time.time):
+        self.keys = list(keys)
+        self.worker = worker
+        self.ttl = ttl
+        self.vnodes = vnodes
+        self.clock = clock
+        self.connection = sqlite3.connect(
+            path, timeout=ttl / 3, check_same_thread=False
+        )
+        self.connection.execute('PRAGMA journal_mode=WAL')
+        self.connection.executescript(SCHEMA)
+        # Ключ -> номер получения аренды: по смене номера движок
+        # понимает, что состояние пользователя надо перечитать.
+        self.owned = {}
+        self.epochs = itertools.count(1)
+        self.valid_until = 0.0
+        self.workers = []
+        self.acquired = 0
+        self.released = 0
+
+    @property
+    def renew_interval(self):
+        """Пауза между обходами."""
+        return self.ttl / 3
+
+    def lease(self, key):
+        """Номер действующей аренды ключа или None."""
+        if self.clock() >= self.valid_until:
+            return None
+        return self.owned.get(key)
+
+    def live_workers(self, now):
+        """Продление своей записи и список живых воркеров."""
+        self.connection.execute(
+            'INSERT OR REPLACE INTO workers VALUES (?, ?)',
+            (self.worker, now + self.ttl)
+        )
+        self.connection.execute(
+            'DELETE FROM workers WHERE expires <= ?', (now,)
+        )
+        return sorted(
+            worker for worker, in self.connection.execute(
+                'SELECT worker FROM workers'
+            )
+        )
+
+    def renew(self, busy=()):
+        """Один обход: продление и получение аренд.
+
+        Возвращает ключи, которые по новому кольцу принадлежат другим
+        воркерам: они уже не считаются своими, и после записи их
+        состояния нужно вызвать release(). Ключи из busy (идёт опрос)
+        остаются своими до следующего обхода.
+        """
+        now = self.clock()
+        with self.connection:
+            self.workers = self.live_workers(now)
+            ring = HashRing(self.workers, self.vnodes)
+            wanted = {
+                key for key in self.keys if ring.owner(key) == self.worker
+            }
+            leaving = [
+                key for key in self.owned
+                if key not in wanted and key not in busy
+            ]
+            wanted.update(key for key in self.owned if key in busy)
+            self.connection.executemany(
+                'INSERT INTO leases VALUES (?, ?, ?) '
+                'ON CONFLICT (tenant) DO UPDATE SET '
+                'worker = excluded.worker, expires = excluded.expires '
+                'WHERE leases.worker = excluded.worker '
+                'OR leases.expires <= ?',
+                ((key, self.worker, now + self.ttl, now) for key in wanted)
+            )
+            held = {
+                key for key, in self.connection.execute(
+                    'SELECT tenant FROM leases WHERE worker = ?',
+                    (self.worker,)
+                )
+            }
+        self.valid_until = now + self.ttl
+        for key in held & wanted:
+            if key not in self.owned:
+                self.owned[key] = next(self.epochs)
+                self.acquired += 1
+        for key in list(self.owned):
+            if key not in held or key in leaving:
+                del self.owned[key]
+        return leaving
+
+    def release(self, keys):
+        """Освобождение аренд для новых владельцев."""
+        with self.connection:
+            self.connection.executemany(
+                'DELETE FROM leases WHERE tenant = ? AND worker = ?',
+                ((key, self.worker) for key in keys)
+            )
+        self.released += len(keys)
+
+    def close(self):
+        """Уход воркера: его аренды сразу достаются остальным."""
+        self.owned.clear()
+        self.valid_until = 0.0
+        with self.connection:
+            self.connection.execute(
+                'DELETE FROM leases WHERE worker = ?', (self.worker,)
+            )
+            self.connection.execute(
+                'DELETE FROM workers WHERE worker = ?', (self.worker,)
+            )
+        self.connection.close()
+
+
+def spawn(index):
+    """Запуск воркера движка с постоянным идентификатором."""
+    env = dict(
+        os.environ, SHARDING='1', WORKER_ID=f'{socket.gethostname()}:{index}'
+    )
+    # Своя сессия: Ctrl+C из терминала получает только супервизор,
+    # и воркер не получит второй сигнал, пока отпускает аренды.
+    return subprocess.Popen(
+        [sys.executable, ENGINE_SCRIPT], env=env, start_new_session=True
+    )
+
+
+def interrupt(signum, frame):
+    """Остановка по SIGTERM так же, как по Ctrl+C."""
+    logger.info(ed.SHUTDOWN_SIGNAL_LOG.format(signal.Signals(signum).name))
+    raise KeyboardInterrupt
+
+
+def supervise(workers=SHARD_WORKERS):
+    """Запуск воркеров и перезапуск упавших.
+
+    Перезапущенный воркер получает прежний идентификатор и сразу
+    возвращает свои аренды, не дожидаясь их истечения. SIGTERM
+    при остановке или перезапуске платформой завершает воркеры так же,
+    как Ctrl+C: воркеры в своих сессиях сами его не получат.
+    """
+    processes = {}
+    previous = signal.signal(signal.SIGTERM, interrupt)
+    try:
+        while True:
+            for index in range(workers):
+                process = processes.get(index)
+                if process is not None and process.poll() is None:
+                    continue
+                if process is not None:
+                    logger.warning(ed.WORKER_EXIT_LOG.format(
+                        index, process.returncode
+                    ))
+                processes[index] = spawn(index)
+                logger.info(ed.WORKER_START_LOG.format(
+                    index, processes[index].pid
+                ))
+            time.sleep(SUPERVISE_INTERVAL)
+    except KeyboardInterrupt:
+        pass
+    finally:
+        # Повторный SIGTERM не должен прервать ожидание воркеров.
+        signal.signal(signal.SIGTERM, signal.SIG_IGN)
+        # SIGINT вместо SIGTERM: воркер запишет состояние
+        # и отпустит аренды.
+        for process in processes.values():
+            if process.poll() is None:
+                process.send_signal(signal.SIGINT)
+        for process in processes.values():
+            process.wait()
+        signal.signal(signal.SIGTERM, previous)
+
+
+if __name__ == '__main__':
+    logging.basicConfig(level=logging.INFO, format='%(message)s')
+    supervise()
@@ -0,0 +1,155 @@
+"""Объединение одинаковых одновременных запросов к API Практикума.
+
+Несколько пользователей с одним токеном (один студент в нескольких
+чатах) опрашиваются независимо, и их одинаковые запросы могут
+выполняться одновременно. Запрос с тем же ключом (токен, from_date,
+условные заголовки), пока первый ещё выполняется, не уходит к API:
+вызывающий ждёт ответа первого и получает тот же ответ. Успешный
+ответ ещё COALESCE_TTL секунд отдаётся из кэша. Тело ответа
+разбирается один раз на всех получивших его.
+"""
+import os
+import threading
+import time
+
+COALESCE_TTL = float(os.getenv('COALESCE_TTL', 2))
+PURGE_THRESHOLD = 1024
+
+_UNSET = object()
+
+
+class Flight:
+    """Выполняющийся запрос и его результат."""
+
+    __slots__ = ('done', 'result', 'error')
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.result = None
+        self.error = None
+
+
+class SingleFlight:
+    """Один вызов на ключ для одновременных вызывающих.
+
+    Вызовы выполняются в потоках пула, поэтому ожидающие блокируются
+    на событии вызова-лидера. Ошибка лидера пробрасывается всем
+    ожидавшим и в кэш не попадает; cacheable решает, можно ли
+    кэшировать результат.
+    """
+
+    def __init__(self, ttl=COALESCE_TTL, cacheable=None,
+                 clock=time.monotonic):
+        self.ttl = ttl
+        self.cacheable = cacheable
+        self.clock = clock
+        self.flights = {}
+        self.results = {}
+        self.upstream = 0
+        self.coalesced = 0
+        self.cached = 0
+        # Размер кэша, при котором из него удаляются устаревшие
+        # результаты: с каждым опросом from_date меняется, и старые
+        # ключи больше не запрашиваются.
+        self._purge_at = PURGE_THRESHOLD
+        self._lock = threading.Lock()
+
+    @property
+    def saved(self):
+        """Сколько вызовов не дошло до источника."""
+        return self.coalesced + self.cached
+
+    def do(self, key, func, *args):
+        """Результат func(*args), общий для вызовов с ключом key."""
+        with self._lock:
+            cached = self.results.get(key)
+            if cached is not None:
+                if cached[0] > self.clock():
+                    self.cached += 1
+                    return cached[1]
+                del self.results[key]
+            flight = self.flights.get(key)
+            leader = flight is None
+            if leader:
+                flight = self.flights[key] = Flight()
+                self.upstream += 1
+            else:
+                self.coalesced += 1
+        if not leader:
+            flight.done.wait()
+            if flight.error is not None:
+                raise flight.error
+            return flight.result
+        try:
+            flight.result = func(*args)
+        except BaseException as error:
+            flight.error = error
+            raise
+        finally:
+            with self._lock:
+                del self.flights[key]
+                if flight.error is None and self.ttl and (
+                    self.cacheable is None or self.cacheable(flight.result)
+                ):
+                    self.results[key] = (
+                        self.clock() + self.ttl, flight.result
+                    )
+                    if len(self.results) >= self._purge_at:
+                        self._purge()
+            flight.done.set()
+        return flight.result
+
+    def _purge(self):
+        """Удаление устаревших результатов; вызывается под блокировкой."""
+        now = self.clock()
+        for key in [
+            key for key, (expires, _) in self.results.items()
+            if expires <= now
+        ]:
+            del self.results[key]
+        self._purge_at = max(PURGE_THRESHOLD, 2 * len(self.results))
+
+
+class SharedResponse:
+    """Ответ API, общий для объединённых запросов.
+
+    Повторяет нужную разбору часть интерфейса requests.Response,
+    а json() разбирает тело только при первом вызове.
+    """
+
+    __slots__ = ('response', '_data', '_lock')
+
+    def __init__(self, response):
+        self.response = response
+        self._data = _UNSET
+        self._lock = threading.Lock()
+
+    @property
+    def status_code(self):
+        """Код ответа."""
+        return self.response.status_code
+
+    @property
+    def headers(self):
+        """Заголовки ответа."""
+        return self.response.headers
+
+    @property
+    def content(self):
+        """Тело ответа."""
+        return self.response.content
+
+    def json(self):
+        """Разобранное тело; ошибка разбора тоже запоминается."""
+        with self._lock:
+            if self._data is _UNSET:
+                try:
+                    self._data = self.response.json()
+                except ValueError as error:
+                    self._data = error
+        if isinstance(self._data, ValueError):
+            raise self._data
+        return self._data
+
+    def close(self):
+        """Тело уже прочитано, закрывать нечего."""
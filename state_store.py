@@ -0,0 +1,232 @@
+"""Хранилище состояния опроса на диске (SQLite).
+
+Для каждого пользователя хранится from_date последнего успешного
+опроса, для каждой его работы — последний известный статус, а также
+последние STATE_HISTORY_LIMIT изменений статусов (для /history).
+Изменения копятся в памяти и записываются одной транзакцией
+в flush(), а не отдельным fsync на каждый опрос.
+
+Целиком состояние при запуске не читается: каждый пользователь
+получает своё состояние точечным запросом get() перед первым опросом,
+поэтому время запуска не зависит от числа пользователей.
+"""
+import hashlib
+import os
+import sqlite3
+import threading
+
+from differ import status_code, status_name
+
+STATE_DB = os.getenv('STATE_DB', 'state.sqlite3')
+STATE_FLUSH_INTERVAL = float(os.getenv('STATE_FLUSH_INTERVAL', 5))
+# Сколько последних изменений статусов хранить на пользователя.
+STATE_HISTORY_LIMIT = int(os.getenv('STATE_HISTORY_LIMIT', 100))
+# Сколько пользователей читать одним запросом в get_many().
+READ_BATCH = 500
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS tenants (
+    tenant TEXT PRIMARY KEY,
+    from_date INTEGER NOT NULL
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS homeworks (
+    tenant TEXT NOT NULL,
+    -- Без типа: числовые id работ читаются обратно числами.
+    homework NOT NULL,
+    status TEXT NOT NULL,
+    date_updated TEXT,
+    PRIMARY KEY (tenant, homework)
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS transitions (
+    tenant TEXT NOT NULL,
+    homework NOT NULL,
+    homework_name TEXT,
+    status TEXT NOT NULL,
+    date_updated TEXT
+);
+CREATE INDEX IF NOT EXISTS transitions_tenant ON transitions (tenant);
+"""
+
+
+def tenant_key(token, chat_id):
+    """Ключ пользователя в хранилище: сам токен на диск не пишется."""
+    digest = hashlib.sha256(token.encode()).hexdigest()[:16]
+    return f'{chat_id}:{digest}'
+
+
+class StateStore:
+    """Состояние опроса всех пользователей с пакетной записью."""
+
+    def __init__(self, path=STATE_DB, history_limit=STATE_HISTORY_LIMIT):
+        self.path = path
+        self.history_limit = history_limit
+        # Запись идёт из пула потоков, чтение — из цикла событий;
+        # в режиме WAL читатель не ждёт завершения записи.
+        self.connection = sqlite3.connect(path, check_same_thread=False)
+        self.connection.execute('PRAGMA journal_mode=WAL')
+        # В режиме WAL NORMAL не теряет целостность при сбое,
+        # а fsync делается только при контрольных точках.
+        self.connection.execute('PRAGMA synchronous=NORMAL')
+        self.connection.executescript(SCHEMA)
+        self.reader = sqlite3.connect(path, check_same_thread=False)
+        self._lock = threading.Lock()
+        self._write_lock = threading.Lock()
+        self._watermarks = {}
+        self._statuses = {}
+        self._transitions = []
+
+    def get(self, tenant):
+        """Состояние одного пользователя: (from_date, статусы работ).
+
+        from_date равен None, если пользователь ещё не опрашивался;
+        статусы работ — словарь {работа: (код статуса, date_updated)}.
+        """
+        row = self.reader.execute(
+            'SELECT from_date FROM tenants WHERE tenant = ?', (tenant,)
+        ).fetchone()
+        homeworks = {
+            homework: (status_code(status), date_updated)
+            for homework, status, date_updated in self.reader.execute(
+                'SELECT homework, status, date_updated FROM homeworks '
+                'WHERE tenant = ?', (tenant,)
+            )
+        }
+        return (row[0] if row else None), homeworks
+
+    def get_many(self, tenants):
+        """Состояние порции пользователей: (from_date, строки статусов).
+
+        from_date — словарь по ключу пользователя, строки — кортежи
+        (ключ, работа, статус, date_updated) со статусом строкой,
+        как в базе: коды для всей порции сразу даёт
+        differ.status_codes().
+        """
+        watermarks, rows = {}, []
+        for start in range(0, len(tenants), READ_BATCH):
+            part = tenants[start:start + READ_BATCH]
+            marks = ','.join('?' * len(part))
+            watermarks.update(self.reader.execute(
+                f'SELECT tenant, from_date FROM tenants '
+                f'WHERE tenant IN ({marks})', part
+            ))
+            rows.extend(self.reader.execute(
+                f'SELECT tenant, homework, status, date_updated '
+                f'FROM homeworks WHERE tenant IN ({marks})', part
+            ))
+        return watermarks, rows
+
+    def history(self, tenant, limit):
+        """Последние limit изменений статусов, от старых к новым.
+
+        Каждое изменение — (работа, название, код статуса, date_updated).
+        """
+        rows = self.reader.execute(
+            'SELECT homework, homework_name, status, date_updated '
+            'FROM transitions WHERE tenant = ? ORDER BY rowid DESC LIMIT ?',
+            (tenant, limit)
+        ).fetchall()
+        rows.reverse()
+        return [
+            (homework, name, status_code(status), date_updated)
+            for homework, name, status, date_updated in rows
+        ]
+
+    def load(self):
+        """Загрузка состояния всех пользователей.
+
+        Возвращает (from_date по ключу, статусы работ по ключу),
+        статусы — словарь {ключ: {работа: (статус, date_updated)}}.
+        """
+        watermarks = dict(self.reader.execute(
+            'SELECT tenant, from_date FROM tenants'
+        ))
+        statuses = {}
+        rows = self.reader.execute(
+            'SELECT tenant, homework, status, date_updated FROM homeworks'
+        )
+        for tenant, homework, status, date_updated in rows:
+            tenant_statuses = statuses.get(tenant)
+            if tenant_statuses is None:
+                tenant_statuses = statuses[tenant] = {}
+            tenant_statuses[homework] = (status_code(status), date_updated)
+        return watermarks, statuses
+
+    def set_watermark(self, tenant, from_date):
+        """Запоминание from_date для следующего опроса."""
+        with self._lock:
+            self._watermarks[tenant] = from_date
+
+    def set_status(self, tenant, homework, status, date_updated):
+        """Запоминание последнего статуса работы."""
+        with self._lock:
+            self._statuses[tenant, homework] = (status, date_updated)
+
+    def add_transition(self, tenant, homework, name, status, date_updated):
+        """Запоминание изменения статуса работы для истории."""
+        with self._lock:
+            self._transitions.append(
+                (tenant, homework, name, status, date_updated)
+            )
+
+    @property
+    def pending(self):
+        """Число изменений, ещё не записанных на диск."""
+        return (len(self._watermarks) + len(self._statuses)
+                + len(self._transitions))
+
+    def flush(self):
+        """Запись накопленных изменений одной транзакцией."""
+        with self._lock:
+            watermarks, self._watermarks = self._watermarks, {}
+            statuses, self._statuses = self._statuses, {}
+            transitions, self._transitions = self._transitions, []
+        if not watermarks and not statuses and not transitions:
+            return 0
+        try:
+            with self._write_lock, self.connection:
+                self.connection.executemany(
+                    'INSERT OR REPLACE INTO tenants VALUES (?, ?)',
+                    watermarks.items()
+                )
+                self.connection.executemany(
+                    'INSERT OR REPLACE INTO homeworks VALUES (?, ?, ?, ?)',
+                    (
+                        (tenant, homework, status_name(status), date_updated)
+                        for (tenant, homework), (status, date_updated)
+                        in statuses.items()
+                    )
+                )
+                self.connection.executemany(
+                    'INSERT INTO transitions VALUES (?, ?, ?, ?, ?)',
+                    (
+                        (tenant, homework, name, status_name(status), date)
+                        for tenant, homework, name, status, date
+                        in transitions
+                    )
+                )
+                self.prune_history({row[0] for row in transitions})
+        except sqlite3.Error:
+            # Возвращаем изменения в буфер, не затирая более новые.
+            with self._lock:
+                for key, value in watermarks.items():
+                    self._watermarks.setdefault(key, value)
+                for key, value in statuses.items():
+                    self._statuses.setdefault(key, value)
+                self._transitions[:0] = transitions
+            raise
+        return len(watermarks) + len(statuses) + len(transitions)
+
+    def prune_history(self, tenants):
+        """Удаление изменений сверх history_limit; внутри транзакции."""
+        self.connection.executemany(
+            'DELETE FROM transitions WHERE tenant = ? AND rowid <= ('
+            'SELECT rowid FROM transitions WHERE tenant = ? '
+            'ORDER BY rowid DESC LIMIT 1 OFFSET ?)',
+            ((tenant, tenant, self.history_limit) for tenant in tenants)
+        )
+
+    def close(self):
+        """Запись оставшихся изменений и закрытие базы."""
+        self.flush()
+        self.reader.close()
+        self.connection.close()
@@ -0,0 +1,128 @@
+"""Потоковый разбор ответа API Практикума.
+
+При from_date=0 API возвращает всю историю студента, и response.json()
+держит в памяти сразу всё тело ответа и все работы. HomeworkStream
+читает тело по кускам и отдаёт работы по одной, поэтому пиковая память
+не зависит от длины истории. Структура ответа проверяется так же,
+как в check_response(), и с теми же исключениями; каждая работа
+проверяется переданным валидатором сразу после разбора.
+"""
+import codecs
+import json
+import logging
+import re
+
+import exceptions as ex  # Импорт польз. исключений.
+import event_descriptions as ed  # Импорт описания событий
+
+STREAM_CHUNK_SIZE = 16 * 1024
+
+WHITESPACE = re.compile(r'\s*')
+
+logger = logging.getLogger(__name__)
+
+
+class HomeworkStream:
+    """Работы из тела ответа по одной.
+
+    Итерация отдаёт элементы списка homeworks; остальные поля ответа
+    верхнего уровня (например, current_date) после итерации доступны
+    в словаре fields. validator (например, homework.HOMEWORK_VALIDATOR)
+    проверяет каждую работу до того, как она будет отдана.
+    """
+
+    def __init__(self, chunks, validator=None):
+        self.chunks = iter(chunks)
+        self.validator = validator
+        self.decoder = codecs.getincrementaldecoder('utf-8')()
+        self.json = json.JSONDecoder()
+        self.buffer = ''
+        self.pos = 0
+        self.eof = False
+        self.fields = {}
+
+    def __iter__(self):
+        """Итерация по работам из ответа."""
+        return self.parse()
+
+    def read(self):
+        """Дочитывание следующего куска тела; False, если тело кончилось."""
+        if self.eof:
+            return False
+        # Прочитанное начало буфера больше не нужно.
+        self.buffer = self.buffer[self.pos:]
+        self.pos = 0
+        try:
+            chunk = next(self.chunks)
+        except StopIteration:
+            self.eof = True
+            self.buffer += self.decoder.decode(b'', final=True)
+            return True
+        self.buffer += self.decoder.decode(chunk)
+        return True
+
+    def peek(self):
+        """Первый значимый символ после пробелов; '' в конце тела."""
+        while True:
+            self.pos = WHITESPACE.match(self.buffer, self.pos).end()
+            if self.pos < len(self.buffer):
+                return self.buffer[self.pos]
+            if not self.read():
+                return ''
+
+    def expect(self, char, error):
+        """Пропуск ожидаемого символа или ошибка формата."""
+        if self.peek() != char:
+            raise ex.ResponseFormatError(error)
+        self.pos += 1
+
+    def value(self):
+        """Следующее JSON-значение целиком."""
+        self.peek()
+        while True:
+            try:
+                value, end = self.json.raw_decode(self.buffer, self.pos)
+            except json.JSONDecodeError:
+                if not self.read():
+                    raise ex.ResponseFormatError(ed.JSON_DECODE_ERROR)
+                continue
+            # Число в конце буфера могло оборваться посередине.
+            if end == len(self.buffer) and not self.eof:
+                self.read()
+                continue
+            self.pos = end
+            return value
+
+    def parse(self):
+        """Разбор объекта верхнего уровня с потоковым списком работ."""
+        self.expect('{', ed.CHECK_DICT_ERROR)
+        logger.debug(ed.CHECK_DICT_DEBUG)
+        has_homeworks = False
+        while self.peek() != '}':
+            if self.fields or has_homeworks:
+                self.expect(',', ed.JSON_DECODE_ERROR)
+            key = self.value()
+            self.expect(':', ed.JSON_DECODE_ERROR)
+            if key == 'homeworks':
+                has_homeworks = True
+                yield from self.homeworks()
+            else:
+                self.fields[key] = self.value()
+        if not has_homeworks:
+            logger.error(ed.HOMEWORKS_MISSING_ERROR)
+            raise ex.MissingKeyError(ed.HOMEWORKS_MISSING_ERROR)
+
+    def homeworks(self):
+        """Элементы списка homeworks по одному."""
+        self.expect('[', ed.CHECK_LIST_ERROR)
+        logger.debug(ed.CHECK_LIST_DEBUG)
+        first = True
+        while self.peek() != ']':
+            if not first:
+                self.expect(',', ed.JSON_DECODE_ERROR)
+            first = False
+            homework = self.value()
+            if self.validator is not None:
+                self.validator.check(homework)
+            yield homework
+        self.pos += 1
@@ -0,0 +1,72 @@
+import asyncio
+
+import requests
+
+import utils
+from differ import status_code
+
+
+class TestBackfill:
+    DATA = {
+        'homeworks': [
+            {'id': 1, 'homework_name': 'hw1', 'status': 'approved',
+             'date_updated': '2023-01-02T00:00:00Z'},
+            {'id': 2, 'homework_name': 'hw2', 'status': 'rejected',
+             'date_updated': '2023-01-01T00:00:00Z'},
+        ],
+        'current_date': 1000198000,
+    }
+
+    def mock_get(self, calls):
+        def mocked(*args, **kwargs):
+            calls.append(kwargs['params'])
+            return utils.MockResponseGET(*args, data=self.DATA)
+        return mocked
+
+    def test_history_is_merged_without_overwriting_newer(self, monkeypatch,
+                                                         tmp_path):
+        import engine
+        from backfill import Backfill
+        from state_store import StateStore
+        calls = []
+        monkeypatch.setattr(requests, 'get', self.mock_get(calls))
+        store = StateStore(str(tmp_path / 'state.sqlite3'))
+        first = engine.Tenant('token-1', '111')
+        second = engine.Tenant('token-2', '222')
+        # Живое состояние новее истории: его не трогаем.
+        store.set_status(second.key, 2, 'approved', '2023-01-05T00:00:00Z')
+        store.set_watermark(second.key, 2000000000)
+        store.flush()
+
+        stats = asyncio.run(
+            Backfill(store, since=5, concurrency=2).run([first, second])
+        )
+        assert calls == [{'from_date': 5}, {'from_date': 5}]
+        assert (stats.tenants, stats.records, stats.errors) == (2, 4, 0)
+        assert stats.updated == 3
+        approved, rejected = status_code('approved'), status_code('rejected')
+        assert store.get(first.key) == (1000198000, {
+            1: (approved, '2023-01-02T00:00:00Z'),
+            2: (rejected, '2023-01-01T00:00:00Z'),
+        })
+        assert store.get(second.key) == (2000000000, {
+            1: (approved, '2023-01-02T00:00:00Z'),
+            2: (approved, '2023-01-05T00:00:00Z'),
+        })
+        store.close()
+
+    def test_failed_tenant_is_counted(self, monkeypatch, tmp_path):
+        import engine
+        from backfill import Backfill
+        from state_store import StateStore
+
+        def failing_get(*args, **kwargs):
+            return utils.MockResponseGET(*args, http_status=500, data={})
+
+        monkeypatch.setattr(requests, 'get', failing_get)
+        store = StateStore(str(tmp_path / 'state.sqlite3'))
+        stats = asyncio.run(
+            Backfill(store).run([engine.Tenant('token', '111')])
+        )
+        assert (stats.tenants, stats.errors) == (0, 1)
+        store.close()
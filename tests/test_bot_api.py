@@ -0,0 +1,95 @@
+import pytest
+
+
+@pytest.fixture
+def sender():
+    from bot_api import BotApiSender
+    from fake_telegram import FakeTelegramServer
+    servers = []
+
+    def start(**kwargs):
+        server = FakeTelegramServer(seed=1, **kwargs)
+        server.start()
+        servers.append(server)
+        server.sender = BotApiSender('1234:abcdefg', base_url=server.base_url)
+        return server, server.sender
+
+    yield start
+    for server in servers:
+        server.sender.close()
+        server.shutdown()
+        server.server_close()
+
+
+class TestBotApiSender:
+
+    def test_send_message(self, sender):
+        server, bot = sender()
+        message = bot.send_message(111, 'Привет')
+        assert message['text'] == 'Привет'
+        assert [(d.chat_id, d.text) for d in server.deliveries] == [
+            (111, 'Привет')
+        ]
+
+    def test_connection_is_reused(self, sender, monkeypatch):
+        server, bot = sender()
+        connections = []
+        process_request = server.process_request
+
+        def counted(request, client_address):
+            connections.append(client_address)
+            return process_request(request, client_address)
+
+        monkeypatch.setattr(server, 'process_request', counted)
+        for number in range(3):
+            bot.send_message(111 + number, f'сообщение {number}')
+        assert len(server.deliveries) == 3
+        assert len(connections) == 1
+
+    def test_retry_after(self, sender):
+        import exceptions as ex
+        server, bot = sender(chat_rate=1)
+        bot.send_message(111, 'первое')
+        with pytest.raises(ex.BotAPIError) as error:
+            bot.send_message(111, 'второе')
+        assert error.value.retry_after >= 1
+
+    def test_network_error(self):
+        import exceptions as ex
+        from bot_api import BotApiSender
+        bot = BotApiSender('1234:abcdefg', base_url='http://127.0.0.1:9/bot')
+        with pytest.raises(ex.BotAPIError):
+            bot.send_message(111, 'Привет')
+
+    def test_homework_logs_send_errors(self, sender):
+        import homework
+        server, bot = sender(error_rate=1)
+        homework.send_to_chat(bot, 111, 'Привет')
+        assert server.deliveries == []
+
+    def test_main_reports_api_error_as_text(self, sender, monkeypatch):
+        import time
+        from functools import partial
+
+        import event_descriptions as ed
+        import exceptions as ex
+        import homework
+        server, bot = sender()
+
+        def failing_answer(payload):
+            raise ex.HTTPStatusError(ed.HTTP_STATUS_ERROR.format(500))
+
+        def stop(seconds):
+            raise KeyboardInterrupt
+
+        monkeypatch.setattr(homework, 'TELEGRAM_SENDER', 'light')
+        monkeypatch.setattr(homework, 'BotApiSender', partial(
+            type(bot), base_url=server.base_url
+        ))
+        monkeypatch.setattr(homework, 'get_api_answer', failing_answer)
+        monkeypatch.setattr(time, 'sleep', stop)
+        with pytest.raises(KeyboardInterrupt):
+            homework.main()
+        assert [d.text for d in server.deliveries] == [
+            ed.HTTP_STATUS_ERROR.format(500)
+        ]
@@ -0,0 +1,145 @@
+import asyncio
+from types import SimpleNamespace
+
+import requests
+
+import utils
+
+
+def update(update_id, chat_id, text):
+    return SimpleNamespace(
+        update_id=update_id,
+        message=SimpleNamespace(chat_id=chat_id, text=text)
+    )
+
+
+class UpdatesBot(utils.MockTelegramBot):
+    def __init__(self, batches, **kwargs):
+        super().__init__(**kwargs)
+        self.batches = list(batches)
+        self.offsets = []
+
+    def get_updates(self, offset=None, timeout=None, **kwargs):
+        self.offsets.append(offset)
+        return self.batches.pop(0) if self.batches else []
+
+
+def forbid_api(*args, **kwargs):
+    raise AssertionError('Команды не должны обращаться к API')
+
+
+class TestCommands:
+
+    def make_tenant(self):
+        import engine
+        from differ import HomeworkEvent, status_code
+        tenant = engine.Tenant('token', '111')
+        polling = engine.PollingEngine(utils.MockTelegramBot(), [tenant])
+        for status, date in (('reviewing', '2023-02-13T14:40:57Z'),
+                             ('approved', '2023-02-14T10:00:00Z')):
+            homework = {'id': 7, 'homework_name': 'hw7.zip',
+                        'status': status, 'date_updated': date}
+            polling.commit(tenant, HomeworkEvent(
+                7, homework, tenant.homeworks.get(7),
+                (status_code(status), date)
+            ))
+        return tenant, polling
+
+    def test_status_and_history(self, monkeypatch):
+        import event_descriptions as ed
+        from commands import CommandListener
+        monkeypatch.setattr(requests, 'get', forbid_api)
+        tenant, polling = self.make_tenant()
+        listener = CommandListener(None, [tenant], polling.outbound)
+        status = listener.answer(111, '/status')
+        assert status.splitlines() == [
+            ed.COMMAND_STATUS_HEADER,
+            '«hw7.zip»: Работа проверена: ревьюеру всё понравилось. Ура!',
+        ]
+        history = listener.answer(111, '/history@homework_bot')
+        assert history.splitlines()[1:] == [
+            '2023-02-13 14:40 «hw7.zip»: Работа взята на проверку ревьюером.',
+            '2023-02-14 10:00 «hw7.zip»: '
+            'Работа проверена: ревьюеру всё понравилось. Ура!',
+        ]
+        assert listener.answer(111, 'привет') == ed.COMMAND_HELP
+        assert listener.answer(999, '/status') is None
+
+    def test_reply_in_chat_language(self):
+        from commands import CommandListener
+        tenant, polling = self.make_tenant()
+        tenant.language = 'en'
+        listener = CommandListener(None, [tenant], polling.outbound)
+        assert listener.answer(111, '/status').splitlines() == [
+            'Statuses of your works:',
+            '“hw7.zip”: The work has been reviewed: '
+            'the reviewer liked everything. Hooray!',
+        ]
+        assert listener.answer(111, '/help').startswith('Commands:')
+
+    def test_empty_state(self):
+        import engine
+        import event_descriptions as ed
+        from commands import CommandListener
+        tenant = engine.Tenant('token', '111')
+        listener = CommandListener(None, [tenant], None)
+        assert listener.answer('111', '/status') == ed.COMMAND_STATUS_EMPTY
+        assert listener.answer('111', '/history') == (
+            ed.COMMAND_HISTORY_EMPTY
+        )
+
+    def test_updates_are_answered_through_outbound(self):
+        from commands import CommandListener
+        tenant, polling = self.make_tenant()
+        bot = UpdatesBot([[update(5, 111, '/status'),
+                           update(6, 999, '/status'),
+                           update(7, 111, '/history')]])
+        listener = CommandListener(bot, [tenant], polling.outbound)
+
+        async def poll():
+            await listener.poll_once()
+            await listener.poll_once()
+
+        asyncio.run(poll())
+        assert bot.offsets == [None, 8]
+        assert listener.handled == 2
+        assert polling.outbound.depth == 2
+
+    def test_unexpected_error_does_not_stop_listener(self, monkeypatch):
+        import commands
+        from commands import CommandListener
+        monkeypatch.setattr(commands, 'COMMAND_RETRY_DELAY', 0)
+        tenant, polling = self.make_tenant()
+        listener = CommandListener(UpdatesBot([]), [tenant], polling.outbound)
+        calls = []
+
+        async def broken_poll():
+            calls.append(1)
+            raise RuntimeError('boom')
+
+        listener.poll_once = broken_poll
+
+        async def run():
+            task = asyncio.ensure_future(listener.run())
+            while len(calls) < 3:
+                await asyncio.sleep(0)
+            assert not task.done()
+            task.cancel()
+
+        asyncio.run(run())
+
+    def test_restore_history(self, tmp_path):
+        import engine
+        from state_store import StateStore
+        store = StateStore(str(tmp_path / 'state.sqlite3'))
+        tenant, _ = self.make_tenant()
+        for key, name, status, date in tenant.history:
+            store.add_transition(tenant.key, key, name, status, date)
+        store.flush()
+        restored = engine.Tenant('token', '111')
+        restored.restore(*store.get(restored.key), store.history(
+            restored.key, 10
+        ))
+        assert list(restored.history) == list(tenant.history)
+        assert restored.names == {7: 'hw7.zip'}
+        store.close()
@@ -0,0 +1,68 @@
+class TestDiffer:
+    HOMEWORKS = [
+        {'id': 1, 'homework_name': 'hw1', 'status': 'reviewing',
+         'date_updated': '2023-01-01T10:00:00Z'},
+        {'id': 2, 'homework_name': 'hw2', 'status': 'approved',
+         'date_updated': '2023-01-01T11:00:00Z'},
+    ]
+
+    def test_every_changed_homework_is_an_event(self):
+        from differ import diff_homeworks, status_code
+        events = diff_homeworks({}, self.HOMEWORKS)
+        assert [event.key for event in events] == [1, 2]
+        assert events[0].old_state is None
+        assert events[1].state == (
+            status_code('approved'), '2023-01-01T11:00:00Z'
+        )
+
+    def test_known_states_are_skipped(self):
+        from differ import apply_event, diff_homeworks, status_code
+        snapshot = {}
+        for event in diff_homeworks(snapshot, self.HOMEWORKS):
+            apply_event(snapshot, event)
+        assert diff_homeworks(snapshot, self.HOMEWORKS) == []
+
+        changed = dict(self.HOMEWORKS[0], status='rejected',
+                       date_updated='2023-01-02T10:00:00Z')
+        events = diff_homeworks(snapshot, [changed, self.HOMEWORKS[1]])
+        assert len(events) == 1
+        assert events[0].old_state == (
+            status_code('reviewing'), '2023-01-01T10:00:00Z'
+        )
+        assert events[0].state == (
+            status_code('rejected'), '2023-01-02T10:00:00Z'
+        )
+
+    def test_diff_does_not_touch_snapshot(self):
+        from differ import diff_homeworks
+        snapshot = {}
+        diff_homeworks(snapshot, self.HOMEWORKS)
+        assert snapshot == {}
+
+    def test_duplicates_and_missing_id(self):
+        from differ import diff_homeworks, status_code
+        homeworks = [
+            {'homework_name': 'hw123', 'status': 'reviewing'},
+            {'homework_name': 'hw123', 'status': 'approved'},
+        ]
+        events = diff_homeworks({}, homeworks)
+        assert len(events) == 1
+        assert events[0].key == 'hw123'
+        assert events[0].state == (status_code('approved'), None)
+
+    def test_status_codes(self):
+        from differ import status_code, status_name
+        code = status_code('approved')
+        assert isinstance(code, int)
+        assert status_code('approved') == code
+        assert status_name(code) == 'approved'
+        assert status_code(None) is None
+        assert status_name(status_code(3)) == '3'
+        assert status_name('raw') == 'raw'
+
+    def test_status_codes_for_many(self):
+        from differ import status_code, status_codes
+        statuses = ['approved', 'новый', None, ['x']]
+        assert status_codes(statuses) == [
+            status_code(status) for status in statuses
+        ]
@@ -0,0 +1,247 @@
+import asyncio
+
+import pytest
+import requests
+
+import utils
+from utils import RecordingBot, mock_get
+
+
+async def poll_twice(polling, tenant):
+    polling.outbound.start()
+    await polling.poll(tenant)
+    await polling.poll(tenant)
+    await polling.outbound.drain()
+    await polling.outbound.stop()
+
+
+class TestEngine:
+
+    def test_load_tenants(self, tmp_path):
+        import engine
+        path = tmp_path / 'tenants.csv'
+        path.write_text(
+            '# token,chat_id\n'
+            'token-1,111\n'
+            '\n'
+            'broken-line\n'
+            'token-2, 222\n'
+            'token-3,333,en-US\n',
+            encoding='UTF-8'
+        )
+        tenants = engine.load_tenants(str(path))
+        assert [(t.token, t.chat_id) for t in tenants] == [
+            ('token-1', '111'), ('token-2', '222'), ('token-3', '333')
+        ]
+        assert [t.language for t in tenants] == [None, None, 'en']
+        assert tenants[0].headers == {'Authorization': 'OAuth token-1'}
+
+    def test_poll_sends_new_status_once(self, monkeypatch,
+                                        data_with_new_hw_status):
+        import engine
+        monkeypatch.setattr(requests, 'get', mock_get(data_with_new_hw_status))
+        bot = RecordingBot()
+        tenant = engine.Tenant('token', '111', from_date=1)
+        polling = engine.PollingEngine(bot, [tenant], concurrency=2)
+        asyncio.run(poll_twice(polling, tenant))
+        assert len(bot.sent) == 1
+        chat_id, text = bot.sent[0]
+        assert chat_id == '111'
+        assert text.startswith('Изменился статус проверки работы "hw123"')
+        assert tenant.payload['from_date'] == (
+            data_with_new_hw_status['current_date']
+        )
+        assert polling.polls == 2
+        assert (polling.cache.hits, polling.cache.misses) == (1, 1)
+
+    def test_poll_sends_in_chat_language(self, monkeypatch,
+                                         data_with_new_hw_status):
+        import engine
+        monkeypatch.setattr(requests, 'get', mock_get(data_with_new_hw_status))
+        bot = RecordingBot()
+        tenant = engine.Tenant('token', '111', from_date=1, language='en')
+        polling = engine.PollingEngine(bot, [tenant], concurrency=2)
+        asyncio.run(poll_twice(polling, tenant))
+        assert [text for _, text in bot.sent] == [
+            'The review status of "hw123" has changed. '
+            'The work has been reviewed: the reviewer liked everything. Hooray!'
+        ]
+
+    def test_poll_error_notifies_once(self, monkeypatch):
+        import engine
+        from resilience import RetryPolicy
+        monkeypatch.setattr(requests, 'get', mock_get({}, http_status=500))
+        bot = RecordingBot()
+        tenant = engine.Tenant('token', '111')
+        polling = engine.PollingEngine(
+            bot, [tenant], concurrency=2, retry=RetryPolicy(base_delay=0)
+        )
+        asyncio.run(poll_twice(polling, tenant))
+        assert len(bot.sent) == 1
+        assert polling.errors == 2
+
+    def test_poll_sends_through_separate_sender(self, monkeypatch,
+                                                data_with_new_hw_status):
+        import engine
+        monkeypatch.setattr(requests, 'get', mock_get(data_with_new_hw_status))
+        bot, sender = RecordingBot(), RecordingBot()
+        tenant = engine.Tenant('token', '111', from_date=1)
+        polling = engine.PollingEngine(
+            bot, [tenant], concurrency=2, sender=sender
+        )
+        asyncio.run(poll_twice(polling, tenant))
+        assert bot.sent == []
+        assert len(sender.sent) == 1
+
+    def test_poll_records_metrics(self, monkeypatch, data_with_new_hw_status):
+        import engine
+        import metrics
+        monkeypatch.setattr(requests, 'get', mock_get(data_with_new_hw_status))
+        before = metrics.REGISTRY.render()
+        tenant = engine.Tenant('token', '111', from_date=1)
+        polling = engine.PollingEngine(RecordingBot(), [tenant], concurrency=2)
+        asyncio.run(poll_twice(polling, tenant))
+        text = metrics.REGISTRY.render()
+        assert text != before
+        for stage in ('get_api_answer', 'check_response', 'parse_status',
+                      'send_message'):
+            assert f'homework_bot_stage_seconds_count{{stage="{stage}"}}' in (
+                text
+            )
+        assert 'homework_bot_http_responses_total{code="200"}' in text
+        assert 'homework_bot_queue_depth{queue="outbound"} 0' in text
+
+    def test_tenant_is_compact(self):
+        import engine
+        from differ import status_code
+        tenant = engine.Tenant('token', '111', from_date=5)
+        assert not hasattr(tenant, '__dict__')
+        assert tenant.payload == {'from_date': 5}
+        assert tenant.headers == {'Authorization': 'OAuth token'}
+        assert (tenant.history, tenant.names) == ((), None)
+        assert tenant.name_of(7) == 7
+        tenant.record(7, 'hw7.zip', status_code('approved'), None)
+        assert tenant.name_of(7) == 'hw7.zip'
+        assert list(tenant.history) == [
+            (7, 'hw7.zip', status_code('approved'), None)
+        ]
+        tenant.reset()
+        assert tenant.history == ()
+
+    def test_restored_status_is_not_sent_again(self, monkeypatch,
+                                                data_with_new_hw_status):
+        import engine
+        from differ import status_code, status_name
+        monkeypatch.setattr(requests, 'get', mock_get(data_with_new_hw_status))
+        bot = RecordingBot()
+        tenant = engine.Tenant('token', '111', from_date=1)
+        tenant.restore(500, {'hw123': (status_code('approved'), None)})
+        assert tenant.payload['from_date'] == 500
+        assert status_name(tenant.status) == 'approved'
+        polling = engine.PollingEngine(bot, [tenant], concurrency=2)
+        asyncio.run(poll_twice(polling, tenant))
+        assert bot.sent == []
+
+    def test_every_changed_homework_is_sent(self, monkeypatch):
+        import engine
+        from differ import status_code
+        data = {
+            'homeworks': [
+                {'id': 1, 'homework_name': 'hw1', 'status': 'approved'},
+                {'id': 2, 'homework_name': 'hw2', 'status': 'rejected'},
+            ],
+            'current_date': 1000198000,
+        }
+        monkeypatch.setattr(requests, 'get', mock_get(data))
+        bot = RecordingBot()
+        tenant = engine.Tenant('token', '111', from_date=1)
+        polling = engine.PollingEngine(bot, [tenant], concurrency=2)
+        polling.outbound.chat_rate = 100
+        asyncio.run(poll_twice(polling, tenant))
+        assert len(bot.sent) == 2
+        assert tenant.homeworks == {
+            1: (status_code('approved'), None),
+            2: (status_code('rejected'), None)
+        }
+
+    def test_streaming_mode(self, monkeypatch):
+        import engine
+        data = {
+            'homeworks': [
+                {'id': 1, 'homework_name': 'hw1', 'status': 'approved'},
+            ],
+            'current_date': 1000198000,
+        }
+        monkeypatch.setattr(requests, 'get', mock_get(data))
+        bot = RecordingBot()
+        tenant = engine.Tenant('token', '111', from_date=1)
+        polling = engine.PollingEngine(
+            bot, [tenant], concurrency=2, stream=True
+        )
+        asyncio.run(poll_twice(polling, tenant))
+        assert len(bot.sent) == 1
+        assert tenant.payload['from_date'] == 1000198000
+        assert polling.cache.hits == 0
+
+    @pytest.mark.parametrize('stream', [False, True])
+    def test_malformed_homework_is_rejected(self, monkeypatch, stream):
+        import engine
+        data = {
+            'homeworks': [
+                {'id': 1, 'homework_name': 'hw1', 'status': 'approved'},
+                {'id': 2, 'homework_name': 'hw2', 'status': 'lost'},
+            ],
+            'current_date': 1000198000,
+        }
+        monkeypatch.setattr(requests, 'get', mock_get(data))
+        bot = RecordingBot()
+        tenant = engine.Tenant('token', '111', from_date=1)
+        polling = engine.PollingEngine(
+            bot, [tenant], concurrency=2, stream=stream
+        )
+        asyncio.run(poll_twice(polling, tenant))
+        assert polling.errors == 2
+        assert tenant.homeworks == {}
+        assert tenant.payload['from_date'] == 1
+
+    def test_sigterm_runs_shutdown(self):
+        import os
+        import signal
+
+        import engine
+        stopped = []
+
+        class Engine:
+            async def run(self):
+                loop = asyncio.get_running_loop()
+                loop.call_later(
+                    0.05, os.kill, os.getpid(), signal.SIGTERM
+                )
+                try:
+                    await asyncio.sleep(10)
+                finally:
+                    stopped.append(True)
+
+        asyncio.run(engine.run_until_stopped(Engine()))
+        assert stopped == [True]
+
+    def test_background_loop_survives_errors(self, monkeypatch):
+        import engine
+        monkeypatch.setattr(engine, 'DIGEST_INTERVAL', 0)
+        polling = engine.PollingEngine(utils.MockTelegramBot(), [])
+        calls = []
+
+        def broken_flush():
+            calls.append(1)
+            raise RuntimeError('boom')
+
+        polling.digest.flush = broken_flush
+
+        async def run():
+            task = asyncio.ensure_future(polling.flush_digests())
+            while len(calls) < 3:
+                await asyncio.sleep(0)
+            assert not task.done()
+            task.cancel()
+
+        asyncio.run(run())
@@ -0,0 +1,64 @@
+import pytest
+
+from utils import FakeClock
+
+
+class TestErrorDigest:
+
+    def test_fingerprint_uses_message_template(self):
+        import event_descriptions as ed
+        import exceptions as ex
+        from error_digest import fingerprint
+        first = ex.HTTPStatusError(ed.HTTP_STATUS_ERROR.format(500))
+        second = ex.HTTPStatusError(ed.HTTP_STATUS_ERROR.format(503))
+        assert fingerprint(first) == fingerprint(second) == (
+            'HTTPStatusError', 'HTTP_STATUS_ERROR'
+        )
+        other = ex.UnknownStatusError(ed.UNKNOWN_STATUS_ERROR.format('x'))
+        assert fingerprint(other) == (
+            'UnknownStatusError', 'UNKNOWN_STATUS_ERROR'
+        )
+
+    def test_fingerprint_without_template(self):
+        from error_digest import fingerprint
+        assert fingerprint(ValueError('id 12 not found')) == fingerprint(
+            ValueError('id 345 not found')
+        )
+        assert fingerprint(ValueError('x')) != fingerprint(KeyError('x'))
+
+    def test_repeats_are_suppressed_and_digested(self):
+        import event_descriptions as ed
+        import exceptions as ex
+        from error_digest import ErrorDigest
+        clock = FakeClock()
+        digest = ErrorDigest(window=3600, clock=clock)
+        error = ex.HTTPStatusError(ed.HTTP_STATUS_ERROR.format(500))
+        assert digest.report(error, 1)
+        assert digest.report(error, 2)
+        for _ in range(37):
+            clock.now += 10
+            assert not digest.report(error, 1)
+        assert digest.flush() == []
+        clock.now = 3600
+        assert not digest.report(error, 1)
+        assert digest.flush() == [
+            (1, ed.ERROR_DIGEST.format('HTTPStatusError', 38, 60))
+        ]
+        assert digest.suppressed == 38
+        assert digest.report(error, 1)
+
+    def test_quiet_window_expires(self):
+        from error_digest import ErrorDigest
+        clock = FakeClock()
+        digest = ErrorDigest(window=60, clock=clock)
+        assert digest.report(ValueError('boom'))
+        clock.now = 61
+        assert digest.report(ValueError('boom'))
+        assert digest.flush() == []
+
+
+@pytest.mark.parametrize('name', ['HTTP_STATUS_ERROR', 'JSON_DECODE_ERROR'])
+def test_template_matches_itself(name):
+    import event_descriptions as ed
+    from error_digest import template_of
+    assert template_of(getattr(ed, name).format('x')) == name
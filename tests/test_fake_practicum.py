@@ -0,0 +1,98 @@
+import time
+
+import pytest
+
+
+@pytest.fixture
+def fake_api(monkeypatch):
+    import homework as hw
+    from fake_practicum import Faults, FakePracticumServer
+    servers = []
+
+    def start(**faults):
+        server = FakePracticumServer(faults=Faults(seed=1, **faults))
+        monkeypatch.setattr(hw, 'ENDPOINT', server.start())
+        servers.append(server)
+        return server
+
+    yield start
+    for server in servers:
+        server.shutdown()
+        server.server_close()
+
+
+def headers(token='token-1'):
+    return {'Authorization': f'OAuth {token}'}
+
+
+class TestFakePracticum:
+
+    def test_history_passes_checks(self, fake_api):
+        import homework as hw
+        fake_api()
+        response = hw.request_api(headers(), {'from_date': 0})
+        homeworks = hw.check_response(response)
+        assert len(homeworks) == 3
+        for homework in homeworks:
+            assert hw.parse_status(homework).startswith('Изменился статус')
+        assert response['current_date'] == pytest.approx(time.time(), abs=5)
+
+    def test_from_date_and_tokens(self, fake_api):
+        import homework as hw
+        fake_api()
+        future = {'from_date': int(time.time()) + 1}
+        assert hw.request_api(headers(), future)['homeworks'] == []
+        first = hw.request_api(headers('token-1'), {'from_date': 0})
+        again = hw.request_api(headers('token-1'), {'from_date': 0})
+        other = hw.request_api(headers('token-2'), {'from_date': 0})
+        assert first['homeworks'] == again['homeworks']
+        assert first['homeworks'] != other['homeworks']
+
+    def test_unauthorized(self, fake_api):
+        import exceptions as ex
+        import homework as hw
+        fake_api()
+        with pytest.raises(ex.HTTPStatusError, match='401'):
+            hw.request_api({}, {'from_date': 0})
+
+    def test_error_status(self, fake_api):
+        import exceptions as ex
+        import homework as hw
+        server = fake_api(error_rate=1, error_codes=[503])
+        with pytest.raises(ex.HTTPStatusError, match='503'):
+            hw.request_api(headers(), {'from_date': 0})
+        assert server.stats == {'error': 1}
+
+    def test_malformed_json(self, fake_api):
+        import exceptions as ex
+        import homework as hw
+        fake_api(malformed_rate=1)
+        response = hw.request_api(headers(), {'from_date': 0})
+        with pytest.raises(ex.ResponseFormatError):
+            hw.check_response(response)
+
+    def test_missing_key(self, fake_api):
+        import exceptions as ex
+        import homework as hw
+        fake_api(missing_key_rate=1)
+        response = hw.request_api(headers(), {'from_date': 0})
+        with pytest.raises(ex.MissingKeyError):
+            hw.check_response(response)
+
+    def test_unknown_status(self, fake_api):
+        import exceptions as ex
+        import homework as hw
+        fake_api(unknown_status_rate=1)
+        future = {'from_date': int(time.time()) + 1}
+        response = hw.request_api(headers(), future)
+        with pytest.raises(ex.UnknownStatusError):
+            hw.check_response(response)
+        with pytest.raises(ex.UnknownStatusError):
+            hw.parse_status(response['homeworks'][0])
+
+    def test_latency(self):
+        from fake_practicum import Faults
+        faults = Faults(latency=0.1, distribution='uniform', seed=1)
+        delays = [faults.delay() for _ in range(100)]
+        assert all(0 <= delay <= 0.2 for delay in delays)
+        assert Faults(latency=0.1).delay() == 0.1
@@ -0,0 +1,79 @@
+import asyncio
+
+import pytest
+import telegram
+
+
+@pytest.fixture
+def fake_telegram():
+    from fake_telegram import FakeTelegramServer
+    servers = []
+
+    def start(**kwargs):
+        server = FakeTelegramServer(seed=1, **kwargs)
+        server.start()
+        servers.append(server)
+        return server, telegram.Bot(token='1234:abcdefg',
+                                    base_url=server.base_url)
+
+    yield start
+    for server in servers:
+        server.shutdown()
+        server.server_close()
+
+
+class TestFakeTelegram:
+
+    def test_send_message(self, fake_telegram):
+        server, bot = fake_telegram()
+        message = bot.send_message(111, 'Привет')
+        assert message.text == 'Привет'
+        assert message.chat.id == 111
+        assert [(d.chat_id, d.text) for d in server.deliveries] == [
+            (111, 'Привет')
+        ]
+        assert server.stats == {'ok': 1}
+
+    def test_chat_rate_limit(self, fake_telegram):
+        server, bot = fake_telegram(chat_rate=1)
+        bot.send_message(111, 'первое')
+        with pytest.raises(telegram.error.RetryAfter) as error:
+            bot.send_message(111, 'второе')
+        assert error.value.retry_after == 1
+        bot.send_message(222, 'другой чат')
+        assert server.stats == {'ok': 2, 'retry_after': 1}
+
+    def test_global_rate_limit(self, fake_telegram):
+        server, bot = fake_telegram(global_rate=3, chat_rate=100)
+        for chat_id in range(3):
+            bot.send_message(chat_id, 'текст')
+        with pytest.raises(telegram.error.RetryAfter):
+            bot.send_message(99, 'текст')
+        assert len(server.deliveries) == 3
+
+    def test_injected_errors(self, fake_telegram):
+        server, bot = fake_telegram(error_rate=1, error_codes=[500])
+        with pytest.raises(telegram.error.NetworkError):
+            bot.send_message(111, 'текст')
+        with pytest.raises(telegram.error.BadRequest):
+            bot.send_message(111, '')
+        assert server.deliveries == []
+
+    def test_outbound_queue_delivers(self, fake_telegram):
+        from outbound import OutboundQueue
+        server, bot = fake_telegram(global_rate=1000, chat_rate=1000)
+
+        async def send():
+            queue = OutboundQueue(bot, workers=4, global_rate=1000,
+                                  chat_rate=1000)
+            queue.start()
+            for index in range(20):
+                queue.put(index % 5, f'сообщение {index}')
+            await queue.drain()
+            await queue.stop()
+            return queue
+
+        queue = asyncio.run(send())
+        assert queue.sent == 20
+        assert len(server.deliveries) == 20
+        assert server.throughput() > 0
@@ -0,0 +1,54 @@
+import json
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+import requests
+
+
+class KeepAliveHandler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+    disable_nagle_algorithm = True
+
+    def do_GET(self):
+        body = json.dumps({'homeworks': [], 'current_date': 1}).encode()
+        self.send_response(200)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def local_server():
+    server = ThreadingHTTPServer(('127.0.0.1', 0), KeepAliveHandler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield f'http://127.0.0.1:{server.server_address[1]}/'
+    server.shutdown()
+    server.server_close()
+
+
+class TestHttpPool:
+
+    def test_client_without_pool_is_requests(self):
+        import http_pool
+        http_pool.close()
+        assert http_pool.client() is requests
+
+    def test_pool_reuses_connection(self, local_server):
+        import http_pool
+        http_pool.STATS.reset()
+        session = http_pool.install(pool_maxsize=2)
+        try:
+            assert http_pool.client() is session
+            for _ in range(5):
+                assert session.get(local_server).status_code == 200
+            assert http_pool.STATS.requests == 5
+            assert http_pool.STATS.new_connections == 1
+            assert http_pool.STATS.reused == 4
+        finally:
+            http_pool.close()
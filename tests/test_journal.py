@@ -0,0 +1,154 @@
+import asyncio
+
+import requests
+
+from utils import FakeClock, RecordingBot, mock_get
+
+
+class TestJournal:
+
+    def test_encode_decode(self):
+        from journal import OBSERVED, Transition, decode, encode
+        transition = Transition(
+            OBSERVED, '111:abc', 2 ** 40, 'Проект «Бот».zip', None,
+            'approved', 1676300000.5, 0.0
+        )
+        record = encode(transition)
+        assert decode(record[8:]) == transition
+        named = transition._replace(homework='hw.zip', old_status='x' * 70000)
+        assert decode(encode(named)[8:]) == named
+
+    def test_replay_restores_latest_and_unsent(self, tmp_path):
+        from journal import Journal
+        path = str(tmp_path / 'journal.bin')
+        journal = Journal(path, clock=FakeClock(1000.0, step=1))
+        first = journal.observe('t1', 1, 'hw1', None, 'reviewing')
+        journal.mark_sent(first)
+        journal.observe('t1', 1, 'hw1', 'reviewing', 'approved')
+        journal.mark_sent(journal.observe('t2', 'hw.zip', None, None,
+                                          'rejected'))
+        assert journal.flush() == 5
+        journal.close()
+
+        replayed = Journal(path)
+        assert replayed.replay() == 5
+        assert replayed.latest == journal.latest
+        unsent = replayed.unsent()
+        assert [(t.tenant, t.homework, t.old_status, t.status)
+                for t in unsent] == [('t1', 1, 'reviewing', 'approved')]
+        replayed.close()
+
+    def test_torn_tail_is_cut(self, tmp_path):
+        from journal import Journal, encode
+        path = tmp_path / 'journal.bin'
+        journal = Journal(str(path), clock=FakeClock(1000.0, step=1))
+        first = journal.observe('t1', 1, 'hw1', None, 'reviewing')
+        journal.observe('t1', 2, 'hw2', None, 'approved')
+        journal.close()
+        data = path.read_bytes()
+        # Сбой посреди записи второго изменения.
+        path.write_bytes(data[:-5])
+
+        replayed = Journal(str(path), clock=FakeClock(1000.0, step=1))
+        assert replayed.replay() == 1
+        assert path.stat().st_size == len(encode(first))
+        replayed.observe('t1', 3, 'hw3', None, 'rejected')
+        replayed.close()
+        again = Journal(str(path))
+        assert again.replay() == 2
+        assert sorted(key for _, key in again.latest) == [1, 3]
+        again.close()
+
+    def test_compaction_keeps_latest_and_backup(self, tmp_path):
+        from journal import Journal
+        path = tmp_path / 'journal.bin'
+        journal = Journal(
+            str(path), max_bytes=2000, clock=FakeClock(1000.0, step=1)
+        )
+        journal.replay()
+        for step in range(100):
+            transition = journal.observe(
+                't1', step % 3, f'hw{step % 3}', 'reviewing', 'approved'
+            )
+            journal.mark_sent(transition)
+            journal.flush()
+        assert journal.compactions
+        assert path.stat().st_size <= 2000
+        assert (tmp_path / 'journal.bin.1').exists()
+        journal.close()
+        replayed = Journal(str(path))
+        replayed.replay()
+        assert replayed.latest == journal.latest
+        assert replayed.unsent() == []
+        replayed.close()
+
+    def test_large_live_set_is_not_compacted_on_every_flush(self,
+                                                            tmp_path):
+        from journal import Journal
+        path = tmp_path / 'journal.bin'
+        journal = Journal(
+            str(path), max_bytes=2000, clock=FakeClock(1000.0, step=1)
+        )
+        journal.replay()
+        for homework in range(100):
+            journal.observe('t1', homework, f'hw{homework}', None, 'approved')
+        journal.flush()
+        assert journal.compactions == 1
+        compacted = path.stat().st_size
+        assert compacted > 2000
+        for _ in range(6):
+            journal.flush()
+        assert journal.compactions == 1
+        # Новые записи: сжатие снова только когда файл вырос вдвое.
+        flushes = 0
+        while journal.compactions == 1:
+            size = journal.size
+            journal.observe('t1', flushes % 100, 'hw', None, 'rejected')
+            journal.flush()
+            flushes += 1
+        assert size <= 2 * compacted < size + 100
+        journal.close()
+
+    def test_engine_journals_and_resends(self, monkeypatch, tmp_path,
+                                         data_with_new_hw_status):
+        import engine
+        from journal import Journal
+        monkeypatch.setattr(requests, 'get', mock_get(data_with_new_hw_status))
+        path = str(tmp_path / 'journal.bin')
+        journal = Journal(path)
+        tenant = engine.Tenant('token', '111', from_date=1)
+        polling = engine.PollingEngine(
+            RecordingBot(), [tenant], journal=journal
+        )
+
+        async def poll_without_sending():
+            await polling.poll(tenant)
+
+        # Уведомление поставлено в очередь, но процесс упал до отправки.
+        asyncio.run(poll_without_sending())
+        journal.close()
+        (transition,) = journal.unsent()
+        assert (transition.tenant, transition.status) == (
+            tenant.key, 'approved'
+        )
+
+        bot = RecordingBot()
+        journal = Journal(path)
+        restarted = engine.PollingEngine(
+            bot, [engine.Tenant('token', '111')], journal=journal
+        )
+
+        async def restart():
+            restarted.resend_unsent()
+            restarted.outbound.start()
+            await restarted.outbound.drain()
+            await restarted.outbound.stop()
+
+        asyncio.run(restart())
+        assert [text for _, text in bot.sent] == [
+            'Изменился статус проверки работы "hw123". '
+            'Работа проверена: ревьюеру всё понравилось. Ура!'
+        ]
+        assert journal.unsent() == []
+        journal.close()
+        assert Journal(path).replay() == 2
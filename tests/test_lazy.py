@@ -0,0 +1,35 @@
+import os
+import subprocess
+import sys
+
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+class TestLazyImport:
+
+    def test_loaded_module_is_returned(self):
+        import json
+
+        from lazy import lazy_import
+        assert lazy_import('json') is json
+
+    def test_module_loads_on_first_use(self):
+        from lazy import lazy_import
+        name = 'xml.dom.minidom'
+        sys.modules.pop(name, None)
+        module = lazy_import(name)
+        assert sys.modules[name] is module
+        assert module.parseString('<a/>').documentElement.tagName == 'a'
+
+    def test_homework_defers_heavy_imports(self, tmp_path):
+        code = (
+            'import sys, homework; '
+            'print(sorted(name for name in ("telegram.bot", '
+            '"requests.sessions") if name in sys.modules))'
+        )
+        result = subprocess.run(
+            [sys.executable, '-c', code], cwd=tmp_path,
+            env=dict(os.environ, PYTHONPATH=BASE_DIR),
+            capture_output=True, text=True, timeout=10
+        )
+        assert result.stdout.strip() == '[]', result.stderr
@@ -0,0 +1,62 @@
+import gzip
+import logging
+
+
+class TestLogQueue:
+
+    def test_records_are_written_by_listener(self, tmp_path):
+        import log_queue
+        path = tmp_path / 'bot.log'
+        logger = logging.getLogger('test_log_queue.listener')
+        logger.propagate = False
+        listener = log_queue.setup_logging(
+            filename=str(path), logger=logger, fmt='%(message)s'
+        )
+        try:
+            assert log_queue.setup_logging(logger=logger) is listener
+            logger.debug('запись из опроса')
+        finally:
+            log_queue.stop_logging(logger)
+        assert path.read_text(encoding='UTF-8') == 'запись из опроса\n'
+        assert logger.handlers == []
+
+    def test_worker_writes_own_file(self):
+        from log_queue import worker_log_file
+        assert worker_log_file('main.log', {}) == 'main.log'
+        assert worker_log_file('main.log', {'WORKER_ID': 'host:1'}) == (
+            'main.log'
+        )
+        assert worker_log_file(
+            'main.log', {'SHARDING': '1', 'WORKER_ID': 'host:1'}
+        ) == 'main.log.host-1'
+
+    def test_rotation_by_size_is_compressed(self, tmp_path):
+        import log_queue
+        path = tmp_path / 'bot.log'
+        handler = log_queue.AgeRotatingFileHandler(
+            str(path), max_bytes=100, max_age=0, backup_count=2,
+            compress=True
+        )
+        handler.setFormatter(logging.Formatter('%(message)s'))
+        for index in range(10):
+            handler.handle(logging.makeLogRecord({'msg': f'{index:040}'}))
+        handler.close()
+        backups = sorted(p.name for p in tmp_path.iterdir())
+        assert backups == ['bot.log', 'bot.log.1.gz', 'bot.log.2.gz']
+        with gzip.open(tmp_path / 'bot.log.1.gz', 'rt') as file:
+            assert file.read().endswith('7\n')
+
+    def test_rotation_by_age(self, tmp_path, monkeypatch):
+        import log_queue
+        path = tmp_path / 'bot.log'
+        handler = log_queue.AgeRotatingFileHandler(
+            str(path), max_bytes=0, max_age=60, compress=False
+        )
+        record = logging.makeLogRecord({'msg': 'старое'})
+        handler.handle(record)
+        now = handler.opened_at
+        monkeypatch.setattr(log_queue.time, 'time', lambda: now + 61)
+        handler.handle(logging.makeLogRecord({'msg': 'новое'}))
+        handler.close()
+        assert (tmp_path / 'bot.log.1').read_text() == 'старое\n'
+        assert path.read_text() == 'новое\n'
@@ -0,0 +1,74 @@
+class TestMessages:
+
+    def test_status_message_matches_parse_status_format(self):
+        import homework
+        import messages
+        for status, verdict in homework.HOMEWORK_VERDICTS.items():
+            assert messages.status_message('hw.zip', status) == (
+                f'Изменился статус проверки работы "hw.zip". {verdict}'
+            )
+
+    def test_verdict_is_rendered_once_per_status_and_language(self):
+        import messages
+        messages.status_fragments.cache_clear()
+        messages.STATUS_FRAGMENTS.clear()
+        for chat in range(1000):
+            messages.status_message(f'hw{chat}.zip', 'approved', 'en')
+            messages.status_message(f'hw{chat}.zip', 'approved')
+        info = messages.status_fragments.cache_info()
+        assert (info.misses, info.hits) == (2, 0)
+        assert set(messages.STATUS_FRAGMENTS) == {
+            ('approved', 'en'), ('approved', None)
+        }
+        assert messages.status_message('hw.zip', 'approved', 'en') == (
+            'The review status of "hw.zip" has changed. The work has been '
+            'reviewed: the reviewer liked everything. Hooray!'
+        )
+
+    def test_language_of(self):
+        import messages
+        assert messages.language_of('en') == 'en'
+        assert messages.language_of(' EN_us ') == 'en'
+        assert messages.language_of('de') == messages.DEFAULT_LANGUAGE
+        assert messages.language_of(None) == messages.DEFAULT_LANGUAGE
+
+    def test_fill_keeps_values_as_is(self):
+        import messages
+        fragments = messages.compile_template(
+            '{} «{}»: {}', messages.SLOT, messages.SLOT, 'готово'
+        )
+        assert fragments == ('', ' «', '»: готово')
+        assert messages.fill(fragments, 1, '{name}') == '1 «{name}»: готово'
+        assert messages.render('help', 'ru') == messages.text('help')
+
+    def test_missing_translation_falls_back_to_source(self, monkeypatch):
+        import messages
+        monkeypatch.setitem(messages.CATALOGS, 'uk', {'verdicts': {}})
+        messages.language_of.cache_clear()
+        try:
+            assert messages.text('help', 'uk') == messages.text('help', 'ru')
+            assert messages.verdict('approved', 'uk') == (
+                messages.verdict('approved', 'ru')
+            )
+            assert messages.verdict('unknown', 'uk') == 'unknown'
+        finally:
+            messages.language_of.cache_clear()
+
+    def test_render_status_checks_uncached_homeworks(self):
+        import pytest
+
+        import exceptions as ex
+        import homework
+        import messages
+        messages.STATUS_FRAGMENTS.clear()
+        good = {'homework_name': 'hw.zip', 'status': 'approved'}
+        assert homework.render_status(good, 'en') == (
+            messages.status_message('hw.zip', 'approved', 'en')
+        )
+        with pytest.raises(ex.MissingKeyError):
+            homework.render_status({'status': 'approved'}, 'en')
+        with pytest.raises(ex.UnknownStatusError):
+            homework.render_status({'homework_name': 'hw.zip',
+                                    'status': 'lost'}, 'en')
+        with pytest.raises(ex.ResponseFormatError):
+            homework.render_status(('hw.zip', 'approved'), 'en')
@@ -0,0 +1,67 @@
+import urllib.request
+
+
+class TestMetrics:
+
+    def make_registry(self):
+        from metrics import Registry
+        return Registry()
+
+    def test_counter_labels(self):
+        from metrics import Counter
+        registry = self.make_registry()
+        counter = Counter('requests_total', 'Запросы.', ('code',), registry)
+        counter.inc('200')
+        counter.inc('200')
+        counter.inc('500', amount=3)
+        text = registry.render()
+        assert '# TYPE requests_total counter' in text
+        assert 'requests_total{code="200"} 2' in text
+        assert 'requests_total{code="500"} 3' in text
+
+    def test_histogram_buckets_are_cumulative(self):
+        from metrics import Histogram
+        registry = self.make_registry()
+        histogram = Histogram(
+            'latency_seconds', 'Задержка.', registry=registry,
+            buckets=(0.1, 1)
+        )
+        for value in (0.05, 0.5, 0.5, 5):
+            histogram.observe(value)
+        text = registry.render()
+        assert 'latency_seconds_bucket{le="0.1"} 1' in text
+        assert 'latency_seconds_bucket{le="1"} 3' in text
+        assert 'latency_seconds_bucket{le="+Inf"} 4' in text
+        assert 'latency_seconds_sum 6.05' in text
+        assert 'latency_seconds_count 4' in text
+
+    def test_histogram_time(self):
+        from metrics import Histogram
+        registry = self.make_registry()
+        histogram = Histogram('stage', 'Стадия.', ('stage',), registry)
+        with histogram.time('fetch'):
+            pass
+        assert 'stage_count{stage="fetch"} 1' in registry.render()
+
+    def test_gauge_function_and_escaping(self):
+        from metrics import Gauge
+        registry = self.make_registry()
+        gauge = Gauge('depth', 'Очередь.', ('queue',), registry)
+        items = [1, 2]
+        gauge.set_function(lambda: len(items), 'out"bound')
+        items.append(3)
+        assert 'depth{queue="out\\"bound"} 3' in registry.render()
+
+    def test_endpoint(self):
+        import metrics
+        metrics.HTTP_RESPONSES.inc('200')
+        server = metrics.serve(port=0)
+        try:
+            port = server.server_address[1]
+            url = f'http://127.0.0.1:{port}/metrics'
+            with urllib.request.urlopen(url, timeout=1) as response:
+                text = response.read().decode()
+            assert 'homework_bot_http_responses_total{code="200"}' in text
+        finally:
+            server.shutdown()
+            server.server_close()
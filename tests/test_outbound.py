@@ -0,0 +1,91 @@
+import asyncio
+
+import telegram
+
+import utils
+
+
+class FlakyBot(utils.MockTelegramBot):
+    def __init__(self, failures, **kwargs):
+        super().__init__(**kwargs)
+        self.failures = list(failures)
+        self.sent = []
+
+    def send_message(self, chat_id=None, text=None, **kwargs):
+        if self.failures:
+            raise self.failures.pop(0)
+        self.sent.append((chat_id, text))
+
+
+async def send_all(queue, messages):
+    queue.start()
+    for chat_id, text in messages:
+        queue.put(chat_id, text)
+    await queue.drain()
+    await queue.stop()
+
+
+class TestOutbound:
+
+    def test_token_bucket_reserves_future_slots(self):
+        from outbound import TokenBucket
+        bucket = TokenBucket(rate=2, capacity=2, now=0.0)
+        assert bucket.reserve(0.0) == 0
+        assert bucket.reserve(0.0) == 0
+        assert bucket.reserve(0.0) == 0.5
+        assert bucket.reserve(0.0) == 1.0
+        assert not bucket.is_full(1.0)
+        assert bucket.is_full(10.0)
+
+    def test_messages_are_sent_in_chat_order(self):
+        from outbound import OutboundQueue
+        bot = FlakyBot([])
+        queue = OutboundQueue(bot, workers=4, global_rate=1000,
+                              chat_rate=100)
+        messages = [(chat, f'{chat}-{n}') for n in range(3) for chat in 'ab']
+        asyncio.run(send_all(queue, messages))
+        assert queue.sent == 6
+        for chat in 'ab':
+            assert [text for chat_id, text in bot.sent if chat_id == chat] == [
+                f'{chat}-{n}' for n in range(3)
+            ]
+
+    def test_retry_after_pauses_and_resends(self):
+        from outbound import OutboundQueue
+        bot = FlakyBot([telegram.error.RetryAfter(0.05)])
+        queue = OutboundQueue(bot, workers=2, global_rate=1000,
+                              chat_rate=100)
+        asyncio.run(send_all(queue, [('a', 'hello')]))
+        assert bot.sent == [('a', 'hello')]
+        assert (queue.sent, queue.retried, queue.failed) == (1, 1, 0)
+
+    def test_bot_api_errors_are_retried_like_telegram_errors(self):
+        import exceptions as ex
+        from outbound import OutboundQueue
+        bot = FlakyBot([
+            ex.BotAPIError('429', retry_after=0.05, error_code=429),
+            ex.BotAPIError('нет соединения'),
+            ex.BotAPIError('502', error_code=502),
+        ])
+        queue = OutboundQueue(bot, workers=2, global_rate=1000,
+                              chat_rate=100)
+        asyncio.run(send_all(queue, [('a', 'hello')]))
+        assert bot.sent == [('a', 'hello')]
+        assert (queue.sent, queue.retried, queue.failed) == (1, 3, 0)
+
+    def test_bot_api_client_error_is_not_retried(self):
+        import exceptions as ex
+        from outbound import OutboundQueue
+        bot = FlakyBot([ex.BotAPIError('400', error_code=400)])
+        queue = OutboundQueue(bot, workers=2, global_rate=1000)
+        asyncio.run(send_all(queue, [('a', 'hello'), ('b', 'world')]))
+        assert bot.sent == [('b', 'world')]
+        assert (queue.sent, queue.failed, queue.depth) == (1, 1, 0)
+
+    def test_telegram_error_is_not_retried(self):
+        from outbound import OutboundQueue
+        bot = FlakyBot([telegram.error.BadRequest('Chat not found')])
+        queue = OutboundQueue(bot, workers=2, global_rate=1000)
+        asyncio.run(send_all(queue, [('a', 'hello')]))
+        assert bot.sent == []
+        assert (queue.sent, queue.failed, queue.depth) == (0, 1, 0)
@@ -0,0 +1,164 @@
+import asyncio
+
+import pytest
+import requests
+
+import utils
+
+
+class TestCircuitBreaker:
+
+    def make_breaker(self, **kwargs):
+        from resilience import CircuitBreaker
+        clock = utils.FakeClock()
+        return CircuitBreaker(clock=clock, **kwargs), clock
+
+    def test_opens_after_consecutive_failures(self):
+        breaker, _ = self.make_breaker(failures=3, reset_timeout=10)
+        for _ in range(2):
+            assert breaker.allow()
+            breaker.failure()
+        assert breaker.allow()
+        breaker.success()
+        for _ in range(3):
+            assert breaker.allow()
+            breaker.failure()
+        assert breaker.state == 'open'
+        assert not breaker.allow()
+        assert (breaker.opened, breaker.rejected) == (1, 1)
+
+    def test_half_open_probe(self):
+        breaker, clock = self.make_breaker(failures=1, reset_timeout=10)
+        breaker.allow()
+        breaker.failure()
+        clock.now = 10
+        assert breaker.allow()
+        assert breaker.state == 'half_open'
+        assert not breaker.allow()
+        breaker.failure()
+        assert breaker.state == 'open'
+        clock.now = 20
+        assert breaker.allow()
+        breaker.success()
+        assert breaker.state == 'closed'
+        assert breaker.state_code == 0
+
+    def test_retry_delay_is_bounded(self):
+        from resilience import RetryPolicy
+        policy = RetryPolicy(base_delay=1, max_delay=4)
+        for retry, bound in ((1, 1), (2, 2), (3, 4), (10, 4)):
+            assert all(
+                0 <= policy.delay(retry) <= bound for _ in range(100)
+            )
+
+
+def sequence_get(responses):
+    calls = []
+
+    def mocked(*args, **kwargs):
+        calls.append(kwargs)
+        response = responses[min(len(calls), len(responses)) - 1]
+        if isinstance(response, Exception):
+            raise response
+        return utils.MockResponseGET(http_status=response,
+                                     random_timestamp=1000198000)
+    return mocked, calls
+
+
+def poll(polling, tenant):
+    async def run():
+        await polling.poll(tenant)
+        await polling.outbound.stop()
+    asyncio.run(run())
+
+
+class TestEngineRetries:
+
+    def make_engine(self, **kwargs):
+        import engine
+        from resilience import CircuitBreaker, RetryPolicy
+        tenant = engine.Tenant('token', '111', from_date=1)
+        polling = engine.PollingEngine(
+            utils.MockTelegramBot(), [tenant], concurrency=2,
+            retry=RetryPolicy(base_delay=0),
+            breaker=CircuitBreaker(**kwargs)
+        )
+        return polling, tenant
+
+    def test_transient_error_is_retried(self, monkeypatch):
+        mocked, calls = sequence_get([503, 502, 200])
+        monkeypatch.setattr(requests, 'get', mocked)
+        polling, tenant = self.make_engine()
+        poll(polling, tenant)
+        assert len(calls) == 3
+        assert polling.retries == 2
+        assert polling.errors == 0
+        assert tenant.payload['from_date'] == 1000198000
+
+    def test_client_error_is_not_retried(self, monkeypatch):
+        mocked, calls = sequence_get([401])
+        monkeypatch.setattr(requests, 'get', mocked)
+        polling, tenant = self.make_engine()
+        poll(polling, tenant)
+        assert len(calls) == 1
+        assert polling.errors == 1
+
+    def test_request_exception(self, monkeypatch):
+        mocked, calls = sequence_get([requests.ConnectionError('down')])
+        monkeypatch.setattr(requests, 'get', mocked)
+        polling, tenant = self.make_engine()
+        poll(polling, tenant)
+        assert len(calls) == 3
+        assert polling.errors == 1
+        assert polling.outbound.depth == 1
+
+    def test_open_breaker_stops_requests(self, monkeypatch):
+        mocked, calls = sequence_get([500])
+        monkeypatch.setattr(requests, 'get', mocked)
+        polling, tenant = self.make_engine(failures=3, reset_timeout=60)
+        poll(polling, tenant)
+        assert polling.breaker.state == 'open'
+        poll(polling, tenant)
+        assert len(calls) == 3
+        assert polling.breaker.rejected == 1
+        assert polling.errors == 1
+
+    def test_unexpected_probe_error_reopens_breaker(self, monkeypatch):
+        mocked, calls = sequence_get([500, RuntimeError('boom'), 200])
+        monkeypatch.setattr(requests, 'get', mocked)
+        polling, tenant = self.make_engine(failures=1, reset_timeout=0)
+        # 500 размыкает предохранитель, пробный повтор падает.
+        poll(polling, tenant)
+        assert polling.breaker.state == 'open'
+        assert polling.breaker.in_probe == 0
+        poll(polling, tenant)
+        assert len(calls) == 3
+        assert polling.breaker.state == 'closed'
+
+
+class TestFetchApi:
+
+    def test_request_exception_is_wrapped(self, monkeypatch):
+        import exceptions as ex
+        import homework as hw
+
+        def mocked(*args, **kwargs):
+            raise requests.ConnectionError('down')
+
+        monkeypatch.setattr(requests, 'get', mocked)
+        with pytest.raises(ex.APIRequestError, match='down'):
+            hw.fetch_api(hw.HEADERS, {'from_date': 0})
+
+    def test_timeout_is_passed_and_wrapped(self, monkeypatch):
+        import exceptions as ex
+        import homework as hw
+        calls = []
+
+        def mocked(*args, **kwargs):
+            calls.append(kwargs)
+            raise requests.Timeout('read timed out')
+
+        monkeypatch.setattr(requests, 'get', mocked)
+        with pytest.raises(ex.APIRequestError, match='timed out'):
+            hw.fetch_api(hw.HEADERS, {'from_date': 0})
+        assert calls[0]['timeout'] == hw.API_TIMEOUT
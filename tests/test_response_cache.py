@@ -0,0 +1,52 @@
+from http import HTTPStatus
+
+import utils
+
+
+def make_response(data, http_status=HTTPStatus.OK, headers=None):
+    response = utils.MockResponseGET(http_status=http_status, data=data)
+    response.headers = headers or {}
+    return response
+
+
+class TestResponseCache:
+
+    def test_current_date_is_ignored(self):
+        from response_cache import ResponseCache
+        cache = ResponseCache()
+        first = make_response({'homeworks': [], 'current_date': 1})
+        second = make_response({'homeworks': [], 'current_date': 2})
+        assert not cache.is_unchanged('token', first)
+        cache.remember('token', first)
+        assert cache.is_unchanged('token', second)
+        assert (cache.hits, cache.misses) == (1, 1)
+        assert cache.hit_rate == 0.5
+
+    def test_changed_body_is_a_miss(self, data_with_new_hw_status):
+        from response_cache import ResponseCache
+        cache = ResponseCache()
+        cache.remember('token', make_response({'homeworks': []}))
+        assert not cache.is_unchanged(
+            'token', make_response(data_with_new_hw_status)
+        )
+        assert not cache.is_unchanged('other', make_response({}))
+
+    def test_conditional_headers_and_not_modified(self):
+        from response_cache import ResponseCache
+        cache = ResponseCache()
+        headers = {'Authorization': 'OAuth token'}
+        assert cache.conditional_headers('token', headers) is headers
+        cache.remember('token', make_response(
+            {'homeworks': []},
+            headers={'ETag': '"v1"', 'Last-Modified': 'Mon'}
+        ))
+        assert cache.conditional_headers('token', headers) == {
+            'Authorization': 'OAuth token',
+            'If-None-Match': '"v1"',
+            'If-Modified-Since': 'Mon',
+        }
+        assert 'If-None-Match' not in headers
+        assert cache.is_unchanged(
+            'token', make_response({}, http_status=HTTPStatus.NOT_MODIFIED)
+        )
+        assert cache.not_modified == 1
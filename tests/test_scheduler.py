@@ -0,0 +1,52 @@
+import random
+
+from homework import RETRY_PERIOD
+
+
+class TestScheduler:
+
+    def make_scheduler(self, **kwargs):
+        from scheduler import AdaptiveScheduler
+        return AdaptiveScheduler(jitter=0, **kwargs)
+
+    def test_reviewing_is_polled_more_often(self):
+        scheduler = self.make_scheduler()
+        assert scheduler.next_delay('reviewing', 0) < RETRY_PERIOD
+        assert scheduler.next_delay('reviewing', 50) <= RETRY_PERIOD
+
+    def test_idle_backoff_is_bounded(self):
+        from scheduler import MAX_POLL_PERIOD
+        scheduler = self.make_scheduler(min_period=60, max_period=3600)
+        delays = [scheduler.next_delay(None, idle) for idle in range(20)]
+        assert delays == sorted(delays)
+        assert delays[0] == RETRY_PERIOD
+        assert delays[-1] == MAX_POLL_PERIOD
+
+    def test_bounds_override_status_periods(self):
+        scheduler = self.make_scheduler(min_period=300, max_period=900)
+        assert scheduler.next_delay('reviewing', 0) == 300
+        assert scheduler.next_delay('approved', 10) == 900
+
+    def test_calls_saved(self):
+        scheduler = self.make_scheduler()
+        for _ in range(3):
+            scheduler.next_delay('approved', 10)
+        assert scheduler.polls == 3
+        assert scheduler.calls_saved == (
+            3 * scheduler.max_period / RETRY_PERIOD - 3
+        )
+
+    def test_jitter_stays_in_bounds(self):
+        from scheduler import AdaptiveScheduler
+        random.seed(1)
+        scheduler = AdaptiveScheduler(min_period=60, max_period=3600)
+        for idle in range(30):
+            assert 60 <= scheduler.next_delay('rejected', idle) <= 3600
+
+    def test_reviewing_never_slower_than_fixed_polling(self):
+        from scheduler import AdaptiveScheduler
+        random.seed(2)
+        scheduler = AdaptiveScheduler(jitter=0.5)
+        assert max(
+            scheduler.next_delay('reviewing', idle) for idle in range(30)
+        ) <= RETRY_PERIOD
@@ -0,0 +1,167 @@
+from utils import FakeClock
+
+KEYS = [f'{chat_id}:digest' for chat_id in range(300)]
+
+
+class TestHashRing:
+
+    def test_new_node_takes_only_its_share(self):
+        from sharding import HashRing
+        before = HashRing(['w1', 'w2', 'w3'])
+        after = HashRing(['w1', 'w2', 'w3', 'w4'])
+        moved = [
+            key for key in KEYS if before.owner(key) != after.owner(key)
+        ]
+        assert all(after.owner(key) == 'w4' for key in moved)
+        assert 0.15 < len(moved) / len(KEYS) < 0.35
+
+    def test_empty_ring(self):
+        from sharding import HashRing
+        assert HashRing([]).owner('key') is None
+
+
+class TestLeaseManager:
+
+    def make(self, tmp_path, clock, worker):
+        from sharding import LeaseManager
+        return LeaseManager(
+            KEYS, path=str(tmp_path / 'leases.sqlite3'), worker=worker,
+            ttl=30, clock=clock
+        )
+
+    def test_new_worker_gets_its_share(self, tmp_path):
+        clock = FakeClock(1000.0)
+        first = self.make(tmp_path, clock, 'w1')
+        assert first.renew() == []
+        assert len(first.owned) == len(KEYS)
+        second = self.make(tmp_path, clock, 'w2')
+        second.renew()
+        # Аренды ещё у первого воркера.
+        assert second.owned == {}
+        leaving = first.renew()
+        assert leaving and all(first.lease(key) is None for key in leaving)
+        first.release(leaving)
+        second.renew()
+        assert set(second.owned) == set(leaving)
+        assert set(first.owned) | set(second.owned) == set(KEYS)
+        assert not set(first.owned) & set(second.owned)
+
+    def test_dead_worker_is_replaced_within_lease_period(self, tmp_path):
+        clock = FakeClock(1000.0)
+        first = self.make(tmp_path, clock, 'w1')
+        second = self.make(tmp_path, clock, 'w2')
+        for _ in range(2):
+            first.release(first.renew())
+            second.renew()
+        assert second.owned
+        clock.now += 30
+        # Второй воркер перестал продлевать аренды.
+        first.renew()
+        assert len(first.owned) == len(KEYS)
+        assert second.lease(next(iter(second.owned))) is None
+
+    def test_busy_key_is_kept_until_poll_ends(self, tmp_path):
+        clock = FakeClock(1000.0)
+        first = self.make(tmp_path, clock, 'w1')
+        first.renew()
+        second = self.make(tmp_path, clock, 'w2')
+        second.renew()
+        assert first.renew(busy=frozenset(KEYS)) == []
+        assert len(first.owned) == len(KEYS)
+        assert first.renew()
+
+    def test_restarted_worker_keeps_its_leases(self, tmp_path):
+        clock = FakeClock(1000.0)
+        first = self.make(tmp_path, clock, 'w1')
+        first.renew()
+        epoch = first.lease(KEYS[0])
+        restarted = self.make(tmp_path, clock, 'w1')
+        restarted.renew()
+        assert epoch is not None
+        assert len(restarted.owned) == len(KEYS)
+
+    def test_close_frees_leases(self, tmp_path):
+        clock = FakeClock(1000.0)
+        first = self.make(tmp_path, clock, 'w1')
+        first.renew()
+        second = self.make(tmp_path, clock, 'w2')
+        first.close()
+        second.renew()
+        assert len(second.owned) == len(KEYS)
+
+
+class TestShardedEngine:
+
+    def test_tenant_state_is_reloaded_on_new_lease(self, tmp_path):
+        import engine
+        import utils
+        from state_store import StateStore
+        store = StateStore(str(tmp_path / 'state.sqlite3'))
+        tenant = engine.Tenant('token', '111', from_date=1)
+        store.set_watermark(tenant.key, 500)
+        store.set_status(tenant.key, 'hw1', 'approved', None)
+        store.flush()
+
+        class Leases:
+            owned = {}
+
+            def lease(self, key):
+                return self.owned.get(key)
+
+        leases = Leases()
+        polling = engine.PollingEngine(
+            utils.MockTelegramBot(), [tenant], store=store, leases=leases,
+            commands=True
+        )
+        assert polling.lease(tenant) is None
+        assert not polling.commands.active()
+        polling.refresh([tenant])
+        assert tenant.payload['from_date'] == 500
+        leases.owned = {tenant.key: 1, '@commands': 1}
+        assert polling.lease(tenant) == 1
+        assert polling.commands.active()
+        store.close()
+
+
+class TestSupervisor:
+
+    def test_sigterm_stops_workers_gracefully(self, monkeypatch):
+        import os
+        import signal
+
+        import sharding
+
+        class Process:
+            pid = 1
+            returncode = None
+
+            def __init__(self):
+                self.signals = []
+
+            def poll(self):
+                return self.returncode
+
+            def send_signal(self, signum):
+                self.signals.append(signum)
+                self.returncode = 0
+
+            def wait(self):
+                return self.returncode
+
+        processes = []
+
+        def spawn(index):
+            processes.append(Process())
+            return processes[-1]
+
+        def terminate(seconds):
+            os.kill(os.getpid(), signal.SIGTERM)
+
+        monkeypatch.setattr(sharding, 'spawn', spawn)
+        monkeypatch.setattr(sharding.time, 'sleep', terminate)
+        previous = signal.getsignal(signal.SIGTERM)
+        sharding.supervise(workers=2)
+        assert [process.signals for process in processes] == [
+            [signal.SIGINT], [signal.SIGINT]
+        ]
+        assert signal.getsignal(signal.SIGTERM) == previous
@@ -0,0 +1,135 @@
+import asyncio
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+import requests
+
+import utils
+
+
+class TestSingleFlight:
+
+    def test_concurrent_calls_share_one_call(self):
+        from single_flight import SingleFlight
+        flights = SingleFlight(ttl=0)
+        release = threading.Event()
+        calls = []
+
+        def slow(value):
+            calls.append(value)
+            release.wait(1)
+            return {'value': value}
+
+        with ThreadPoolExecutor(max_workers=4) as executor:
+            futures = [
+                executor.submit(flights.do, 'key', slow, 1) for _ in range(4)
+            ]
+            while flights.coalesced < 3:
+                pass
+            release.set()
+            results = [future.result() for future in futures]
+        assert calls == [1]
+        assert all(result is results[0] for result in results)
+        assert (flights.upstream, flights.coalesced) == (1, 3)
+        assert flights.saved == 3
+        assert flights.flights == {}
+
+    def test_error_is_shared_and_not_cached(self):
+        from single_flight import SingleFlight
+        flights = SingleFlight(ttl=10)
+
+        def failing():
+            raise ValueError('boom')
+
+        with pytest.raises(ValueError):
+            flights.do('key', failing)
+        assert flights.do('key', lambda: 'ok') == 'ok'
+        assert flights.upstream == 2
+
+    def test_result_is_cached_for_ttl(self):
+        from single_flight import SingleFlight
+        clock = utils.FakeClock()
+        flights = SingleFlight(ttl=2, clock=clock)
+        counter = iter(range(10))
+        assert flights.do('key', next, counter) == 0
+        clock.now = 1.9
+        assert flights.do('key', next, counter) == 0
+        clock.now = 2
+        assert flights.do('key', next, counter) == 1
+        assert flights.do('other', next, counter) == 2
+        assert (flights.upstream, flights.cached) == (3, 1)
+
+    def test_not_cacheable_result(self):
+        from single_flight import SingleFlight
+        flights = SingleFlight(ttl=10, cacheable=lambda result: result > 0)
+        counter = iter(range(10))
+        assert flights.do('key', next, counter) == 0
+        assert flights.do('key', next, counter) == 1
+        assert flights.do('key', next, counter) == 1
+
+    def test_expired_results_are_purged(self, monkeypatch):
+        import single_flight
+        monkeypatch.setattr(single_flight, 'PURGE_THRESHOLD', 4)
+        clock = utils.FakeClock()
+        flights = single_flight.SingleFlight(ttl=1, clock=clock)
+        for key in range(3):
+            flights.do(key, int)
+        clock.now = 5
+        flights.do('fresh', int)
+        assert list(flights.results) == ['fresh']
+
+    def test_shared_response_parses_once(self, monkeypatch):
+        from single_flight import SharedResponse
+        response = utils.MockResponseGET(data={'homeworks': []})
+        parsed = []
+        original = response.json
+
+        def json():
+            parsed.append(1)
+            return original()
+
+        monkeypatch.setattr(response, 'json', json)
+        shared = SharedResponse(response)
+        assert shared.json() is shared.json()
+        assert shared.status_code == 200
+        assert parsed == [1]
+
+
+class TestEngineCoalescing:
+
+    def test_tenants_with_one_token_share_request(self, monkeypatch,
+                                                  data_with_new_hw_status):
+        import engine
+        calls = []
+
+        def mocked(*args, **kwargs):
+            calls.append(kwargs.get('params'))
+            return utils.MockResponseGET(
+                *args, random_timestamp=1000198000,
+                data=data_with_new_hw_status
+            )
+
+        monkeypatch.setattr(requests, 'get', mocked)
+        bot = utils.MockTelegramBot()
+        sent = []
+        bot.send_message = lambda chat_id=None, text=None, **kwargs: (
+            sent.append(chat_id)
+        )
+        tenants = [
+            engine.Tenant('token', chat_id, from_date=1)
+            for chat_id in ('111', '222')
+        ]
+        polling = engine.PollingEngine(bot, tenants, concurrency=2)
+
+        async def poll_all():
+            polling.outbound.start()
+            await asyncio.gather(*(polling.poll(tenant) for tenant in tenants))
+            await polling.outbound.drain()
+            await polling.outbound.stop()
+
+        asyncio.run(poll_all())
+        assert len(calls) == 1
+        assert polling.flights.saved == 1
+        assert sorted(sent) == ['111', '222']
+        assert tenants[0].payload == tenants[1].payload != {'from_date': 1}
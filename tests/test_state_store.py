@@ -0,0 +1,69 @@
+from differ import status_code
+
+
+class TestStateStore:
+
+    def test_tenant_key_hides_token(self):
+        from state_store import tenant_key
+        key = tenant_key('secret-token', '111')
+        assert key.startswith('111:')
+        assert 'secret' not in key
+        assert key == tenant_key('secret-token', '111')
+
+    def test_flush_and_load(self, tmp_path):
+        from state_store import StateStore
+        path = str(tmp_path / 'state.sqlite3')
+        store = StateStore(path)
+        store.set_watermark('a', 100)
+        store.set_watermark('a', 200)
+        store.set_status('a', '1', 'reviewing', '2023-01-01T00:00:00Z')
+        store.set_status('a', '1', 'approved', '2023-01-02T00:00:00Z')
+        assert store.load() == ({}, {})
+        assert store.pending == 2
+        assert store.flush() == 2
+        assert store.pending == 0
+        store.close()
+
+        watermarks, statuses = StateStore(path).load()
+        assert watermarks == {'a': 200}
+        assert statuses == {
+            'a': {'1': (status_code('approved'), '2023-01-02T00:00:00Z')}
+        }
+
+    def test_get_single_tenant(self, tmp_path):
+        from state_store import StateStore
+        store = StateStore(str(tmp_path / 'state.sqlite3'))
+        assert store.get('a') == (None, {})
+        store.set_watermark('a', 100)
+        store.set_status('a', '1', 'reviewing', None)
+        store.set_status('b', 2, 'approved', None)
+        store.flush()
+        assert store.get('a') == (
+            100, {'1': (status_code('reviewing'), None)}
+        )
+        assert store.get('b') == (None, {2: (status_code('approved'), None)})
+        # На диске статусы строками.
+        assert store.reader.execute(
+            'SELECT status FROM homeworks WHERE tenant = ?', ('a',)
+        ).fetchall() == [('reviewing',)]
+        store.close()
+
+    def test_history_is_pruned(self, tmp_path):
+        from state_store import StateStore
+        store = StateStore(str(tmp_path / 'state.sqlite3'), history_limit=3)
+        for index in range(5):
+            store.add_transition('a', 1, 'hw.zip', f's{index}', None)
+        store.add_transition('b', 2, 'other.zip', 'approved', None)
+        assert store.pending == 6
+        assert store.flush() == 6
+        assert store.history('a', 10) == [
+            (1, 'hw.zip', status_code(f's{index}'), None)
+            for index in (2, 3, 4)
+        ]
+        assert store.history('a', 1) == [
+            (1, 'hw.zip', status_code('s4'), None)
+        ]
+        assert store.history('b', 10) == [
+            (2, 'other.zip', status_code('approved'), None)
+        ]
+        store.close()
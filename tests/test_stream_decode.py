@@ -0,0 +1,66 @@
+import json
+
+import pytest
+
+import exceptions as ex
+
+
+def chunks(data, size=1):
+    body = data if isinstance(data, bytes) else json.dumps(data).encode()
+    return [body[start:start + size] for start in range(0, len(body), size)]
+
+
+class TestHomeworkStream:
+    RESPONSE = {
+        'current_date': 1234567890,
+        'homeworks': [
+            {'id': 1, 'homework_name': 'Домашка 1', 'status': 'approved'},
+            {'id': 2, 'homework_name': 'hw2', 'status': 'reviewing',
+             'nested': {'list': [1, 2.5, None, True]}},
+        ],
+        'after': 'поле после списка',
+    }
+
+    @pytest.mark.parametrize('size', [1, 3, 7, 4096])
+    def test_matches_json_loads(self, size):
+        from stream_decode import HomeworkStream
+        stream = HomeworkStream(chunks(self.RESPONSE, size))
+        assert list(stream) == self.RESPONSE['homeworks']
+        assert stream.fields == {
+            'current_date': 1234567890, 'after': 'поле после списка'
+        }
+
+    def test_empty_list_and_whitespace(self):
+        from stream_decode import HomeworkStream
+        stream = HomeworkStream(
+            chunks(b' {\n "homeworks" : [ ] ,\n "current_date": 7 }\n', 2)
+        )
+        assert list(stream) == []
+        assert stream.fields == {'current_date': 7}
+
+    @pytest.mark.parametrize('body, error', [
+        (b'[{"homeworks": []}]', ex.ResponseFormatError),
+        (b'{"homeworks": {"id": 1}}', ex.ResponseFormatError),
+        (b'{"current_date": 1}', ex.MissingKeyError),
+        (b'{"homeworks": [{"id": 1}, {"id"', ex.ResponseFormatError),
+        (b'not json', ex.ResponseFormatError),
+    ])
+    def test_invalid_responses(self, body, error):
+        from stream_decode import HomeworkStream
+        with pytest.raises(error):
+            list(HomeworkStream(chunks(body, 4)))
+
+    @pytest.mark.parametrize('homework', [
+        {'id': 1, 'status': 'approved'},
+        {'id': 1, 'homework_name': 'hw1', 'status': 'lost'},
+        ['hw1', 'approved'],
+    ])
+    def test_rejects_what_check_response_rejects(self, homework):
+        import homework as hw
+        from stream_decode import HomeworkStream
+        response = {'homeworks': [homework], 'current_date': 1}
+        with pytest.raises(Exception) as expected:
+            hw.check_response(response)
+        stream = HomeworkStream(chunks(response, 4), hw.HOMEWORK_VALIDATOR)
+        with pytest.raises(expected.type):
+            list(stream)
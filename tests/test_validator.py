@@ -0,0 +1,77 @@
+import pytest
+
+STATUSES = ('approved', 'reviewing', 'rejected')
+
+
+def response(*homeworks):
+    return {'homeworks': list(homeworks), 'current_date': 1}
+
+
+class TestValidator:
+
+    def test_valid_response(self):
+        from validator import Validator, response_schema
+        validator = Validator(response_schema(STATUSES))
+        valid = response(
+            {'homework_name': 'hw1', 'status': 'approved'},
+            {'homework_name': 'hw2', 'status': 'rejected', 'id': 2},
+        )
+        assert validator.valid(valid)
+        assert validator.problems(valid) == []
+        validator.check(valid)
+
+    @pytest.mark.parametrize('value, kind, path, error', [
+        ([], 'type', (), 'ResponseFormatError'),
+        ({'current_date': 1}, 'required', ('homeworks',), 'MissingKeyError'),
+        ({'homeworks': {}}, 'type', ('homeworks',), 'ResponseFormatError'),
+        (response('hw1'), 'type', ('homeworks', 0), 'ResponseFormatError'),
+        (response({'status': 'approved'}), 'required',
+         ('homeworks', 0, 'homework_name'), 'MissingKeyError'),
+        (response({'homework_name': 'hw1', 'status': 'approved'},
+                  {'homework_name': 'hw2', 'status': 'unknown'}), 'enum',
+         ('homeworks', 1, 'status'), 'UnknownStatusError'),
+    ])
+    def test_problems(self, value, kind, path, error):
+        from validator import Validator, response_schema
+        validator = Validator(response_schema(STATUSES))
+        assert not validator.valid(value)
+        problem, *_ = validator.problems(value)
+        assert (problem.kind, problem.path) == (kind, path)
+        with pytest.raises(Exception) as raised:
+            validator.check(value)
+        assert type(raised.value).__name__ == error
+        assert str(raised.value) == problem.message
+
+    def test_all_problems_are_collected(self):
+        import event_descriptions as ed
+        from validator import Validator, response_schema
+        validator = Validator(response_schema(STATUSES))
+        problems = validator.problems(response(
+            {'status': 'approved'},
+            {'homework_name': 'hw2'},
+            {'homework_name': 'hw3', 'status': 'reviewing'},
+        ))
+        assert [(p.kind, p.path) for p in problems] == [
+            ('required', ('homeworks', 0, 'homework_name')),
+            ('enum', ('homeworks', 1, 'status')),
+        ]
+        assert problems[1].message == ed.UNKNOWN_STATUS_ERROR.format(None)
+
+    def test_optional_property_and_subclass(self):
+        from collections import OrderedDict
+
+        from validator import Validator
+        validator = Validator({
+            'type': dict,
+            'error': 'не словарь',
+            'properties': {
+                'count': {'type': int, 'error': 'не число'},
+            },
+        })
+        assert validator.valid({})
+        assert validator.valid({'count': 1})
+        assert validator.problems({'count': '1'})[0].path == ('count',)
+        # Подклассы проверяются медленным путём и тоже проходят.
+        assert not validator.valid(OrderedDict())
+        assert validator.problems(OrderedDict()) == []
+        validator.check(OrderedDict())
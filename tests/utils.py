@@ -1,3 +1,4 @@
+import json
 import logging
 import signal
 import re
@@ -89,6 +90,7 @@ class MockResponseGET:
         self.status_code = http_status
         self.reason = ''
         self.text = ''
+        self.headers = {}
         default_data = {
             'homeworks': [],
             'current_date': self.random_timestamp
@@ -96,9 +98,21 @@ class MockResponseGET:
         self.data = default_data if data is None else data
         logging.warn(MockResponseGET.CALLED_LOG_MSG)
 
+    @property
+    def content(self):
+        return json.dumps(self.data).encode()
+
     def json(self):
         return self.data
 
+    def iter_content(self, chunk_size=1):
+        content = self.content
+        for start in range(0, len(content), chunk_size):
+            yield content[start:start + chunk_size]
+
+    def close(self):
+        pass
+
     def raise_for_status(self):
         if self.status_code >= 400:
             raise ValueError('Server or client error.')
@@ -114,6 +128,40 @@ class MockTelegramBot:
         self.text = text
 
 
+class RecordingBot(MockTelegramBot):
+    def __init__(self, **kwargs):
+        super().__init__(**kwargs)
+        self.sent = []
+
+    def send_message(self, chat_id=None, text=None, **kwargs):
+        self.sent.append((chat_id, text))
+
+
+def mock_get(data, http_status=200):
+    """Подмена requests.get, которая всегда отвечает data."""
+    def mocked(*args, **kwargs):
+        return MockResponseGET(
+            *args, random_timestamp=1000198000,
+            http_status=http_status, data=data
+        )
+    return mocked
+
+
+class FakeClock:
+    """Часы для тестов: время двигают вручную через now.
+
+    step сдвигает время при каждом вызове.
+    """
+
+    def __init__(self, now=0.0, step=0.0):
+        self.now = now
+        self.step = step
+
+    def __call__(self):
+        self.now += self.step
+        return self.now
+
+
 class BreakInfiniteLoop(Exception):
     pass
 
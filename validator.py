@@ -0,0 +1,165 @@
+"""Проверка ответа API Практикума по схеме за один проход.
+
+Схема описывает ответ целиком: тип значения, обязательные ключи,
+допустимые значения полей, вложенные поля и элементы списка. При
+создании Validator схема один раз компилируется в функцию на Python
+без вызовов и логирования на каждое поле, и корректный ответ со всеми
+работами проверяется одним проходом этой функции. Только если она
+нашла нарушение, схема обходится заново, чтобы собрать список проблем
+с путём до поля; первая проблема превращается в исключение из
+exceptions.py.
+"""
+from collections import namedtuple
+
+import exceptions as ex  # Импорт польз. исключений.
+import event_descriptions as ed  # Импорт описания событий
+
+# Вид проблемы -> исключение.
+PROBLEM_ERRORS = {
+    'type': ex.ResponseFormatError,
+    'required': ex.MissingKeyError,
+    'enum': ex.UnknownStatusError,
+}
+
+
+class Problem(namedtuple('Problem', ('kind', 'path', 'message'))):
+    """Нарушение схемы: вид, путь до поля и текст ошибки."""
+
+    __slots__ = ()
+
+    def error(self):
+        """Исключение для этой проблемы."""
+        return PROBLEM_ERRORS[self.kind](self.message)
+
+
+def homework_schema(statuses):
+    """Схема работы: словарь с названием и известным статусом."""
+    return {
+        'type': dict,
+        'error': ed.HOMEWORK_TYPE_ERROR,
+        'required': {'homework_name': ed.MISSING_KEY_ERROR},
+        'enum': {'status': (frozenset(statuses), ed.UNKNOWN_STATUS_ERROR)},
+    }
+
+
+def response_schema(statuses):
+    """Схема ответа homework_statuses/ со списком работ."""
+    return {
+        'type': dict,
+        'error': ed.CHECK_DICT_ERROR,
+        'required': {'homeworks': ed.HOMEWORKS_MISSING_ERROR},
+        'properties': {
+            'homeworks': {
+                'type': list,
+                'error': ed.CHECK_LIST_ERROR,
+                'items': homework_schema(statuses),
+            },
+        },
+    }
+
+
+class SchemaCompiler:
+    """Сборка исходного кода проверки по схеме.
+
+    Значения из схемы (типы и множества допустимых значений) попадают
+    в код именами констант, ключи — литералами.
+    """
+
+    def __init__(self):
+        self.lines = ['def valid(value):']
+        self.constants = {}
+        self.names = 0
+
+    def constant(self, value):
+        """Имя константы для значения из схемы."""
+        name = f'c{len(self.constants)}'
+        self.constants[name] = value
+        return name
+
+    def variable(self):
+        """Новое имя переменной для вложенного значения."""
+        self.names += 1
+        return f'v{self.names}'
+
+    def emit(self, depth, line):
+        """Строка кода с отступом."""
+        self.lines.append('    ' * depth + line)
+
+    def node(self, schema, expr, depth):
+        """Проверки значения expr по схеме."""
+        if 'type' in schema:
+            self.emit(depth, f'if {expr}.__class__ is not '
+                             f'{self.constant(schema["type"])}:')
+            self.emit(depth + 1, 'return False')
+        for key in schema.get('required', ()):
+            self.emit(depth, f'if {key!r} not in {expr}:')
+            self.emit(depth + 1, 'return False')
+        for key, (allowed, _) in schema.get('enum', {}).items():
+            self.emit(depth, f'if {expr}.get({key!r}) not in '
+                             f'{self.constant(allowed)}:')
+            self.emit(depth + 1, 'return False')
+        for key, child in schema.get('properties', {}).items():
+            self.property(key, child, expr, depth,
+                          key in schema.get('required', ()))
+        if 'items' in schema:
+            item = self.variable()
+            self.emit(depth, f'for {item} in {expr}:')
+            self.node(schema['items'], item, depth + 1)
+
+    def property(self, key, schema, expr, depth, required):
+        """Проверки вложенного поля; необязательное — если оно есть."""
+        value = self.variable()
+        if not required:
+            self.emit(depth, f'if {key!r} in {expr}:')
+            depth += 1
+        self.emit(depth, f'{value} = {expr}[{key!r}]')
+        self.node(schema, value, depth)
+
+    def build(self, schema):
+        """Функция valid(value): True — значение соответствует схеме."""
+        self.node(schema, 'value', 1)
+        self.emit(1, 'return True')
+        namespace = dict(self.constants)
+        exec(compile('\n'.join(self.lines), '<schema>', 'exec'), namespace)
+        return namespace['valid']
+
+
+def collect(schema, value, path):
+    """Все нарушения схемы в значении: Problem по порядку обхода."""
+    if 'type' in schema and not isinstance(value, schema['type']):
+        yield Problem('type', path, schema['error'])
+        return
+    for key, message in schema.get('required', {}).items():
+        if key not in value:
+            yield Problem('required', path + (key,), message)
+    for key, (allowed, message) in schema.get('enum', {}).items():
+        field = value.get(key)
+        if field not in allowed:
+            yield Problem('enum', path + (key,), message.format(field))
+    for key, child in schema.get('properties', {}).items():
+        if key in value:
+            yield from collect(child, value[key], path + (key,))
+    if 'items' in schema:
+        for index, item in enumerate(value):
+            yield from collect(schema['items'], item, path + (index,))
+
+
+class Validator:
+    """Проверка значений по схеме, скомпилированной при создании."""
+
+    def __init__(self, schema):
+        self.schema = schema
+        self.valid = SchemaCompiler().build(schema)
+
+    def problems(self, value):
+        """Список нарушений схемы; пустой — значение корректно."""
+        if self.valid(value):
+            return []
+        return list(collect(self.schema, value, ()))
+
+    def check(self, value):
+        """Проверка с исключением по первому нарушению."""
+        if self.valid(value):
+            return
+        for problem in collect(self.schema, value, ()):
+            raise problem.error()